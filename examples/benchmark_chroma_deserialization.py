@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: converting ChromaDB rows back into ProcessedContext objects
+Compares the legacy converter (speculative JSON decoding plus full model_validate on
+every nested model) against the routed fast path and the lazy view, on synthetic rows
+produced by the backend's own serializer, and checks that both give identical contexts.
+
+Usage:
+    python benchmark_chroma_deserialization.py [num_rows] [dim]
+    python benchmark_chroma_deserialization.py 1000 1024
+"""
+
+import datetime
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.models.context import (
+    ContextProperties,
+    ExtractedData,
+    ProcessedContext,
+    ProfileContextMetadata,
+    Vectorize,
+)
+from opencontext.models.enums import ContextType
+from opencontext.storage.backends.chroma_context_codec import (
+    LazyProcessedContext,
+    decode_processed_context,
+)
+from opencontext.storage.backends.chromadb_backend import ChromaDBBackend
+
+
+def legacy_convert(doc: Dict[str, Any], need_vector: bool = True) -> ProcessedContext:
+    """The converter as it was before the routed fast path"""
+    extracted_data_field_names = set(ExtractedData.model_fields.keys())
+    properties_field_names = set(ContextProperties.model_fields.keys())
+    vectorize_field_names = set(Vectorize.model_fields.keys())
+
+    extracted_data_dict, properties_dict, context_dict = {}, {}, {}
+    vectorize_dict, metadata_dict = {}, {}
+
+    document = doc.pop("document", None)
+    embedding = doc.pop("embedding", None)
+    metadata = doc.pop("metadata", {})
+    doc_id = doc.pop("id")
+    if document:
+        vectorize_dict["text"] = document
+    vectorize_dict["vector"] = embedding
+
+    metadata_field_names = set()
+    if metadata.get("context_type") == ContextType.ENTITY_CONTEXT.value:
+        metadata_field_names = set(ProfileContextMetadata.model_fields.keys())
+
+    for key, value in metadata.items():
+        if key.endswith("_ts"):
+            continue
+        val = value
+        if isinstance(value, str) and value.startswith(("{", "[")):
+            try:
+                val = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                pass
+        if key in extracted_data_field_names:
+            extracted_data_dict[key] = val
+        elif key in properties_field_names:
+            properties_dict[key] = val
+        elif key in vectorize_field_names:
+            vectorize_dict[key] = val
+        elif metadata_field_names and key in metadata_field_names:
+            metadata_dict[key] = val
+        else:
+            context_dict[key] = val
+
+    context_dict["id"] = doc_id
+    context_dict["extracted_data"] = ExtractedData.model_validate(extracted_data_dict)
+    context_dict["properties"] = ContextProperties.model_validate(properties_dict)
+    context_dict["vectorize"] = Vectorize.model_validate(vectorize_dict)
+    if metadata_dict:
+        context_dict["metadata"] = metadata_dict
+    context = ProcessedContext.model_validate(context_dict)
+    if not need_vector:
+        context.vectorize.vector = None
+    return context
+
+
+def make_rows(n: int, dim: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Serialize synthetic contexts with the backend's own flattening"""
+    rng = np.random.default_rng(seed)
+    backend = ChromaDBBackend()
+    now = datetime.datetime.now()
+    rows = []
+    for i in range(n):
+        context_type = ContextType.ENTITY_CONTEXT if i % 4 == 0 else ContextType.ACTIVITY_CONTEXT
+        metadata = {}
+        if context_type == ContextType.ENTITY_CONTEXT:
+            metadata = ProfileContextMetadata(
+                entity_type="person",
+                entity_canonical_name=f"entity {i}",
+                entity_aliases=[f"alias {i}", f"nick {i}"],
+                entity_metadata={"team": "platform", "level": i % 5},
+                entity_relationships={"person": [{"entity_id": str(i - 1), "entity_name": "x"}]},
+                entity_description="[draft] synthetic entity",
+            ).to_dict()
+        context = ProcessedContext(
+            properties=ContextProperties(
+                create_time=now, event_time=now, update_time=now, merge_count=i % 3
+            ),
+            extracted_data=ExtractedData(
+                title=f"title {i}",
+                summary="summary " * 20,
+                keywords=[f"kw{j}" for j in range(5)],
+                entities=[f"entity {j}" for j in range(3)],
+                context_type=context_type,
+                importance=i % 10,
+            ),
+            vectorize=Vectorize(text=f"document {i}", vector=rng.normal(size=dim).tolist()),
+            metadata=metadata,
+        )
+        doc = backend._context_to_chroma_format(context)
+        embedding = np.asarray(doc.pop("embedding"), dtype=np.float32)
+        rows.append(
+            {
+                "id": doc.pop("id"),
+                "document": doc.pop("document", None),
+                "embedding": embedding,
+                "metadata": doc,
+            }
+        )
+    return rows
+
+
+def timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    """Run fn with the garbage collector paused so its pauses do not skew timings"""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def touch_cleanup_fields(views: List[LazyProcessedContext]) -> List[LazyProcessedContext]:
+    """Read what a cleanup scan reads, so only those sections are materialized"""
+    for view in views:
+        view.properties.update_time, view.extracted_data.importance
+    return views
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    rows = make_rows(n, dim)
+    print(f"Converting {n} rows with vector dim {dim}")
+
+    for need_vector in (False, True):
+        print(f"need_vector={need_vector}")
+
+        legacy, legacy_time = timed(
+            lambda: [
+                legacy_convert({**row, "metadata": dict(row["metadata"])}, need_vector)
+                for row in rows
+            ]
+        )
+        print(f"  legacy converter:        {legacy_time * 1000:9.1f} ms")
+
+        fast, elapsed = timed(
+            lambda: [
+                decode_processed_context(
+                    row["id"], row["document"], row["metadata"], row["embedding"], need_vector
+                )
+                for row in rows
+            ]
+        )
+        print(
+            f"  routed fast path:        {elapsed * 1000:9.1f} ms, "
+            f"speedup x{legacy_time / elapsed:.1f}"
+        )
+
+        views, elapsed = timed(
+            lambda: touch_cleanup_fields(
+                [
+                    LazyProcessedContext(
+                        row["id"], row["document"], row["metadata"], row["embedding"], need_vector
+                    )
+                    for row in rows
+                ]
+            )
+        )
+        print(
+            f"  lazy view, 2 sections:   {elapsed * 1000:9.1f} ms, "
+            f"speedup x{legacy_time / elapsed:.1f}"
+        )
+
+        identical = all(a.model_dump() == b.model_dump() for a, b in zip(legacy, fast))
+        identical_lazy = all(
+            a.model_dump() == v.to_context().model_dump() for a, v in zip(legacy, views)
+        )
+        print(f"  identical to legacy: fast={identical}, lazy={identical_lazy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark: similarity grouping used by periodic memory compression
+Compares the legacy pure-Python greedy grouping loop against the vectorized
+grouping engine (greedy compatibility mode and union-find mode) on synthetic
+clustered embeddings, and checks that greedy mode produces identical groups.
+
+Usage:
+    python benchmark_similarity_grouping.py [num_contexts] [dim] [threshold]
+    python benchmark_similarity_grouping.py 1000 1024 0.9
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Add parent directory to path to import opencontext modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opencontext.context_processing.merger.similarity_grouping import (
+    GroupingMode,
+    group_by_similarity,
+)
+
+
+def legacy_similarity(emb1: List[float], emb2: List[float]) -> float:
+    """Pure-Python cosine similarity, as used by the legacy grouping loop"""
+    if not emb1 or not emb2:
+        return 0.0
+    dot_product = sum(a * b for a, b in zip(emb1, emb2))
+    norm_emb1 = math.sqrt(sum(a * a for a in emb1))
+    norm_emb2 = math.sqrt(sum(b * b for b in emb2))
+    if norm_emb1 == 0 or norm_emb2 == 0:
+        return 0.0
+    return dot_product / (norm_emb1 * norm_emb2)
+
+
+def legacy_group(embeddings: List[List[float]], threshold: float) -> List[List[int]]:
+    """Legacy greedy grouping loop, returns groups of indices"""
+    groups = []
+    remaining = list(range(len(embeddings)))
+    while remaining:
+        seed = remaining.pop(0)
+        group = [seed]
+        to_remove = []
+        for i, idx in enumerate(remaining):
+            if legacy_similarity(embeddings[seed], embeddings[idx]) > threshold:
+                group.append(idx)
+                to_remove.append(i)
+        for i in sorted(to_remove, reverse=True):
+            remaining.pop(i)
+        groups.append(group)
+    return groups
+
+
+def make_embeddings(n: int, dim: int, clusters: int, seed: int = 42) -> List[List[float]]:
+    """Generate clustered embeddings so the threshold produces non-trivial groups"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    noise = rng.normal(scale=0.15, size=(n, dim))
+    return (centers[labels] + noise).tolist()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    threshold = float(sys.argv[3]) if len(sys.argv) > 3 else 0.9
+
+    embeddings = make_embeddings(n, dim, clusters=max(1, n // 10))
+    print(f"Grouping {n} embeddings of dim {dim} with threshold {threshold}")
+
+    start = time.perf_counter()
+    legacy_groups = legacy_group(embeddings, threshold)
+    legacy_time = time.perf_counter() - start
+    print(f"legacy pure-Python greedy:  {legacy_time * 1000:9.1f} ms, {len(legacy_groups)} groups")
+
+    for mode in (GroupingMode.GREEDY, GroupingMode.UNION_FIND):
+        start = time.perf_counter()
+        groups = group_by_similarity(embeddings, threshold, mode=mode)
+        elapsed = time.perf_counter() - start
+        print(
+            f"vectorized {mode.value:<15} {elapsed * 1000:9.1f} ms, {len(groups)} groups, "
+            f"speedup x{legacy_time / elapsed:.1f}"
+        )
+        if mode == GroupingMode.GREEDY:
+            print(f"  identical to legacy grouping: {groups == legacy_groups}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,14 +12,19 @@ Screenshot capture component for periodic screen capturing
 import os
 import threading
 from datetime import datetime
-from io import BytesIO
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from PIL import Image
 
 from opencontext.context_capture import BaseCaptureComponent
 from opencontext.models.context import RawContextProperties
 from opencontext.models.enums import ContentFormat, ContextSource
+from opencontext.utils.image import (
+    ImageFrame,
+    bgra_tile_signature,
+    dirty_regions,
+    tile_similarity,
+)
 from opencontext.utils.logger import LogManager
 
 logger = LogManager.get_logger(__name__)
@@ -53,7 +58,20 @@ class ScreenshotCapture(BaseCaptureComponent):
             {}
         )  # Used to store the last stable screenshot for each monitor
         self._similarity_threshold = 95  # Image similarity threshold (0-100), default 95
-        self._max_image_size = None  # Add maximum image size
+        # Capture-side dedup state: last kept tile signature and skipped frames per monitor
+        self._frame_signatures: Dict[str, Any] = {}
+        self._skipped_frames: Dict[str, int] = {}
+        # Diff mode: emit only the changed regions against the previous frame per monitor
+        self._diff_mode = False
+        self._diff_tile_size = 64
+        self._diff_max_dirty_ratio = 0.5
+        self._diff_keyframe_interval = 10
+        self._diff_bases: Dict[str, Any] = {}
+        self._frames_since_keyframe: Dict[str, int] = {}
+        # Per-monitor frame numbers, never reset, so processors can tell which frame a
+        # diff frame was cropped against
+        self._frame_seqs: Dict[str, int] = {}
+        self._max_image_size = None  # Frames are downscaled to this size once, at capture
         self._resize_quality = 95  # Add image scaling quality
         self._lock = threading.RLock()
 
@@ -117,9 +135,15 @@ class ScreenshotCapture(BaseCaptureComponent):
             self._similarity_threshold = config.get("similarity_threshold", 98)
 
             # Set image scaling size and quality
-            self._max_image_size = config.get("max_image_size", 2048)
+            self._max_image_size = config.get("max_image_size", 1920)
             self._resize_quality = config.get("resize_quality", 95)
 
+            # Set diff mode
+            self._diff_mode = config.get("diff_mode", False)
+            self._diff_tile_size = max(8, int(config.get("diff_tile_size", 64)))
+            self._diff_max_dirty_ratio = float(config.get("diff_max_dirty_ratio", 0.5))
+            self._diff_keyframe_interval = max(1, int(config.get("diff_keyframe_interval", 10)))
+
             return True
         except Exception as e:
             logger.exception(f"Failed to initialize screenshot capture component: {str(e)}")
@@ -167,6 +191,8 @@ class ScreenshotCapture(BaseCaptureComponent):
                         self._callback(pending_contexts)
 
             self._last_screenshots.clear()
+            self._diff_bases.clear()
+            self._frames_since_keyframe.clear()
             logger.info("Screenshot capture component stopped")
             return True
         except Exception as e:
@@ -174,7 +200,7 @@ class ScreenshotCapture(BaseCaptureComponent):
             return False
 
     def _create_new_context(
-        self, screenshot_bytes: bytes, screenshot_format: str, timestamp: datetime, details: dict
+        self, frame: ImageFrame, screenshot_format: str, timestamp: datetime, details: dict
     ) -> RawContextProperties:
         """Create a RawContextProperties object for a new screenshot"""
         screenshot_path = None
@@ -183,8 +209,8 @@ class ScreenshotCapture(BaseCaptureComponent):
             timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S_%f")
             filename = f"screenshot_{monitor_id}_{timestamp_str}.{self._screenshot_format}"
             filepath = os.path.join(self._screenshot_dir, filename)
-            with open(filepath, "wb") as f:
-                f.write(screenshot_bytes)
+            # The encoding is cached on the frame and reused for the VLM upload
+            frame.save(filepath)
             screenshot_path = os.path.abspath(filepath)
             self._last_screenshot_path = screenshot_path
 
@@ -206,13 +232,15 @@ class ScreenshotCapture(BaseCaptureComponent):
             str(details.get("monitor", "monitor_1")),
         ]
 
-        return RawContextProperties(
+        context = RawContextProperties(
             source=ContextSource.SCREENSHOT,
             content_format=ContentFormat.IMAGE,
             content_path=screenshot_path,
             additional_info=metadata,
             create_time=timestamp,
         )
+        context.attach_frame(frame)
+        return context
 
     def _capture_impl(self) -> List[RawContextProperties]:
         """
@@ -229,10 +257,8 @@ class ScreenshotCapture(BaseCaptureComponent):
             captured_contexts = []
             now = datetime.now()
 
-            for screenshot_bytes, screenshot_format, details in screenshots:
-                new_ctx = self._create_new_context(
-                    screenshot_bytes, screenshot_format, now, details
-                )
+            for frame, screenshot_format, details in screenshots:
+                new_ctx = self._create_new_context(frame, screenshot_format, now, details)
                 captured_contexts.append(new_ctx)
                 self._screenshot_count += 1
 
@@ -245,17 +271,18 @@ class ScreenshotCapture(BaseCaptureComponent):
 
     def _take_screenshot(self) -> list:
         """
-        Capture screen screenshots using configured library
+        Capture screen screenshots using configured library.
+        Frames stay in memory, downscaled once here; they are only encoded when saved
+        or uploaded.
 
         Returns:
-            list: (screenshot binary data, format, details_dict)
+            list: (ImageFrame, format, details_dict)
         """
         try:
             screenshots = []
 
             if self._screenshot_lib == "mss":
                 import mss
-                from PIL import Image
 
                 with mss.mss() as sct:
                     monitors_to_capture = []
@@ -273,20 +300,31 @@ class ScreenshotCapture(BaseCaptureComponent):
                         monitors_to_capture.extend(sct.monitors[1:])
 
                     for i, monitor in enumerate(monitors_to_capture):
+                        monitor_id = f"monitor_{i+1}"
                         sct_img = sct.grab(monitor)
-                        img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-
-                        # Convert to binary data
-                        buffer = BytesIO()
-                        if self._screenshot_format in ["jpg", "jpeg"]:
-                            img.save(buffer, format="JPEG", quality=self._screenshot_quality)
-                            format_name = "jpeg"
-                        else:
-                            img.save(buffer, format="PNG")
-                            format_name = "png"
-
-                        details = {"monitor": f"monitor_{i+1}", "coordinates": monitor}
-                        screenshots.append((buffer.getvalue(), format_name, details))
+                        if self._dedup_enabled and self._is_unchanged_frame(
+                            monitor_id, sct_img.size, sct_img.bgra
+                        ):
+                            continue
+                        frame = ImageFrame.from_bgra(
+                            sct_img.size,
+                            sct_img.bgra,
+                            self._screenshot_format,
+                            self._screenshot_quality,
+                        )
+                        frame.downscale(self._max_image_size)
+
+                        details = {"monitor": monitor_id, "coordinates": monitor}
+                        if self._diff_mode:
+                            seq = self._frame_seqs.get(monitor_id, 0) + 1
+                            self._frame_seqs[monitor_id] = seq
+                            details["frame_seq"] = seq
+                            regions = self._apply_diff(monitor_id, frame)
+                            if regions:
+                                details["diff_regions"] = regions
+                                # Crops are relative to the previous frame of the monitor
+                                details["diff_base_seq"] = seq - 1
+                        screenshots.append((frame, frame.format, details))
 
             else:
                 logger.error(f"Unsupported screenshot library: {self._screenshot_lib}")
@@ -297,6 +335,67 @@ class ScreenshotCapture(BaseCaptureComponent):
             logger.exception(f"Screenshot failed: {str(e)}")
             return []
 
+    def _is_unchanged_frame(self, monitor_id: str, size: tuple, bgra: bytes) -> bool:
+        """
+        Capture-side dedup on the raw BGRA buffer, before any decoding or encoding.
+        Compares a tile signature with the last kept frame of the same monitor and
+        counts the frames it drops.
+        """
+        try:
+            signature = bgra_tile_signature(size, bgra)
+        except Exception as e:
+            logger.debug(f"Failed to compute frame signature for {monitor_id}: {e}")
+            return False
+
+        last_signature = self._frame_signatures.get(monitor_id)
+        if (
+            last_signature is not None
+            and tile_similarity(signature, last_signature) >= self._similarity_threshold
+        ):
+            self._skipped_frames[monitor_id] = self._skipped_frames.get(monitor_id, 0) + 1
+            try:
+                from opencontext.monitoring import increment_recording_stat
+
+                increment_recording_stat("skipped", 1)
+            except Exception:
+                pass
+            return True
+
+        # Compare against the last kept frame, so slow drift still triggers a capture
+        self._frame_signatures[monitor_id] = signature
+        return False
+
+    def _apply_diff(self, monitor_id: str, frame: ImageFrame) -> Optional[List[tuple]]:
+        """
+        Mark the frame with its dirty regions against the previous frame of the monitor.
+        A full frame (keyframe) is kept every diff_keyframe_interval frames, after a
+        resolution change, or when too much of the screen changed. The base moves on
+        with every frame; processors that drop a frame send the next diff frame whole.
+        """
+        pixels = frame.to_array()
+        previous = self._diff_bases.get(monitor_id)
+        self._diff_bases[monitor_id] = pixels
+
+        since_keyframe = self._frames_since_keyframe.get(monitor_id, 0)
+        regions = None
+        if previous is not None and since_keyframe < self._diff_keyframe_interval:
+            try:
+                regions = dirty_regions(
+                    previous,
+                    pixels,
+                    tile_size=self._diff_tile_size,
+                    max_dirty_ratio=self._diff_max_dirty_ratio,
+                )
+            except Exception as e:
+                logger.debug(f"Failed to diff frame for {monitor_id}: {e}")
+
+        if regions:
+            frame.set_regions(regions)
+            self._frames_since_keyframe[monitor_id] = since_keyframe + 1
+            return regions
+        self._frames_since_keyframe[monitor_id] = 0
+        return None
+
     def _get_config_schema_impl(self) -> Dict[str, Any]:
         """
         Get configuration schema implementation
@@ -337,6 +436,36 @@ class ScreenshotCapture(BaseCaptureComponent):
                     "required": ["left", "top", "width", "height"],
                 },
                 "storage_path": {"type": "string", "description": "Screenshot save directory"},
+                "max_image_size": {
+                    "type": "integer",
+                    "description": "Downscale frames so neither side exceeds this many pixels (0 disables)",
+                    "default": 1920,
+                    "minimum": 0,
+                },
+                "diff_mode": {
+                    "type": "boolean",
+                    "description": "Send only the regions that changed since the previous frame of each monitor to the VLM, with periodic full keyframes",
+                    "default": False,
+                },
+                "diff_tile_size": {
+                    "type": "integer",
+                    "description": "Tile size in pixels used to find changed regions in diff mode",
+                    "default": 64,
+                    "minimum": 8,
+                },
+                "diff_max_dirty_ratio": {
+                    "type": "number",
+                    "description": "Send the full frame when more than this fraction of tiles changed",
+                    "default": 0.5,
+                    "minimum": 0,
+                    "maximum": 1,
+                },
+                "diff_keyframe_interval": {
+                    "type": "integer",
+                    "description": "Send a full frame at least every this many frames per monitor",
+                    "default": 10,
+                    "minimum": 1,
+                },
                 "dedup_enabled": {
                     "type": "boolean",
                     "description": "Whether to enable screenshot deduplication (skip screenshots identical to the previous one)",
@@ -344,7 +473,7 @@ class ScreenshotCapture(BaseCaptureComponent):
                 },
                 "similarity_threshold": {
                     "type": "number",
-                    "description": "Image similarity threshold (0-100), higher values require more similarity. Default 98",
+                    "description": "Image similarity threshold (0-100) for capture-side dedup, a frame is skipped when no screen tile changed by more than (100 - threshold)% brightness. Default 98",
                     "default": 98,
                     "minimum": 0,
                     "maximum": 100,
@@ -468,6 +597,7 @@ class ScreenshotCapture(BaseCaptureComponent):
             "screenshot_dir": self._screenshot_dir,
             "dedup_enabled": self._dedup_enabled,
             "similarity_threshold": self._similarity_threshold,
+            "diff_mode": self._diff_mode,
             "last_screenshot_time": (
                 self._last_screenshot_time.isoformat() if self._last_screenshot_time else None
             ),
@@ -482,7 +612,7 @@ class ScreenshotCapture(BaseCaptureComponent):
             Dict[str, Any]: Statistics information
         """
         active_contexts_info = {}
-        for monitor_id, history in self._active_screenshots.items():
+        for monitor_id, history in getattr(self, "_active_screenshots", {}).items():
             active_contexts_info[monitor_id] = [
                 {
                     "uuid": ctx.uuid,
@@ -495,6 +625,8 @@ class ScreenshotCapture(BaseCaptureComponent):
         return {
             "screenshot_count": self._screenshot_count,
             "active_screenshots": active_contexts_info,
+            "skipped_unchanged_frames": dict(self._skipped_frames),
+            "skipped_unchanged_total": sum(self._skipped_frames.values()),
         }
 
     def _reset_statistics_impl(self) -> None:
@@ -503,5 +635,6 @@ class ScreenshotCapture(BaseCaptureComponent):
         """
         self._screenshot_count = 0
         self._active_screenshots = {}
+        self._skipped_frames = {}
         self._last_screenshot_time = None
         self._last_screenshot_path = None
@@ -6,6 +6,10 @@
 
 """
 Vault document monitoring component that monitors changes in the vaults table and generates context capture events
+
+Changes are read from the vaults change feed (vault_changes, kept by triggers) with a
+cursor. The monitor wakes as soon as a write commits through the storage backend, and
+at the latest every monitor_interval seconds for writes made by other processes.
 """
 
 import threading
@@ -15,6 +19,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
 from opencontext.context_capture import BaseCaptureComponent
+from opencontext.context_processing.chunker.region_diff import content_hash
 from opencontext.models.context import RawContextProperties
 from opencontext.models.enums import ContentFormat, ContextSource
 from opencontext.storage.global_storage import get_storage
@@ -22,6 +27,9 @@ from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Change feed columns returned alongside the vault row
+_FEED_COLUMNS = ("seq", "vault_id", "operation", "changed_at")
+
 
 class VaultDocumentMonitor(BaseCaptureComponent):
     """
@@ -33,11 +41,14 @@ class VaultDocumentMonitor(BaseCaptureComponent):
         super().__init__(
             name="VaultDocumentMonitor",
             description="Monitor document changes in vaults table",
-            source_type=ContextSource.TEXT,
+            source_type=ContextSource.VAULT,
         )
         self._storage = None
-        self._monitor_interval = 5  # Monitor interval (seconds)
+        self._monitor_interval = 5  # Longest wait for changes (seconds)
         self._last_scan_time = None
+        # Sequence number of the last consumed vault change
+        self._change_cursor = 0
+        self._changes_since_compaction = 0
         self._processed_vault_ids: Set[int] = set()
         self._document_events = []
         self._event_lock = threading.RLock()
@@ -81,6 +92,10 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             bool: Whether startup was successful
         """
         try:
+            # Changes from here on are consumed from the feed, earlier state by the scan
+            self._change_cursor = self._storage.get_latest_vault_change_seq()
+            self._storage.compact_vault_changes()
+
             # If initial scan is configured, scan existing documents first
             if self._config.get("initial_scan", True):
                 self._scan_existing_documents()
@@ -143,14 +158,20 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             return []
 
     def _monitor_loop(self):
-        """Monitor loop that periodically checks changes in the vaults table"""
+        """Monitor loop that consumes the vaults change feed as changes are committed"""
         while not self._stop_event.is_set():
             try:
-                self._scan_vault_changes()
-                time.sleep(self._monitor_interval)
+                if self._storage.wait_for_vault_changes(
+                    self._change_cursor, self._monitor_interval, self._stop_event
+                ):
+                    cursor = self._change_cursor
+                    self._consume_vault_changes()
+                    if self._change_cursor == cursor:
+                        # Changes are pending but could not be read, back off
+                        self._stop_event.wait(self._monitor_interval)
             except Exception as e:
                 logger.exception(f"Monitor loop error: {e}")
-                time.sleep(self._monitor_interval)
+                self._stop_event.wait(self._monitor_interval)
 
     def _scan_existing_documents(self):
         """Scan existing documents (initial scan)"""
@@ -158,95 +179,93 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             logger.info("Starting initial scan of existing vault documents")
             documents = self._storage.get_vaults(limit=1000, offset=0, is_deleted=False)
 
+            skipped = 0
             for doc in documents:
                 if doc["id"] not in self._processed_vault_ids:
+                    self._processed_vault_ids.add(doc["id"])
+                    if self._is_unchanged(doc):
+                        skipped += 1
+                        continue
                     event = {
                         "event_type": "existing",
                         "vault_id": doc["id"],
                         "document_data": doc,
                         "timestamp": datetime.now(),
+                        # Later changes of the note come from the feed, after the cursor
+                        "change_seq": self._change_cursor,
                     }
 
                     with self._event_lock:
                         self._document_events.append(event)
 
-                    self._processed_vault_ids.add(doc["id"])
-
-            logger.info(f"Initial scan completed, found {len(documents)} documents")
+            logger.info(
+                f"Initial scan completed, found {len(documents)} documents, "
+                f"{skipped} unchanged since they were last ingested"
+            )
         except Exception as e:
             logger.exception(f"Initial scan failed: {e}")
 
-    def _scan_vault_changes(self):
-        """Scan changes in the vaults table"""
-        try:
-            # Get recent documents (based on created_at and updated_at)
-            current_time = datetime.now()
-            documents = self._storage.get_vaults(limit=100, offset=0, is_deleted=False)
-
-            new_documents = []
-            updated_documents = []
-
-            for doc in documents:
-                vault_id = doc["id"]
-                created_at = datetime.fromisoformat(doc["created_at"].replace("Z", "+00:00"))
-                updated_at = (
-                    datetime.fromisoformat(doc["updated_at"].replace("Z", "+00:00"))
-                    if doc.get("updated_at")
-                    else created_at
-                )
-
-                # Check if it's a new document
-                if vault_id not in self._processed_vault_ids:
-                    if created_at > self._last_scan_time:
-                        new_documents.append(doc)
-                    self._processed_vault_ids.add(vault_id)
-                # Check if it's an updated document
-                elif updated_at > self._last_scan_time:
-                    updated_documents.append(doc)
-
-            # Process new documents
-            for doc in new_documents:
-                event = {
-                    "event_type": "created",
-                    "vault_id": doc["id"],
-                    "document_data": doc,
-                    "timestamp": current_time,
-                }
-
-                with self._event_lock:
-                    self._document_events.append(event)
-
-                logger.debug(
-                    f"Detected new document: vault_id={doc['id']}, title={doc.get('title', '')}"
-                )
-
-            # Process updated documents
-            for doc in updated_documents:
-                event = {
-                    "event_type": "updated",
-                    "vault_id": doc["id"],
-                    "document_data": doc,
-                    "timestamp": current_time,
-                }
+    def _consume_vault_changes(self):
+        """Turn vault changes after the cursor into document events"""
+        current_time = datetime.now()
+        new_count = updated_count = 0
+        while not self._stop_event.is_set():
+            changes = self._storage.get_vault_changes(after_seq=self._change_cursor, limit=500)
+            if not changes:
+                break
+
+            # Several changes of one vault collapse into one event on its current state
+            latest: Dict[int, Dict[str, Any]] = {}
+            created: Set[int] = set()
+            for change in changes:
+                latest[change["vault_id"]] = change
+                if change["operation"] == "created":
+                    created.add(change["vault_id"])
+
+            for vault_id, change in latest.items():
+                if change["id"] is None or change["is_deleted"]:
+                    continue  # Deleted since
+                doc = {key: value for key, value in change.items() if key not in _FEED_COLUMNS}
+                if vault_id in created:
+                    event_type = "created"
+                    new_count += 1
+                elif self._is_unchanged(doc):
+                    # Edits that restore the ingested content need no re-ingestion
+                    continue
+                else:
+                    event_type = "updated"
+                    updated_count += 1
+                self._processed_vault_ids.add(vault_id)
 
                 with self._event_lock:
-                    self._document_events.append(event)
-
+                    self._document_events.append(
+                        {
+                            "event_type": event_type,
+                            "vault_id": vault_id,
+                            "document_data": doc,
+                            "timestamp": current_time,
+                            "change_seq": change["seq"],
+                        }
+                    )
                 logger.debug(
-                    f"Detected document update: vault_id={doc['id']}, title={doc.get('title', '')}"
+                    f"Detected document {event_type}: vault_id={vault_id}, "
+                    f"title={doc.get('title', '')}"
                 )
 
-            # Update scan time
-            self._last_scan_time = current_time
-            self._last_activity_time = current_time
+            self._change_cursor = changes[-1]["seq"]
+            self._changes_since_compaction += len(changes)
 
-            if new_documents or updated_documents:
-                logger.info(
-                    f"Scan completed: {len(new_documents)} new documents, {len(updated_documents)} updated documents"
-                )
+        if self._changes_since_compaction >= 1000:
+            self._storage.compact_vault_changes()
+            self._changes_since_compaction = 0
 
-        except Exception as e:
-            logger.exception(f"Failed to scan vault changes: {e}")
+        self._last_scan_time = current_time
+        self._last_activity_time = current_time
+        if new_count or updated_count:
+            logger.info(
+                f"Consumed vault changes: {new_count} new documents, "
+                f"{updated_count} updated documents"
+            )
 
     def _create_context_from_event(self, event: Dict[str, Any]) -> Optional[RawContextProperties]:
         """
@@ -266,7 +285,7 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             context_data = RawContextProperties(
                 source=ContextSource.VAULT,
                 content_format=ContentFormat.TEXT,
-                content_text=doc.get("title", "") + doc.get("summary", "") + doc.get("content", ""),
+                content_text=self._document_text(doc),
                 create_time=datetime.fromisoformat(doc["created_at"].replace("Z", "+00:00")),
                 filter_path=self._get_document_path(doc),
                 additional_info={
@@ -276,6 +295,8 @@ class VaultDocumentMonitor(BaseCaptureComponent):
                     "tags": doc.get("tags", ""),
                     "document_type": doc.get("document_type", "vaults"),
                     "event_type": event["event_type"],
+                    # Orders versions of the note, the processor skips superseded ones
+                    "change_seq": event.get("change_seq"),
                 },
                 enable_merge=False,
             )
@@ -285,6 +306,17 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             logger.exception(f"Failed to create context from event: {e}")
             return None
 
+    @staticmethod
+    def _document_text(doc: Dict[str, Any]) -> str:
+        return (doc.get("title") or "") + (doc.get("summary") or "") + (doc.get("content") or "")
+
+    def _is_unchanged(self, doc: Dict[str, Any]) -> bool:
+        """Whether the document text matches the fingerprint of its last ingestion"""
+        fingerprint = self._storage.get_vault_fingerprint(doc["id"])
+        return bool(fingerprint) and fingerprint["content_hash"] == content_hash(
+            self._document_text(doc)
+        )
+
     def _get_document_path(self, doc: Dict[str, Any]) -> str:
         """
         Get complete path of document (based on parent_id hierarchy)
@@ -318,7 +350,7 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             "properties": {
                 "monitor_interval": {
                     "type": "integer",
-                    "description": "Monitor interval (seconds)",
+                    "description": "Longest wait for changes made by other processes (seconds)",
                     "minimum": 1,
                     "default": 5,
                 },
@@ -362,6 +394,7 @@ class VaultDocumentMonitor(BaseCaptureComponent):
             "monitor_interval": self._monitor_interval,
             "processed_vault_count": len(self._processed_vault_ids),
             "pending_events": len(self._document_events),
+            "change_cursor": self._change_cursor,
             "last_scan_time": self._last_scan_time.isoformat() if self._last_scan_time else None,
             "is_monitoring": not self._stop_event.is_set(),
         }
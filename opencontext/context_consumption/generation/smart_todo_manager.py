@@ -371,7 +371,7 @@ class SmartTodoManager:
         self, new_tasks: List[Dict], similarity_threshold: float = 0.85
     ) -> List[Dict]:
         """Deduplicate new todos using vector similarity search"""
-        from opencontext.llm.global_embedding_client import do_vectorize
+        from opencontext.llm.global_embedding_client import do_vectorize_batch
         from opencontext.models.context import Vectorize
         from opencontext.storage.global_storage import get_storage
 
@@ -382,15 +382,25 @@ class SmartTodoManager:
         filtered_tasks = []
         filtered_count = 0
 
+        # Generate embeddings for all tasks in one batch
+        task_vectorizes = {
+            id(task): Vectorize(text=task.get("description", ""))
+            for task in new_tasks
+            if task.get("description", "").strip()
+        }
+        try:
+            do_vectorize_batch(list(task_vectorizes.values()))
+        except Exception as e:
+            logger.warning(f"Failed to batch generate todo embeddings: {e}")
+            return []
+
         for task in new_tasks:
             task_text = task.get("description", "")
             if not task_text.strip():
                 continue
 
-            # Generate embedding for the task
             try:
-                todo_vectorize = Vectorize(text=task_text)
-                do_vectorize(todo_vectorize)
+                todo_vectorize = task_vectorizes[id(task)]
                 if not todo_vectorize.vector:
                     # If embedding generation fails, conservatively keep the task
                     logger.warning(f"Unable to generate embedding for todo: {task_text[:50]}...")
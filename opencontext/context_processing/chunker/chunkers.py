@@ -234,51 +234,98 @@ class StructuredFileChunker(BaseChunker):
         except Exception as e:
             logger.exception(f"Error streaming CSV file {file_path}: {e}")
 
+    def _iter_excel_frames(
+        self, file_path: Path, chunk_size: int
+    ) -> Iterator[Tuple[str, int, pd.DataFrame]]:
+        """
+        Yield (sheet_name, start_row, frame) with up to chunk_size data rows each.
+        .xlsx sheets are read row by row in read-only mode, so only one frame is held
+        in memory; other formats are loaded a sheet at a time through pandas. Rows and
+        their start indices match pd.read_excel, but column dtypes are inferred per
+        frame, so a numeric column with blanks only prints as float in frames that
+        contain a blank.
+        """
+        if file_path.suffix.lower() != ".xlsx":
+            excel_file = pd.ExcelFile(file_path)
+            for sheet_name in excel_file.sheet_names:
+                df = pd.read_excel(excel_file, sheet_name=sheet_name)
+                for start_idx in range(0, len(df), chunk_size):
+                    yield sheet_name, start_idx, df.iloc[start_idx : start_idx + chunk_size]
+            return
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                rows = sheet.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    continue
+                columns = [
+                    str(name) if name is not None else f"Unnamed: {i}"
+                    for i, name in enumerate(header)
+                ]
+                buffer, blank_rows, start_idx = [], 0, 0
+                for row in rows:
+                    # Like pandas, keep blank rows inside the data but not trailing ones
+                    if all(value is None for value in row):
+                        blank_rows += 1
+                        continue
+                    for _ in range(blank_rows):
+                        buffer.append((None,) * len(columns))
+                        if len(buffer) >= chunk_size:
+                            yield sheet.title, start_idx, pd.DataFrame(buffer, columns=columns)
+                            start_idx += len(buffer)
+                            buffer = []
+                    blank_rows = 0
+                    buffer.append(row[: len(columns)])
+                    if len(buffer) >= chunk_size:
+                        yield sheet.title, start_idx, pd.DataFrame(buffer, columns=columns)
+                        start_idx += len(buffer)
+                        buffer = []
+                if buffer:
+                    yield sheet.title, start_idx, pd.DataFrame(buffer, columns=columns)
+        finally:
+            workbook.close()
+
     def _chunk_excel_streaming(
         self, file_path: Path, context: RawContextProperties
     ) -> Iterator[Chunk]:
         """Stream Excel file in chunks"""
         try:
-            # Read all sheets
-            excel_file = pd.ExcelFile(file_path)
             chunk_idx = 0
+            chunk_size = self.config.batch_size
 
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-
-                if df.empty:
+            for sheet_name, start_idx, df_chunk in self._iter_excel_frames(file_path, chunk_size):
+                if df_chunk.empty:
                     continue
+                end_idx = start_idx + len(df_chunk)
 
-                # Split large sheets into smaller chunks
-                chunk_size = self.config.batch_size
-                for start_idx in range(0, len(df), chunk_size):
-                    end_idx = min(start_idx + chunk_size, len(df))
-                    df_chunk = df.iloc[start_idx:end_idx]
-
-                    # Convert to text with headers
-                    text_content = df_chunk.to_string(index=False)
+                # Convert to text with headers
+                text_content = df_chunk.to_string(index=False)
 
-                    metadata = {
-                        "file_type": "excel",
-                        "sheet_name": sheet_name,
-                        "chunk_rows": len(df_chunk),
-                        "columns": list(df_chunk.columns),
-                        "row_range": (start_idx, end_idx - 1),
-                        "file_path": str(file_path),
-                    }
+                metadata = {
+                    "file_type": "excel",
+                    "sheet_name": sheet_name,
+                    "chunk_rows": len(df_chunk),
+                    "columns": list(df_chunk.columns),
+                    "row_range": (start_idx, end_idx - 1),
+                    "file_path": str(file_path),
+                }
 
-                    yield Chunk(
-                        text=text_content,
-                        chunk_index=chunk_idx,
-                        source_document_id=context.object_id,
-                        title=f"Excel {sheet_name} Chunk {chunk_idx + 1}",
-                        summary=f"Excel sheet '{sheet_name}' rows {start_idx}-{end_idx-1}",
-                        semantic_type="structured_data",
-                        keywords=list(df_chunk.columns),  # Column names as keywords
-                        metadata=metadata,
-                    )
+                yield Chunk(
+                    text=text_content,
+                    chunk_index=chunk_idx,
+                    source_document_id=context.object_id,
+                    title=f"Excel {sheet_name} Chunk {chunk_idx + 1}",
+                    summary=f"Excel sheet '{sheet_name}' rows {start_idx}-{end_idx-1}",
+                    semantic_type="structured_data",
+                    keywords=list(df_chunk.columns),  # Column names as keywords
+                    metadata=metadata,
+                )
 
-                    chunk_idx += 1
+                chunk_idx += 1
 
         except Exception as e:
             logger.exception(f"Error streaming Excel file {file_path}: {e}")
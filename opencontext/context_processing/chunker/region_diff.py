@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Region diff - Chunk-level change detection for re-ingesting edited documents
+
+A document is split into regions at content-defined boundaries: before headings,
+and after paragraphs whose hash picks them as a boundary. An edit therefore only
+changes the regions around it, and boundaries further on stay where they were.
+Consecutive regions are grouped into segments that are chunked on their own, and
+each stored segment remembers the region hashes it covers and the contexts it
+produced. On re-ingestion, stored segments whose regions are all still present (in
+order) are kept as they are; the remaining regions are re-chunked, and the contexts
+of segments that are no longer present become stale.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+
+def content_hash(text: str) -> str:
+    """Fingerprint of a whole document"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Region:
+    """A run of paragraphs with its content hash"""
+
+    text: str
+    hash: str
+
+
+def split_regions(text: str, min_chars: int = 200, max_chars: int = 2000) -> List[Region]:
+    """
+    Split text into regions of whole paragraphs. A region ends before a heading, once
+    it reaches max_chars, or after a paragraph of at least min_chars accumulated text
+    whose hash selects it as a boundary (about one paragraph in four).
+    """
+    regions: List[Region] = []
+    paragraphs: List[str] = []
+    size = 0
+
+    def flush():
+        nonlocal paragraphs, size
+        if paragraphs:
+            region_text = "\n\n".join(paragraphs)
+            regions.append(Region(text=region_text, hash=content_hash(region_text)))
+        paragraphs, size = [], 0
+
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        if not paragraph.strip():
+            continue
+        if paragraphs and (paragraph.lstrip().startswith("#") or size >= max_chars):
+            flush()
+        paragraphs.append(paragraph)
+        size += len(paragraph)
+        if size >= min_chars and int(content_hash(paragraph)[:8], 16) % 4 == 0:
+            flush()
+    flush()
+    return regions
+
+
+@dataclass
+class SegmentItem:
+    """A segment of the new layout, context_ids is None until it has been chunked"""
+
+    regions: List[Region]
+    context_ids: Optional[List[str]] = None
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(region.text for region in self.regions)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hashes": [region.hash for region in self.regions],
+            "context_ids": list(self.context_ids or []),
+        }
+
+
+@dataclass
+class UpdatePlan:
+    """Segments of the new document in order, and contexts to delete once stored"""
+
+    items: List[SegmentItem] = field(default_factory=list)
+    stale_context_ids: List[str] = field(default_factory=list)
+    kept_segments: int = 0
+
+    @property
+    def new_items(self) -> List[SegmentItem]:
+        return [item for item in self.items if item.context_ids is None]
+
+    def segments(self) -> List[Dict[str, Any]]:
+        """Stored form of the new layout, once every new item has been chunked"""
+        return [item.to_dict() for item in self.items]
+
+
+def plan_update(
+    regions: List[Region],
+    old_segments: List[Dict[str, Any]],
+    segment_chars: int = 4000,
+) -> UpdatePlan:
+    """
+    Match the stored segments of a document against its new regions.
+
+    Args:
+        regions: Regions of the new document (split_regions)
+        old_segments: Stored segments, dicts with "hashes" and "context_ids"
+        segment_chars: Size up to which uncovered regions are grouped into one segment
+    """
+    hashes = [region.hash for region in regions]
+    covered: List[Optional[Dict[str, Any]]] = [None] * len(regions)
+    plan = UpdatePlan()
+
+    # Kept segments must appear in their old order, each at the first free match
+    cursor = 0
+    for segment in old_segments:
+        segment_hashes = segment.get("hashes") or []
+        width = len(segment_hashes)
+        match = None
+        if width:
+            for start in range(cursor, len(hashes) - width + 1):
+                if hashes[start : start + width] == segment_hashes:
+                    match = start
+                    break
+        if match is None:
+            plan.stale_context_ids.extend(segment.get("context_ids") or [])
+            continue
+        covered[match] = segment
+        for idx in range(match + 1, match + width):
+            covered[idx] = {}
+        cursor = match + width
+        plan.kept_segments += 1
+
+    run: List[Region] = []
+    run_size = 0
+
+    def close_run():
+        nonlocal run, run_size
+        if run:
+            plan.items.append(SegmentItem(regions=run))
+        run, run_size = [], 0
+
+    idx = 0
+    while idx < len(regions):
+        segment = covered[idx]
+        if segment:
+            close_run()
+            width = len(segment["hashes"])
+            plan.items.append(
+                SegmentItem(
+                    regions=regions[idx : idx + width],
+                    context_ids=list(segment.get("context_ids") or []),
+                )
+            )
+            idx += width
+            continue
+        region = regions[idx]
+        if run and run_size + len(region.text) > segment_chars:
+            close_run()
+        run.append(region)
+        run_size += len(region.text)
+        idx += 1
+    close_run()
+    return plan
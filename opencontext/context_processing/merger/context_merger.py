@@ -8,7 +8,6 @@
 Context merge processor - Responsible for merging similar contexts into one.
 """
 import json
-import math
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -20,6 +19,10 @@ from opencontext.context_processing.merger.merge_strategies import (
     ContextTypeAwareStrategy,
     StrategyFactory,
 )
+from opencontext.context_processing.merger.similarity_grouping import (
+    GroupingMode,
+    group_by_similarity,
+)
 from opencontext.context_processing.processor.base_processor import BaseContextProcessor
 from opencontext.llm.global_embedding_client import do_vectorize
 from opencontext.llm.global_vlm_client import generate_with_messages
@@ -28,6 +31,7 @@ from opencontext.models.enums import ContextType, MergeType
 from opencontext.storage.global_storage import get_storage
 from opencontext.utils.json_parser import parse_json_from_response
 from opencontext.utils.logging_utils import get_logger
+from opencontext.utils.similarity import cosine_similarity
 
 logger = get_logger(__name__)
 
@@ -52,6 +56,10 @@ class ContextMerger(BaseContextProcessor):
         # Intelligent merging switch
         self.use_intelligent_merging = config.get("use_intelligent_merging", True)
 
+        # Similarity grouping used by periodic memory compression
+        self._grouping_mode = GroupingMode(config.get("grouping_mode", GroupingMode.GREEDY.value))
+        self._grouping_block_size = config.get("grouping_block_size", 256)
+
     @property
     def storage(self):
         """Get storage from global singleton"""
@@ -121,11 +129,10 @@ class ContextMerger(BaseContextProcessor):
             best_target = None
             best_score = 0.0
 
-            for candidate in candidates:
-                if candidate.id == context.id:
-                    continue
+            candidates = [candidate for candidate in candidates if candidate.id != context.id]
+            results = strategy.can_merge_batch(candidates, context)
 
-                can_merge, score = strategy.can_merge(candidate, context)
+            for candidate, (can_merge, score) in zip(candidates, results):
                 if can_merge and score > best_score:
                     best_target = candidate
                     best_score = score
@@ -490,28 +497,19 @@ class ContextMerger(BaseContextProcessor):
                 "has_compression": False,
                 "enable_merge": True,
             }
-            limit = 1000
-            offset = 0
-            while True:
-                contexts_by_backend = self.storage.get_all_processed_contexts(
-                    limit=limit, offset=offset, filter=filter
-                )
-
-                if not any(contexts_by_backend.values()):
-                    logger.info("No more recent contexts to process in this iteration.")
-                    break
-                has_merge = False
-                for backend_name, backend_contexts in contexts_by_backend.items():
-                    if len(backend_contexts) < 2:
+            page_size = 1000
+            for context_type in ContextType:
+                # Sources of merges that an interrupted run stored but did not delete
+                self._delete_merged_sources(context_type.value, page_size)
+                merged_count = 0
+                for page in self.storage.iter_processed_context_pages(
+                    context_type.value, filter=filter, page_size=page_size, need_vector=True
+                ):
+                    if len(page) < 2:
                         continue
-                    has_merge = True
-                    logger.info(
-                        f"Processing {len(backend_contexts)} contexts from backend '{backend_name}'."
-                    )
+                    logger.info(f"Processing {len(page)} contexts from '{context_type.value}'.")
 
-                    groups = self._group_contexts_by_similarity(
-                        backend_contexts, self._similarity_threshold
-                    )
+                    groups = self._group_contexts_by_similarity(page, self._similarity_threshold)
 
                     for group in groups:
                         if len(group) > 1:
@@ -523,30 +521,64 @@ class ContextMerger(BaseContextProcessor):
                                 f"Merging {len(sources)} contexts into {target_candidate.id} within the group."
                             )
                             merged_context = self.merge_multiple(target_candidate, sources)
-                            if merged_context:
-                                self.storage.upsert_processed_context(merged_context)
-                                self.storage.delete_processed_context(
-                                    target_candidate.id,
-                                    target_candidate.extracted_data.context_type.value,
-                                )
-                                for ctx in sources:
-                                    self.storage.delete_processed_context(
-                                        ctx.id, ctx.extracted_data.context_type.value
-                                    )
-                                logger.info(
-                                    f"Successfully merged within group and cleaned up {len(sources)} source contexts."
+                            if merged_context and self.storage.upsert_processed_context(
+                                merged_context
+                            ):
+                                # Recorded as soon as the merge is stored, so a crash
+                                # before the deletes below does not leave duplicates
+                                merged_ids = [target_candidate.id] + [ctx.id for ctx in sources]
+                                self.storage.record_merged_sources(
+                                    merged_context.id, context_type.value, merged_ids
                                 )
+                                merged_count += len(merged_ids)
 
-                if not has_merge:
-                    break
-                offset += limit
+                # Deleting while paging would shift the offsets of later pages,
+                # so merged contexts are removed once the scan is done
+                if merged_count:
+                    deleted = self._delete_merged_sources(context_type.value, page_size)
+                    logger.info(
+                        f"Merged {merged_count} {context_type.value} contexts, "
+                        f"cleaned up {deleted}."
+                    )
 
             logger.info("Periodic memory compression finished.")
         except Exception as e:
             logger.exception(f"Error during periodic memory compression: {e}")
 
+    def _delete_merged_sources(self, context_type: str, batch_size: int) -> int:
+        """Delete the recorded sources of stored merges in bounded batches, returns the count"""
+        deleted = 0
+        while True:
+            ids = self.storage.get_merged_sources(context_type, limit=batch_size)
+            if not ids:
+                return deleted
+            if not self.storage.delete_processed_contexts(ids, context_type):
+                logger.warning(f"Failed to delete {len(ids)} merged {context_type} contexts")
+                return deleted
+            if not self.storage.delete_merged_sources(ids):
+                return deleted
+            deleted += len(ids)
+
     def _group_contexts_by_similarity(
         self, contexts: List[ProcessedContext], threshold: float
+    ) -> List[List[ProcessedContext]]:
+        """Groups contexts by embedding similarity using the vectorized grouping engine."""
+        if not contexts:
+            return []
+
+        index_groups = group_by_similarity(
+            [ctx.vectorize.vector if ctx.vectorize else None for ctx in contexts],
+            threshold,
+            mode=self._grouping_mode,
+            block_size=self._grouping_block_size,
+        )
+        if index_groups is None:
+            logger.warning("Embeddings have mixed dimensions, falling back to pairwise grouping")
+            return self._group_contexts_by_similarity_pairwise(contexts, threshold)
+        return [[contexts[i] for i in group] for group in index_groups]
+
+    def _group_contexts_by_similarity_pairwise(
+        self, contexts: List[ProcessedContext], threshold: float
     ) -> List[List[ProcessedContext]]:
         """Greedily groups contexts by similarity based on their embeddings."""
         if not contexts:
@@ -578,20 +610,7 @@ class ContextMerger(BaseContextProcessor):
 
     def _calculate_similarity(self, emb1: List[float], emb2: List[float]) -> float:
         """Calculates cosine similarity between two embeddings."""
-        if emb1 is None or emb2 is None or not emb1 or not emb2:
-            return 0.0
-
-        # Calculate dot product
-        dot_product = sum(a * b for a, b in zip(emb1, emb2))
-
-        # Calculate norms
-        norm_emb1 = math.sqrt(sum(a * a for a in emb1))
-        norm_emb2 = math.sqrt(sum(b * b for b in emb2))
-
-        if norm_emb1 == 0 or norm_emb2 == 0:
-            return 0.0
-
-        return dot_product / (norm_emb1 * norm_emb2)
+        return cosine_similarity(emb1, emb2)
 
     def intelligent_memory_cleanup(self):
         """
@@ -632,33 +651,30 @@ class ContextMerger(BaseContextProcessor):
             if not backend:
                 return stats
 
-            # 分批获取上下文进行清理
-            limit = 100
-            offset = 0
-
-            while True:
-                contexts = self._get_contexts_for_cleanup(context_type.value, limit, offset)
-                if not contexts:
-                    break
+            # 分批获取上下文进行清理, lazy views only decode the fields should_cleanup reads
+            cleanup_ids = []
+            for context in self.storage.iter_processed_contexts(
+                context_type.value, page_size=100, lazy=True
+            ):
+                stats["checked"] += 1
 
-                for context in contexts:
-                    stats["checked"] += 1
-
-                    try:
-                        if strategy.should_cleanup(context):
-                            self.storage.delete_processed_context(context.id, context_type.value)
-                            stats["cleaned"] += 1
-                            logger.debug(
-                                f"Cleaned up context {context.id} of type {context_type.value}"
-                            )
+                try:
+                    if strategy.should_cleanup(context):
+                        cleanup_ids.append(context.id)
+                        logger.debug(
+                            f"Cleaning up context {context.id} of type {context_type.value}"
+                        )
 
-                    except Exception as e:
-                        stats["errors"] += 1
-                        logger.error(f"Error cleaning up context {context.id}: {e}")
+                except Exception as e:
+                    stats["errors"] += 1
+                    logger.error(f"Error cleaning up context {context.id}: {e}")
 
-                if len(contexts) < limit:
-                    break
-                offset += limit
+            # Delete after the scan so paging offsets stay stable
+            if cleanup_ids:
+                if self.storage.delete_processed_contexts(cleanup_ids, context_type.value):
+                    stats["cleaned"] += len(cleanup_ids)
+                else:
+                    stats["errors"] += len(cleanup_ids)
 
             logger.info(
                 f"Cleanup for {context_type.value}: checked {stats['checked']}, cleaned {stats['cleaned']}"
@@ -670,21 +686,6 @@ class ContextMerger(BaseContextProcessor):
 
         return stats
 
-    def _get_contexts_for_cleanup(
-        self, context_type_value: str, limit: int, offset: int
-    ) -> List[ProcessedContext]:
-        """获取需要清理检查的上下文"""
-        try:
-            contexts_dict = self.storage.get_all_processed_contexts(
-                limit=limit, offset=offset, filter={}
-            )
-
-            return contexts_dict.get(context_type_value, [])
-
-        except Exception as e:
-            logger.error(f"Error getting contexts for cleanup: {e}")
-            return []
-
     def memory_reinforcement(self, context_ids: List[str]):
         """
         记忆强化：重置指定上下文的遗忘状态，提升重要性
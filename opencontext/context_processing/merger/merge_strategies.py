@@ -17,6 +17,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from opencontext.models.context import ExtractedData, ProcessedContext
 from opencontext.models.enums import ContextType, MergeType
 from opencontext.utils.logging_utils import get_logger
+from opencontext.utils.similarity import cosine_similarity, cosine_similarity_one_to_many
 
 logger = get_logger(__name__)
 
@@ -42,7 +43,12 @@ class ContextTypeAwareStrategy(ABC):
         pass
 
     @abstractmethod
-    def can_merge(self, target: ProcessedContext, source: ProcessedContext) -> Tuple[bool, float]:
+    def can_merge(
+        self,
+        target: ProcessedContext,
+        source: ProcessedContext,
+        vector_sim: Optional[float] = None,
+    ) -> Tuple[bool, float]:
         """
         Determine if two contexts can be merged, return (can_merge, similarity_score)
         """
@@ -57,6 +63,27 @@ class ContextTypeAwareStrategy(ABC):
         """
         pass
 
+    def can_merge_batch(
+        self, targets: List[ProcessedContext], source: ProcessedContext
+    ) -> List[Tuple[bool, float]]:
+        """
+        Evaluate merging source into each of targets.
+        Vector similarities against all targets are computed in one vectorized call.
+        """
+        if not targets:
+            return []
+        similarities = cosine_similarity_one_to_many(
+            source.vectorize, [target.vectorize for target in targets]
+        )
+        return [
+            self.can_merge(target, source, vector_sim=float(sim))
+            for target, sim in zip(targets, similarities)
+        ]
+
+    def _vector_similarity(self, target: ProcessedContext, source: ProcessedContext) -> float:
+        """Cosine similarity of the two contexts' embeddings"""
+        return cosine_similarity(target.vectorize, source.vectorize)
+
     def calculate_forgetting_probability(self, context: ProcessedContext) -> float:
         """
         Calculate forgetting probability based on forgetting curve, different types have different forgetting strategies
@@ -112,7 +139,12 @@ class ProfileContextStrategy(ContextTypeAwareStrategy):
     def get_context_type(self) -> ContextType:
         return ContextType.ENTITY_CONTEXT
 
-    def can_merge(self, target: ProcessedContext, source: ProcessedContext) -> Tuple[bool, float]:
+    def can_merge(
+        self,
+        target: ProcessedContext,
+        source: ProcessedContext,
+        vector_sim: Optional[float] = None,
+    ) -> Tuple[bool, float]:
         """
         Profile type merge criteria:
         1. High entity overlap (same person)
@@ -135,9 +167,8 @@ class ProfileContextStrategy(ContextTypeAwareStrategy):
 
         # Vector similarity check
         if target.vectorize and source.vectorize:
-            vector_sim = self._calculate_cosine_similarity(
-                target.vectorize.vector, source.vectorize.vector
-            )
+            if vector_sim is None:
+                vector_sim = self._vector_similarity(target, source)
 
             # Profile type requires higher similarity threshold
             if vector_sim > 0.85:
@@ -211,20 +242,6 @@ class ProfileContextStrategy(ContextTypeAwareStrategy):
         # 简化的摘要合并，实际应该用LLM进行智能融合
         return f"综合{len(summaries)}项记录的身份信息: " + "; ".join(summaries[:3])
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -267,7 +284,12 @@ class ActivityContextStrategy(ContextTypeAwareStrategy):
     def get_context_type(self) -> ContextType:
         return ContextType.ACTIVITY_CONTEXT
 
-    def can_merge(self, target: ProcessedContext, source: ProcessedContext) -> Tuple[bool, float]:
+    def can_merge(
+        self,
+        target: ProcessedContext,
+        source: ProcessedContext,
+        vector_sim: Optional[float] = None,
+    ) -> Tuple[bool, float]:
         """
         Activity类型的合并判断：
         1. 时间窗口内的活动
@@ -306,9 +328,8 @@ class ActivityContextStrategy(ContextTypeAwareStrategy):
         if entity_overlap > 0.2 or keyword_overlap > 0.3:
             # 向量相似度检查
             if target.vectorize and source.vectorize:
-                vector_sim = self._calculate_cosine_similarity(
-                    target.vectorize.vector, source.vectorize.vector
-                )
+                if vector_sim is None:
+                    vector_sim = self._vector_similarity(target, source)
 
                 if vector_sim > 0.7:  # Activity相似度阈值
                     final_score = (
@@ -386,20 +407,6 @@ class ActivityContextStrategy(ContextTypeAwareStrategy):
 
         return f"包含{len(contexts)}个活动的序列: " + " -> ".join(key_activities[:5])
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -445,7 +452,12 @@ class StateContextStrategy(ContextTypeAwareStrategy):
     def get_context_type(self) -> ContextType:
         return ContextType.STATE_CONTEXT
 
-    def can_merge(self, target: ProcessedContext, source: ProcessedContext) -> Tuple[bool, float]:
+    def can_merge(
+        self,
+        target: ProcessedContext,
+        source: ProcessedContext,
+        vector_sim: Optional[float] = None,
+    ) -> Tuple[bool, float]:
         """
         State类型的合并判断：
         1. 很短的时间窗口（分钟级）
@@ -634,7 +646,12 @@ class IntentContextStrategy(ContextTypeAwareStrategy):
     def get_context_type(self) -> ContextType:
         return ContextType.INTENT_CONTEXT
 
-    def can_merge(self, target: ProcessedContext, source: ProcessedContext) -> Tuple[bool, float]:
+    def can_merge(
+        self,
+        target: ProcessedContext,
+        source: ProcessedContext,
+        vector_sim: Optional[float] = None,
+    ) -> Tuple[bool, float]:
         """
         Intent类型的合并判断：
         1. 相同目标或项目的意图
@@ -665,9 +682,8 @@ class IntentContextStrategy(ContextTypeAwareStrategy):
         if entity_overlap > 0.25 or keyword_overlap > 0.35:
             # 向量相似度检查
             if target.vectorize and source.vectorize:
-                vector_sim = self._calculate_cosine_similarity(
-                    target.vectorize.vector, source.vectorize.vector
-                )
+                if vector_sim is None:
+                    vector_sim = self._vector_similarity(target, source)
 
                 if vector_sim > 0.75:  # Intent相似度阈值
                     final_score = (
@@ -798,20 +814,6 @@ class IntentContextStrategy(ContextTypeAwareStrategy):
             # 未完成的意图需要保留
             return base_prob * 0.7
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -857,7 +859,12 @@ class SemanticContextStrategy(ContextTypeAwareStrategy):
     def get_context_type(self) -> ContextType:
         return ContextType.SEMANTIC_CONTEXT
 
-    def can_merge(self, target: ProcessedContext, source: ProcessedContext) -> Tuple[bool, float]:
+    def can_merge(
+        self,
+        target: ProcessedContext,
+        source: ProcessedContext,
+        vector_sim: Optional[float] = None,
+    ) -> Tuple[bool, float]:
         """
         Semantic类型的合并判断：
         1. 概念相关性
@@ -888,9 +895,8 @@ class SemanticContextStrategy(ContextTypeAwareStrategy):
         if entity_overlap > 0.3 or keyword_overlap > 0.4:
             # 向量相似度检查
             if target.vectorize and source.vectorize:
-                vector_sim = self._calculate_cosine_similarity(
-                    target.vectorize.vector, source.vectorize.vector
-                )
+                if vector_sim is None:
+                    vector_sim = self._vector_similarity(target, source)
 
                 if vector_sim > 0.72:  # Semantic相似度阈值
                     final_score = (
@@ -1009,20 +1015,6 @@ class SemanticContextStrategy(ContextTypeAwareStrategy):
 
         return f"知识整合的{len(all_contexts)}个相关概念: " + "; ".join(key_concepts)
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -1065,7 +1057,12 @@ class ProceduralContextStrategy(ContextTypeAwareStrategy):
     def get_context_type(self) -> ContextType:
         return ContextType.PROCEDURAL_CONTEXT
 
-    def can_merge(self, target: ProcessedContext, source: ProcessedContext) -> Tuple[bool, float]:
+    def can_merge(
+        self,
+        target: ProcessedContext,
+        source: ProcessedContext,
+        vector_sim: Optional[float] = None,
+    ) -> Tuple[bool, float]:
         """
         Procedural类型的合并判断：
         1. 相同工具或方法
@@ -1096,9 +1093,8 @@ class ProceduralContextStrategy(ContextTypeAwareStrategy):
         if entity_overlap > 0.35 or keyword_overlap > 0.45:
             # 向量相似度检查
             if target.vectorize and source.vectorize:
-                vector_sim = self._calculate_cosine_similarity(
-                    target.vectorize.vector, source.vectorize.vector
-                )
+                if vector_sim is None:
+                    vector_sim = self._vector_similarity(target, source)
 
                 if vector_sim > 0.75:  # Procedural相似度阈值
                     final_score = (
@@ -1217,20 +1213,6 @@ class ProceduralContextStrategy(ContextTypeAwareStrategy):
 
         return f"包含{len(all_contexts)}个相关操作流程的整合指南: " + "; ".join(key_procedures[:5])
 
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """计算余弦相似度"""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _create_merged_context(
         self, target: ProcessedContext, sources: List[ProcessedContext], merged_data: Dict[str, Any]
     ) -> ProcessedContext:
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Vectorized similarity grouping - Groups embeddings by cosine similarity using blocked
+matrix multiplication over a normalized float32 matrix.
+"""
+
+from enum import Enum
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from opencontext.utils.logging_utils import get_logger
+from opencontext.utils.similarity import stack_unit_vectors
+
+logger = get_logger(__name__)
+
+
+class GroupingMode(str, Enum):
+    """How similar items are combined into groups"""
+
+    # Leader clustering in input order, identical to the legacy greedy loop:
+    # each unassigned item seeds a group and absorbs every later unassigned item
+    # whose similarity to the seed exceeds the threshold
+    GREEDY = "greedy"
+    # Connected components of the "similarity > threshold" graph (transitive)
+    UNION_FIND = "union_find"
+
+
+def build_normalized_matrix(
+    embeddings: Sequence[Optional[Sequence[float]]],
+) -> Optional[np.ndarray]:
+    """
+    Stack embeddings into an L2-normalized float32 matrix.
+    Missing or zero embeddings become zero rows so they never match anything.
+    Returns None if the non-empty embeddings do not share one dimension.
+    """
+    dims = {len(e) for e in embeddings if e is not None and len(e) > 0}
+    if len(dims) > 1:
+        return None
+    return stack_unit_vectors(embeddings, dim=dims.pop() if dims else 0)
+
+
+def group_by_similarity(
+    embeddings: Sequence[Optional[Sequence[float]]],
+    threshold: float,
+    mode: GroupingMode = GroupingMode.GREEDY,
+    block_size: int = 256,
+) -> Optional[List[List[int]]]:
+    """
+    Group embeddings whose cosine similarity exceeds threshold.
+
+    Similarities are computed block by block (block_size rows against the full
+    matrix) so memory stays at O(block_size * n).
+
+    Returns:
+        Groups as lists of input indices, in order of their first member, or None
+        if the embeddings cannot be stacked (mixed dimensions).
+    """
+    n = len(embeddings)
+    if n == 0:
+        return []
+    matrix = build_normalized_matrix(embeddings)
+    if matrix is None:
+        return None
+    valid = np.linalg.norm(matrix, axis=1) > 0
+    block_size = max(1, block_size)
+
+    if GroupingMode(mode) == GroupingMode.UNION_FIND:
+        return _group_union_find(matrix, valid, threshold, block_size)
+    return _group_greedy(matrix, valid, threshold, block_size)
+
+
+def _group_greedy(
+    matrix: np.ndarray, valid: np.ndarray, threshold: float, block_size: int
+) -> List[List[int]]:
+    n = matrix.shape[0]
+    assigned = np.zeros(n, dtype=bool)
+    groups: List[List[int]] = []
+
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        block = None
+        for seed in range(start, end):
+            if assigned[seed]:
+                continue
+            assigned[seed] = True
+            group = [seed]
+            if valid[seed] and seed + 1 < n:
+                if block is None:
+                    # Columns before the block start are already assigned, skip them
+                    block = matrix[start:end] @ matrix[start:].T
+                sims = block[seed - start, seed + 1 - start :]
+                candidates = np.flatnonzero((sims > threshold) & ~assigned[seed + 1 :]) + seed + 1
+                candidates = candidates[valid[candidates]]
+                assigned[candidates] = True
+                group.extend(candidates.tolist())
+            groups.append(group)
+    return groups
+
+
+def _group_union_find(
+    matrix: np.ndarray, valid: np.ndarray, threshold: float, block_size: int
+) -> List[List[int]]:
+    n = matrix.shape[0]
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        # Upper triangle only: compare the block against itself and everything after it
+        sims = matrix[start:end] @ matrix[start:].T
+        rows, cols = np.nonzero(sims > threshold)
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            i, j = start + r, start + c
+            if j <= i or not (valid[i] and valid[j]):
+                continue
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # Keep the smallest index as root so groups stay in input order
+                if root_i < root_j:
+                    parent[root_j] = root_i
+                else:
+                    parent[root_i] = root_j
+
+    members = {}
+    for i in range(n):
+        members.setdefault(find(i), []).append(i)
+    return [members[root] for root in sorted(members)]
@@ -9,13 +9,15 @@ Document Converter Helper Class
 
 Provides document conversion and analysis functions:
 - Document to images (PDF/DOCX/PPTX/images)
+- Lazy per-page PDF rendering (PdfPageSource)
 - Page-by-page analysis (PDF/DOCX): Extract text + detect visual elements
 """
 
 import os
 import tempfile
+import threading
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from PIL import Image
 
@@ -23,6 +25,9 @@ from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# pdfium is not thread-safe, even across documents: all calls into it are serialized
+_PDFIUM_LOCK = threading.RLock()
+
 
 class PageInfo:
     """Page information container"""
@@ -36,11 +41,100 @@ class PageInfo:
         return f"PageInfo(page={self.page_number}, text_len={len(self.text)}, visual={self.has_visual_elements}, images={len(self.doc_images)})"
 
 
+class PdfPageSource:
+    """
+    Lazy page renderer over a PDF (pypdfium2), random access by 1-based page number.
+
+    Pages are rendered only when requested, so memory holds the pages in use rather
+    than the whole document. A page whose RGB bitmap at the configured DPI would
+    exceed max_page_bytes is rendered at the largest scale that fits. Safe to use from
+    several threads, rendering itself runs one page at a time process-wide.
+    """
+
+    def __init__(self, pdf_path: str, dpi: int = 200, max_page_bytes: Optional[int] = None):
+        import pypdfium2 as pdfium
+
+        with _PDFIUM_LOCK:
+            self._pdf = pdfium.PdfDocument(pdf_path)
+        self.dpi = dpi
+        self.max_page_bytes = max_page_bytes
+
+    def __len__(self) -> int:
+        with _PDFIUM_LOCK:
+            return len(self._pdf)
+
+    def __enter__(self) -> "PdfPageSource":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _scale(self, width_pt: float, height_pt: float) -> float:
+        # scale=1 corresponds to 72 DPI
+        scale = self.dpi / 72.0
+        if self.max_page_bytes:
+            page_bytes = width_pt * height_pt * scale * scale * 3
+            if page_bytes > self.max_page_bytes:
+                scale *= (self.max_page_bytes / page_bytes) ** 0.5
+        return scale
+
+    def estimate_bytes(self, page_number: int) -> int:
+        """Size of the RGB bitmap render() would allocate for a page"""
+        with _PDFIUM_LOCK:
+            page = self._pdf[page_number - 1]
+            try:
+                width_pt, height_pt = page.get_size()
+            finally:
+                page.close()
+        scale = self._scale(width_pt, height_pt)
+        return int(width_pt * scale) * int(height_pt * scale) * 3
+
+    def render(self, page_number: int) -> Image.Image:
+        """Render one page as an RGB image"""
+        with _PDFIUM_LOCK:
+            page = self._pdf[page_number - 1]
+            try:
+                scale = self._scale(*page.get_size())
+                bitmap = page.render(scale=scale)
+                pil_image = bitmap.to_pil()
+                if pil_image.mode != "RGB":
+                    pil_image = pil_image.convert("RGB")
+                else:
+                    # to_pil may share the pdfium buffer, keep an independent copy
+                    pil_image = pil_image.copy()
+                bitmap.close()
+                return pil_image
+            finally:
+                page.close()
+
+    def iter_pages(
+        self, page_numbers: Optional[Iterable[int]] = None
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        """Render pages one at a time, all pages in order by default"""
+        if page_numbers is None:
+            page_numbers = range(1, len(self) + 1)
+        for page_number in page_numbers:
+            yield page_number, self.render(page_number)
+
+    def close(self) -> None:
+        with _PDFIUM_LOCK:
+            if self._pdf is not None:
+                self._pdf.close()
+                self._pdf = None
+
+
 class DocumentConverter:
     """Document Converter - read once, provide all information"""
 
-    def __init__(self, dpi: int = 200):
+    def __init__(self, dpi: int = 200, max_page_bytes: Optional[int] = None):
         self.dpi = dpi
+        self.max_page_bytes = max_page_bytes
+
+    def open_pdf_pages(self, pdf_path: str) -> PdfPageSource:
+        """Open a PDF for lazy per-page rendering (close it, or use it as a context manager)"""
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"File not found: {pdf_path}")
+        return PdfPageSource(pdf_path, dpi=self.dpi, max_page_bytes=self.max_page_bytes)
 
     def convert_to_images(self, file_path: str) -> List[Image.Image]:
         """Convert document to image list"""
@@ -62,21 +156,8 @@ class DocumentConverter:
     def _convert_pdf_to_images(self, pdf_path: str) -> List[Image.Image]:
         """Convert PDF to image list (using pypdfium2)"""
         try:
-            import pypdfium2 as pdfium
-
-            pdf = pdfium.PdfDocument(pdf_path)
-            images = []
-            for page_index in range(len(pdf)):
-                page = pdf[page_index]
-                # Render page as PIL Image
-                # scale parameter controls resolution: scale=1 corresponds to 72 DPI
-                scale = self.dpi / 72.0
-                pil_image = page.render(scale=scale).to_pil()
-                if pil_image.mode != "RGB":
-                    pil_image = pil_image.convert("RGB")
-                images.append(pil_image)
-            pdf.close()
-            return images
+            with self.open_pdf_pages(pdf_path) as pages:
+                return [image for _, image in pages.iter_pages()]
 
         except Exception as e:
             logger.exception(f"Error converting PDF: {e}")
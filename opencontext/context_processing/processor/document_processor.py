@@ -6,30 +6,56 @@
 
 """
 Document Processor
+
+Documents are processed by a pool of worker threads, smallest estimated cost first
+(see _priority). VLM requests of all documents run on one shared event loop, which
+caps the number of pages analyzed at once and the memory held by rendered pages.
 """
 
 import asyncio
 import datetime
+import itertools
 import os
 import queue
 import threading
 import time
+import uuid
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional
 from PIL import Image
 from opencontext.context_processing.chunker import FAQChunker, StructuredFileChunker, DocumentTextChunker, ChunkingConfig
+from opencontext.context_processing.chunker.region_diff import (
+    content_hash,
+    plan_update,
+    split_regions,
+)
 from opencontext.context_processing.processor.base_processor import BaseContextProcessor
-from opencontext.context_processing.processor.document_converter import DocumentConverter, PageInfo
+from opencontext.context_processing.processor.document_converter import (
+    DocumentConverter,
+    PageInfo,
+    PdfPageSource,
+)
+from opencontext.context_processing.work_queue import open_work_queue
 from opencontext.models.context import *
 from opencontext.models.enums import *
-from opencontext.monitoring.monitor import record_processing_error
+from opencontext.monitoring.monitor import record_processing_error, update_document_progress
 from opencontext.storage.global_storage import get_storage
 from opencontext.utils.logging_utils import get_logger
 from opencontext.utils.json_parser import parse_json_from_response
+from opencontext.llm.global_embedding_client import do_vectorize_batch
 from opencontext.llm.global_vlm_client import generate_with_messages_async
 
 logger = get_logger(__name__)
 
+# Rough processing cost used for scheduling, in seconds per MB of input
+_TEXT_SECONDS_PER_MB = 2.0
+_VISUAL_SECONDS_PER_MB = 60.0
+
+
+class DocumentInterrupted(RuntimeError):
+    """Raised when processing of a document is cut short by shutdown"""
+
 
 class DocumentProcessor(BaseContextProcessor):
     """
@@ -44,23 +70,58 @@ class DocumentProcessor(BaseContextProcessor):
         # Configuration parameters
         self._batch_size = self.config.get("batch_size", 5)
         self._batch_timeout = self.config.get("batch_timeout", 30)
+        # Documents processed in parallel, one per worker thread
+        self._workers = max(1, int(self.config.get("workers", 3)))
 
         # Get document processing config
         doc_processing_config = get_config("document_processing") or {}
         self._enabled = doc_processing_config.get("enabled", True)
         self._dpi = doc_processing_config.get("dpi", 200)
         self._vlm_batch_size = doc_processing_config.get("batch_size", 3)
+        # Pages analyzed by the VLM at once, across all documents
+        self._max_vlm_pages = max(1, int(doc_processing_config.get("max_concurrent_vlm_pages", 6)))
         self._text_threshold = doc_processing_config.get("text_threshold_per_page", 50)
+        # Vault notes are re-chunked in segments of about this size, so an edit only
+        # re-chunks and re-embeds the segments it touches
+        self._vault_segment_chars = doc_processing_config.get("vault_segment_chars", 4000)
+        # Structured files (CSV/XLSX/JSONL) are embedded and stored this many chunks at a time
+        self._structured_window_size = max(
+            1, int(doc_processing_config.get("structured_window_size", 200))
+        )
+        # Ceiling on rendered pages held in memory (bitmaps and encoded pages awaiting the VLM)
+        self._max_render_bytes = (
+            int(doc_processing_config.get("max_render_memory_mb", 256)) * 1024 * 1024
+        )
 
         # Thread control
         self._stop_event = threading.Event()
 
-        # Queue and background thread
-        self._input_queue = queue.Queue(maxsize=self._batch_size * 2)
-        self._processing_task = threading.Thread(target=self._run_processing_loop, daemon=True)
-        self._processing_task.start()
+        # Queue of (priority, sequence, context), lowest priority value first
+        self._input_queue = queue.PriorityQueue(maxsize=self._batch_size * 2 + self._workers)
+        self._sequence = itertools.count()
+        # Journal of accepted documents, acknowledged once processed
+        self._work_queue = open_work_queue(self.get_name())
+        # Document being processed by the current worker thread
+        self._local = threading.local()
+        # Versions of one vault note are ingested one at a time, in change order
+        self._vault_locks: Dict[int, threading.Lock] = {}
+        self._vault_locks_guard = threading.Lock()
+        self._vault_versions: Dict[int, int] = {}
+
+        # Shared event loop for VLM requests, with the page cap and render memory budget
+        self._vlm_loop = asyncio.new_event_loop()
+        self._vlm_thread = threading.Thread(
+            target=self._vlm_loop.run_forever, name="document-vlm", daemon=True
+        )
+        self._vlm_thread.start()
+        self._vlm_page_slots = asyncio.Semaphore(self._max_vlm_pages)
+        self._render_budget = asyncio.Condition()
+        self._render_held = 0
+
         # Document converter
-        self._document_converter = DocumentConverter(dpi=self._dpi)
+        self._document_converter = DocumentConverter(
+            dpi=self._dpi, max_page_bytes=self._max_render_bytes
+        )
 
         # Structured document chunker
         self._structured_chunker = StructuredFileChunker()
@@ -73,15 +134,49 @@ class DocumentProcessor(BaseContextProcessor):
             )
         )
 
-        logger.info("DocumentProcessor initialized ")
+        self._worker_threads = [
+            threading.Thread(
+                target=self._run_processing_loop, name=f"document-worker-{i}", daemon=True
+            )
+            for i in range(self._workers)
+        ]
+        for worker in self._worker_threads:
+            worker.start()
+
+        if self._work_queue is not None and len(self._work_queue):
+            threading.Thread(target=self._replay_work_queue, daemon=True).start()
+
+        logger.info(f"DocumentProcessor initialized with {self._workers} workers")
+
+    def _replay_work_queue(self):
+        """Queue documents left unprocessed by an earlier run"""
+        count = 0
+        for context in self._work_queue.recover():
+            if self._stop_event.is_set():
+                return
+            self._enqueue(context)
+            count += 1
+        if count:
+            logger.info(f"Replayed {count} documents from the work queue")
 
     def shutdown(self, _graceful: bool = False):
         """Gracefully shutdown background processing task"""
         self._stop_event.set()
-        self._input_queue.put(None)
-        self._processing_task.join(timeout=10)
-        if self._processing_task.is_alive():
+        for _ in self._worker_threads:
+            try:
+                self._input_queue.put_nowait((float("-inf"), next(self._sequence), None))
+            except queue.Full:
+                break  # Workers also check the stop event between documents
+        deadline = time.time() + 10
+        for worker in self._worker_threads:
+            worker.join(timeout=max(0.0, deadline - time.time()))
+        workers_alive = any(worker.is_alive() for worker in self._worker_threads)
+        if workers_alive:
             logger.warning("UnifiedDocumentProcessor background task failed to stop in time.")
+        self._vlm_loop.call_soon_threadsafe(self._vlm_loop.stop)
+        # A worker still running may yet acknowledge its document, so the queue stays open
+        if self._work_queue is not None and not workers_alive:
+            self._work_queue.close()
         logger.info("UnifiedDocumentProcessor has been shut down.")
 
     def get_name(self) -> str:
@@ -110,11 +205,13 @@ class DocumentProcessor(BaseContextProcessor):
             return None
 
     def _is_structured_document(self, context: RawContextProperties) -> bool:
+        if not context.content_path:
+            return False
         file_type = self._get_file_type(context.content_path)
         return file_type in STRUCTURED_FILE_TYPES
 
     def _is_text_content(self, context: RawContextProperties) -> bool:
-        return context.source == ContextSource.INPUT
+        return context.source in (ContextSource.INPUT, ContextSource.VAULT)
 
     def _is_visual_document(self, context: RawContextProperties) -> bool:
         if context.source != ContextSource.LOCAL_FILE:
@@ -142,38 +239,115 @@ class DocumentProcessor(BaseContextProcessor):
         if not self.can_process(context):
             return False
         try:
-            self._input_queue.put(context)
+            if self._work_queue is not None:
+                self._work_queue.append(context)
+            self._enqueue(context)
             return True
         except Exception as e:
             logger.exception(f"Error queuing document {context.object_id}: {e}")
             return False
 
+    def _priority(self, context: RawContextProperties) -> float:
+        """
+        Virtual deadline of a document: enqueue time plus its estimated processing cost.
+        Small text documents go ahead of large visual ones, and a large document still
+        moves up as newer documents queue behind it.
+        """
+        size = len(context.content_text or "")
+        if context.source == ContextSource.LOCAL_FILE and context.content_path:
+            try:
+                size = os.path.getsize(context.content_path)
+            except OSError:
+                pass
+        seconds_per_mb = (
+            _VISUAL_SECONDS_PER_MB if self._is_visual_document(context) else _TEXT_SECONDS_PER_MB
+        )
+        return time.time() + size / (1024 * 1024) * seconds_per_mb
+
+    def _enqueue(self, context: RawContextProperties):
+        if context.content_path:
+            name = os.path.basename(context.content_path)
+        else:
+            name = (context.additional_info or {}).get("title") or "text input"
+        update_document_progress(context.object_id, name=name, status="queued")
+        self._input_queue.put((self._priority(context), next(self._sequence), context))
+
     def _run_processing_loop(self):
-        """Background processing loop (consume documents from queue)"""
+        """Worker loop, takes the queued document with the earliest virtual deadline"""
         while not self._stop_event.is_set():
-            unprocessed_context = None
             try:
-                raw_context = self._input_queue.get(timeout=self._batch_timeout)
-                unprocessed_context = raw_context
+                _, _, raw_context = self._input_queue.get(timeout=1.0)
             except queue.Empty:
                 continue
             except Exception as e:
                 logger.error(f"Unexpected error in processing loop: {e}")
                 time.sleep(3)
                 continue
+            if raw_context is None:
+                break
+            self._process_document(raw_context)
 
-            if unprocessed_context:
-                time_start = int(time.time())
-                try:
-                    processed_contexts = self.real_process(unprocessed_context)
-                    if processed_contexts:
-                        get_storage().batch_upsert_processed_context(processed_contexts)
-                except Exception as e:
-                    logger.exception(f"Unexpected error in real_process: {e}")
+    def _vault_lock(self, raw_context: RawContextProperties):
+        """
+        Lock of the vault note a context holds, a no-op for other documents. Two queued
+        versions of a note would otherwise diff against the same fingerprint and orphan
+        each other's contexts.
+        """
+        vault_id = (raw_context.additional_info or {}).get("vault_id")
+        if raw_context.source != ContextSource.VAULT or vault_id is None:
+            return nullcontext()
+        with self._vault_locks_guard:
+            return self._vault_locks.setdefault(vault_id, threading.Lock())
+
+    def _process_document(self, raw_context: RawContextProperties):
+        with self._vault_lock(raw_context):
+            self._process_document_locked(raw_context)
+
+    def _process_document_locked(self, raw_context: RawContextProperties):
+        object_id = raw_context.object_id
+        self._local.object_id = object_id
+        # Set by real_process for work that must wait until its contexts are stored
+        self._local.after_store = None
+        update_document_progress(
+            object_id, status="processing", stage="parsing", started_at=time.time()
+        )
+        time_start = int(time.time())
+        processed_contexts = self.real_process(raw_context)
+        succeeded = processed_contexts is not False
+        try:
+            if processed_contexts:
+                update_document_progress(object_id, stage="storing")
+                get_storage().batch_upsert_processed_context(processed_contexts)
+            if succeeded and self._local.after_store is not None:
+                self._local.after_store()
+        except Exception as e:
+            logger.exception(f"Unexpected error in real_process: {e}")
+            update_document_progress(object_id, error=str(e))
+            succeeded = False
+        finally:
+            self._local.object_id = None
+            self._local.after_store = None
+        # A document cut short by shutdown stays in the work queue, to be replayed
+        # (and resumed from its checkpoint, if it has one) on the next start
+        interrupted = not succeeded and self._stop_event.is_set()
+        if self._work_queue is not None and not interrupted:
+            try:
+                self._work_queue.ack([object_id])
+            except Exception as e:
+                logger.error(f"Failed to acknowledge document {object_id} in work queue: {e}")
+        update_document_progress(
+            object_id,
+            status="done" if succeeded else ("interrupted" if interrupted else "failed"),
+            stage="",
+            finished_at=time.time(),
+        )
 
-                time_end = int(time.time())
-                logger.info(f"Processed 1 document in {time_end - time_start} seconds")
-                
+        time_end = int(time.time())
+        logger.info(f"Processed 1 document in {time_end - time_start} seconds")
+
+    def _run_async(self, coro):
+        """Run a coroutine on the shared VLM event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._vlm_loop).result()
 
     def real_process(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
         """处理文档"""
@@ -191,9 +365,14 @@ class DocumentProcessor(BaseContextProcessor):
             self._record_metrics(start_time, len(all_processed_contexts))
             return all_processed_contexts
 
+        except DocumentInterrupted as e:
+            # Not a failure: the document stays in the work queue and resumes on restart
+            logger.info(f"{e}, resuming on next start")
+            return False
         except Exception as e:
             error_msg = f"Failed to batch process documents. Error: {e}"
             logger.exception(error_msg)
+            update_document_progress(raw_context.object_id, error=str(e))
             record_processing_error(error_msg, processor_name=self.get_name(), context_count=1)
             return False
 
@@ -207,17 +386,108 @@ class DocumentProcessor(BaseContextProcessor):
         else:
             logger.warning(f"Unsupported structured file type: {file_type}")
             return []
-        chunks = list(chunker.chunk(raw_context))
-        return self._create_contexts_from_chunks(raw_context, chunks)
+        return self._stream_structured_chunks(raw_context, chunker)
+
+    def _stream_structured_chunks(self, raw_context: RawContextProperties, chunker) -> List:
+        """
+        Embed and store the chunks of a structured file in windows of
+        structured_window_size. The next window is chunked and embedded while the
+        previous one is upserted, with at most two windows waiting for the writer, so
+        memory stays bounded however large the file is. After each stored window the
+        index of the next chunk is checkpointed; a document interrupted part way (and
+        replayed from the work queue) skips the chunks already stored, unless the file
+        has changed since. Contexts have ids derived from their chunk index, so a window
+        that is stored again replaces itself. Returns [] as everything is stored here.
+        """
+        object_id = raw_context.object_id
+        storage = get_storage()
+        stat = os.stat(raw_context.content_path)
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        checkpoint = storage.get_ingestion_checkpoint(object_id) or {}
+        resume_from = 0
+        if checkpoint.get("file_signature") == signature:
+            resume_from = checkpoint.get("chunk_index", 0)
+            logger.info(f"Resuming structured document {object_id} at chunk {resume_from}")
+        update_document_progress(object_id, stage="embedding", pages_done=resume_from)
+
+        windows: queue.Queue = queue.Queue(maxsize=2)
+        failure: List[Exception] = []
+
+        def write_windows():
+            while True:
+                window = windows.get()
+                if window is None:
+                    return
+                if failure:
+                    # Keep draining so the producer never blocks on a dead writer
+                    continue
+                contexts, next_index = window
+                try:
+                    if storage.batch_upsert_processed_context(contexts) is None:
+                        raise RuntimeError(f"Failed to store {len(contexts)} contexts")
+                    storage.save_ingestion_checkpoint(object_id, next_index, signature)
+                    update_document_progress(object_id, stage="storing", pages_done=next_index)
+                except Exception as e:
+                    failure.append(e)
+
+        writer = threading.Thread(
+            target=write_windows, name=f"structured-writer-{object_id}", daemon=True
+        )
+        writer.start()
+        stored = 0
+        try:
+            batch: List[Chunk] = []
+            batch_start = resume_from
+            for index, chunk in enumerate(chunker.chunk(raw_context)):
+                if index < resume_from:
+                    continue
+                batch.append(chunk)
+                if len(batch) >= self._structured_window_size:
+                    windows.put(self._embed_window(raw_context, batch, batch_start))
+                    stored += len(batch)
+                    batch_start += len(batch)
+                    batch = []
+                    if failure or self._stop_event.is_set():
+                        break
+            else:
+                if batch:
+                    windows.put(self._embed_window(raw_context, batch, batch_start))
+                    stored += len(batch)
+        finally:
+            windows.put(None)
+            writer.join()
+
+        if failure:
+            raise failure[0]
+        if self._stop_event.is_set():
+            raise DocumentInterrupted(
+                f"Stopped at chunk {batch_start} of structured document {object_id}"
+            )
+        storage.delete_ingestion_checkpoint(object_id)
+        logger.info(
+            f"Stored {stored} chunks of structured document {object_id} "
+            f"(resumed at {resume_from})"
+        )
+        return []
+
+    def _embed_window(
+        self, raw_context: RawContextProperties, chunks: List[Chunk], start_index: int
+    ) -> tuple:
+        """Contexts of a window of chunks, embedded in one batch, and the next chunk index"""
+        contexts = self._create_contexts_from_chunks(raw_context, chunks)
+        for offset, ctx in enumerate(contexts):
+            key = f"{raw_context.object_id}:{start_index + offset}"
+            ctx.id = str(uuid.uuid5(uuid.NAMESPACE_OID, key))
+        return contexts, start_index + len(chunks)
 
     def _create_contexts_from_chunks(self, raw_context: RawContextProperties, chunks: List[Chunk]) -> List[ProcessedContext]:
-        """Create ProcessedContext from Chunk list"""
+        """Create ProcessedContext from Chunk list, embedded in one batch"""
         contexts = []
         now = datetime.datetime.now()
         # TODO: semantic additional
         knowledge_metadata = KnowledgeContextMetadata(
             knowledge_source=raw_context.source,
-            knowledge_file_path=raw_context.content_path,
+            knowledge_file_path=raw_context.content_path or raw_context.filter_path or "",
             knowledge_raw_id=raw_context.object_id,
             # knowledge_title=raw_context.title,
         )
@@ -247,10 +517,19 @@ class DocumentProcessor(BaseContextProcessor):
             )
             contexts.append(ctx)
 
+        if contexts:
+            try:
+                do_vectorize_batch([ctx.vectorize for ctx in contexts])
+            except Exception as e:
+                # The storage backend vectorizes whatever is still missing a vector
+                logger.warning(f"Batch vectorization of {len(contexts)} chunks failed: {e}")
         return contexts
 
     def _process_text_content(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
         """Process TEXT type (vaults text content)"""
+        vault_id = (raw_context.additional_info or {}).get("vault_id")
+        if raw_context.source == ContextSource.VAULT and vault_id is not None:
+            return self._process_vault_document(raw_context, vault_id)
         if not raw_context.content_text:
             return []
         chunks = self._document_chunker.chunk_text(
@@ -258,6 +537,66 @@ class DocumentProcessor(BaseContextProcessor):
         )
         return self._create_contexts_from_chunks(raw_context, chunks)
 
+    def _process_vault_document(
+        self, raw_context: RawContextProperties, vault_id: int
+    ) -> List[ProcessedContext]:
+        """
+        Ingest a vault note incrementally against the fingerprint of its last ingestion.
+        An unchanged note is skipped, otherwise only segments with edited regions are
+        re-chunked (see region_diff). Contexts of replaced segments are deleted, and the
+        new fingerprint saved, once the new contexts are stored.
+        """
+        storage = get_storage()
+        change_seq = (raw_context.additional_info or {}).get("change_seq")
+        latest_seq = self._vault_versions.get(vault_id)
+        if change_seq is not None and latest_seq is not None and change_seq < latest_seq:
+            logger.info(f"Vault document {vault_id} has a newer version ingested, skipping")
+            return []
+        text = raw_context.content_text or ""
+        digest = content_hash(text)
+        fingerprint = storage.get_vault_fingerprint(vault_id)
+        if fingerprint and fingerprint["content_hash"] == digest:
+            logger.info(f"Vault document {vault_id} is unchanged, skipping")
+            return []
+
+        plan = plan_update(
+            split_regions(text),
+            fingerprint["segments"] if fingerprint else [],
+            segment_chars=self._vault_segment_chars,
+        )
+        contexts = []
+        unchunked = []
+        for item in plan.new_items:
+            chunks = self._document_chunker.chunk_text(texts=[item.text])
+            item_contexts = self._create_contexts_from_chunks(raw_context, chunks)
+            item.context_ids = [context.id for context in item_contexts]
+            if not item_contexts:
+                unchunked.append(item)
+            contexts.extend(item_contexts)
+        if unchunked:
+            # Leave segments that produced nothing (e.g. chunking failed) out of the
+            # fingerprint, and the hash empty, so the next update retries them
+            plan.items = [
+                item for item in plan.items if all(item is not u for u in unchunked)
+            ]
+            digest = ""
+
+        def after_store():
+            if plan.stale_context_ids:
+                storage.delete_processed_contexts(
+                    plan.stale_context_ids, ContextType.KNOWLEDGE_CONTEXT.value
+                )
+            storage.save_vault_fingerprint(vault_id, digest, plan.segments())
+            if change_seq is not None:
+                self._vault_versions[vault_id] = change_seq
+
+        self._local.after_store = after_store
+        logger.info(
+            f"Vault document {vault_id}: kept {plan.kept_segments} segments, re-chunked "
+            f"{len(plan.new_items)}, {len(plan.stale_context_ids)} stale contexts"
+        )
+        return contexts
+
     def _process_visual_document(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
         """
         Process visual documents (PDF/DOCX/images) - page-by-page intelligent detection
@@ -347,61 +686,143 @@ class DocumentProcessor(BaseContextProcessor):
         return all_contexts
 
     def _extract_vlm_pages(self, file_path: str, page_infos: List[PageInfo]) -> List[str]:
-        """Extract text from visual pages using VLM, returns extracted text list (in page order)"""
+        """Extract text from visual pages using VLM, returns one text per page (in page order)"""
         file_ext = Path(file_path).suffix.lower()
 
-        if file_ext in [".docx", ".doc"]:
+        if file_ext != ".pdf":
+            # DOCX / Markdown pages carry their embedded images
             return self._process_vlm_pages_with_doc_images(page_infos)
 
-        # For PDF and other formats, convert pages to images
-        # Convert document to images
-        all_images = self._document_converter.convert_to_images(file_path)
-
-        # Only process pages that need VLM
-        vlm_images = [all_images[p.page_number - 1] for p in page_infos]
-        vlm_page_numbers = [p.page_number for p in page_infos]
+        # Render only the pages that need VLM, streaming them into the requests
+        page_numbers = [p.page_number for p in page_infos]
+        with self._document_converter.open_pdf_pages(file_path) as pages:
+            page_results = self._run_async(
+                self._analyze_pdf_pages_with_vlm(
+                    pages, page_numbers, self._progress_callback(pages_total=len(page_numbers))
+                )
+            )
 
-        # VLM analysis
-        page_results = []
-        for i in range(0, len(vlm_images), self._vlm_batch_size):
-            batch = vlm_images[i : i + self._vlm_batch_size]
-            batch_page_nums = vlm_page_numbers[i : i + self._vlm_batch_size]
+        for page_num, result in zip(page_numbers, page_results):
+            if isinstance(result, Exception):
+                error_msg = f"Error processing page {page_num}: {result}"
+                logger.error(error_msg)
+                raise RuntimeError(error_msg) from result
+
+        return [result.get('text', '').strip() for result in page_results]
+
+    async def _analyze_pdf_pages_with_vlm(
+        self,
+        pages: PdfPageSource,
+        page_numbers: List[int],
+        on_page_done: Optional[Callable[[], None]] = None,
+    ) -> List[Any]:
+        """
+        Render PDF pages one at a time and send each to the VLM as soon as it is
+        encoded, with up to vlm batch_size requests of this document in flight. The
+        next page renders in a worker thread while requests run. Bitmaps are released
+        right after encoding, and rendering waits while the pages held by all documents
+        (being rendered, or encoded and not yet answered) would exceed
+        max_render_memory_mb.
+
+        Returns one result dict or exception per page, in page order. Pages after the
+        first failure are not rendered.
+        """
+        in_flight = asyncio.Semaphore(max(1, self._vlm_batch_size))
+        failed = False
 
-            tasks = [
-                self._analyze_image_with_vlm(img, page_num)
-                for img, page_num in zip(batch, batch_page_nums)
-            ]
+        async def analyze(base64_image: str, page_number: int, size: int) -> dict:
+            nonlocal failed
+            try:
+                return await self._analyze_encoded_image_with_vlm(base64_image, page_number)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                in_flight.release()
+                await self._release_render_memory(size)
+                if on_page_done is not None:
+                    on_page_done()
+
+        tasks = []
+        render_error = None
+        for page_number in page_numbers:
+            if failed:
+                break
+            # Takes the pdfium lock, which another worker may hold for a long render
+            estimate = await asyncio.to_thread(pages.estimate_bytes, page_number)
+            async with self._render_budget:
+                # A single page is always allowed, render() keeps it under the ceiling
+                await self._render_budget.wait_for(
+                    lambda: self._render_held == 0
+                    or self._render_held + estimate <= self._max_render_bytes
+                )
+                self._render_held += estimate
+            try:
+                base64_image = await asyncio.to_thread(
+                    self._render_and_encode_page, pages, page_number
+                )
+            except Exception as e:
+                await self._release_render_memory(estimate)
+                render_error = e
+                break
+            async with self._render_budget:
+                self._render_held += len(base64_image) - estimate
+            await in_flight.acquire()
+            tasks.append(
+                asyncio.create_task(analyze(base64_image, page_number, len(base64_image)))
+            )
 
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if render_error is not None:
+            results.append(render_error)
+        return results
+
+    async def _release_render_memory(self, size: int):
+        async with self._render_budget:
+            self._render_held -= size
+            self._render_budget.notify_all()
+
+    def _progress_callback(self, pages_total: Optional[int] = None) -> Callable[[], None]:
+        """Page counter reporting VLM progress of the current worker's document"""
+        object_id = getattr(self._local, "object_id", None)
+        if pages_total is not None and object_id:
+            update_document_progress(object_id, stage="vlm", pages_done=0, pages_total=pages_total)
+        done = 0
+
+        def on_page_done():
+            nonlocal done
+            done += 1
+            if object_id:
+                update_document_progress(object_id, pages_done=done)
+
+        return on_page_done
+
+    async def _gather_pages(
+        self, coros: List[Any], on_page_done: Optional[Callable[[], None]] = None
+    ) -> List[Any]:
+        """Gather VLM page coroutines, returning exceptions in place of results"""
+
+        async def run(coro):
             try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            batch_results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
-
-            for idx, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    error_msg = f"Error processing page {batch_page_nums[idx]}: {result}"
-                    logger.error(error_msg)
-                    raise RuntimeError(error_msg) from result
-                else:
-                    page_results.append(result)
-
-        # Collect result texts (as list)
-        text_list = [
-            result.get('text', '').strip()
-            for result in page_results
-            if result.get('text', '').strip()
-        ]
+                return await coro
+            finally:
+                if on_page_done is not None:
+                    on_page_done()
+
+        return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
 
-        return text_list
+    def _render_and_encode_page(self, pages: PdfPageSource, page_number: int) -> str:
+        image = pages.render(page_number)
+        try:
+            return self._encode_image(image)
+        finally:
+            image.close()
 
     def _process_vlm_pages_with_doc_images(
         self, page_infos: List[PageInfo]
     ) -> List[str]:
         """
-        Process DOCX pages using embedded images (instead of converting entire page to image), returns extracted text list
+        Process DOCX / Markdown pages using embedded images (instead of converting entire page to image), returns one extracted text per page (in page order)
         """
         # Collect all embedded images
         all_doc_images = []
@@ -416,6 +837,7 @@ class DocumentProcessor(BaseContextProcessor):
         image_results = []
         if all_doc_images:
             logger.info(f"Processing {len(all_doc_images)} embedded images from DOCX with VLM")
+            on_page_done = self._progress_callback(pages_total=len(all_doc_images))
 
             for i in range(0, len(all_doc_images), self._vlm_batch_size):
                 batch_images = all_doc_images[i : i + self._vlm_batch_size]
@@ -426,13 +848,7 @@ class DocumentProcessor(BaseContextProcessor):
                     for img, page_num in zip(batch_images, batch_page_nums)
                 ]
 
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-
-                batch_results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                batch_results = self._run_async(self._gather_pages(tasks, on_page_done))
 
                 for idx, result in enumerate(batch_results):
                     if isinstance(result, Exception):
@@ -458,8 +874,8 @@ class DocumentProcessor(BaseContextProcessor):
                 if img_text:
                     page_text_parts.append(img_text)
 
-            if page_text_parts:
-                all_page_texts.append('\n'.join(page_text_parts))
+            # Empty pages keep their place, the list stays aligned with page_infos
+            all_page_texts.append('\n'.join(page_text_parts))
 
         # Return text list instead of directly creating contexts
         return all_page_texts
@@ -468,14 +884,8 @@ class DocumentProcessor(BaseContextProcessor):
     def _analyze_document_with_vlm(self, images: List[Image.Image]) -> List[str]:
         """Batch analyze document images using VLM, returns text list"""
         tasks = [self._analyze_image_with_vlm(img, i + 1) for i, img in enumerate(images)]
-
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        page_results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        on_page_done = self._progress_callback(pages_total=len(images))
+        page_results = self._run_async(self._gather_pages(tasks, on_page_done))
 
         text_parts = []
         for idx, result in enumerate(page_results):
@@ -489,21 +899,28 @@ class DocumentProcessor(BaseContextProcessor):
 
         return text_parts
 
-    async def _analyze_image_with_vlm(self, image: Image.Image, page_number: int = 1) -> dict:
-        """Analyze single image using VLM (generic method)"""
+    @staticmethod
+    def _encode_image(image: Image.Image) -> str:
+        """Encode a PIL Image as base64 PNG"""
         import base64
         import io
+
+        buffered = io.BytesIO()
+        image.save(buffered, format="PNG")
+        return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+    async def _analyze_image_with_vlm(self, image: Image.Image, page_number: int = 1) -> dict:
+        """Analyze single image using VLM (generic method)"""
+        return await self._analyze_encoded_image_with_vlm(self._encode_image(image), page_number)
+
+    async def _analyze_encoded_image_with_vlm(self, base64_image: str, page_number: int = 1) -> dict:
+        """Analyze a base64 PNG image using VLM"""
         from opencontext.config.global_config import get_prompt_group
 
         prompt_group = get_prompt_group("document_processing.vlm_analysis")
         system_prompt = prompt_group["system"]
         user_prompt = prompt_group["user"]
 
-        # Convert PIL Image to base64
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        base64_image = base64.b64encode(buffered.getvalue()).decode("utf-8")
-
         # Build content, including text and image
         content = [
             {"type": "text", "text": user_prompt},
@@ -520,7 +937,8 @@ class DocumentProcessor(BaseContextProcessor):
             {"role": "user", "content": content},
         ]
 
-        response = await generate_with_messages_async(messages=messages)
+        async with self._vlm_page_slots:
+            response = await generate_with_messages_async(messages=messages)
         # VLM directly returns plain text, no JSON parsing needed
         return {
             "text": response.strip(),
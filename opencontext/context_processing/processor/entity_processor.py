@@ -17,7 +17,7 @@ from opencontext.models.context import *
 from opencontext.tools.profile_tools.profile_entity_tool import ProfileEntityTool
 from opencontext.utils.logging_utils import get_logger
 from opencontext.utils.json_parser import parse_json_from_response
-from opencontext.llm.global_embedding_client import do_vectorize_async
+from opencontext.llm.global_embedding_client import do_vectorize_batch_async
 
 logger = get_logger(__name__)
 
@@ -46,14 +46,14 @@ def validate_and_clean_entities(raw_entities) -> Dict[str, ProfileContextMetadat
     return entities_info
 
 
-async def _process_single_entity(entity_name: str, entity_info: ProfileContextMetadata, context_text: str, entity_tool: ProfileEntityTool, all_entities: List[str]) -> tuple:
-    """Process a single entity (async wrapper for concurrent execution)"""
+async def _process_single_entity(entity_name: str, entity_info: ProfileContextMetadata, context_text: str, match: Tuple[Optional[str], Optional[ProcessedContext]], all_entities: List[str]) -> tuple:
+    """Process a single entity with its match result (async wrapper for concurrent execution)"""
     entity_name = str(entity_name).strip()
     if not entity_name:
         return None, None
 
     entity_type = entity_info.entity_type
-    matched_name, matched_context = entity_tool.match_entity(entity_name, entity_type, judge=False)
+    matched_name, matched_context = match
 
     if matched_context:
         # logger.info(f"Matched entity: {entity_name} -> {matched_name}")
@@ -102,8 +102,6 @@ async def _process_single_entity(entity_name: str, entity_info: ProfileContextMe
         ),
     )
 
-    await do_vectorize_async(entity_context.vectorize)
-
     return entity_name, {
         "entity_name": entity_name,
         "entity_type": entity_type,
@@ -119,10 +117,19 @@ async def refresh_entities(entities_info: Dict[str, ProfileContextMetadata], con
     entity_tool = ProfileEntityTool()
     all_entities = list(entities_info.keys())
 
-    # Process all entities concurrently (including match, update, create context, and vectorize)
+    # Match all entities in one batched lookup instead of one vector search per entity
+    matches = entity_tool.match_entities(
+        [
+            (str(entity_name).strip(), entity_info.entity_type)
+            for entity_name, entity_info in entities_info.items()
+        ],
+        judge=False,
+    )
+
+    # Process all entities concurrently (including update and create context)
     tasks = [
-        _process_single_entity(entity_name, entity_info, context_text, entity_tool, all_entities)
-        for entity_name, entity_info in entities_info.items()
+        _process_single_entity(entity_name, entity_info, context_text, match, all_entities)
+        for (entity_name, entity_info), match in zip(entities_info.items(), matches)
     ]
 
     results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -171,8 +178,13 @@ async def refresh_entities(entities_info: Dict[str, ProfileContextMetadata], con
         context.metadata = entity_info.to_dict()
         contexts_to_upsert.append(context)
 
-    # Batch upsert all contexts at once
+    # Batch vectorize and upsert all contexts at once
     if contexts_to_upsert:
+        try:
+            await do_vectorize_batch_async([context.vectorize for context in contexts_to_upsert])
+        except Exception as e:
+            # The storage backend vectorizes whatever is still missing a vector
+            logger.warning(f"Batch vectorization of {len(contexts_to_upsert)} entities failed: {e}")
         get_global_storage().batch_upsert_processed_context(contexts_to_upsert)
 
     return list(processed_entities.keys())
@@ -16,7 +16,6 @@ import os
 import queue
 import threading
 import time
-from collections import deque
 from typing import Any, Dict, List, Optional, Tuple
 
 from opencontext.context_processing.processor.base_processor import BaseContextProcessor
@@ -24,13 +23,16 @@ from opencontext.context_processing.processor.entity_processor import (
     refresh_entities,
     validate_and_clean_entities,
 )
-from opencontext.llm.global_embedding_client import do_vectorize_async
+from opencontext.context_processing.work_queue import open_work_queue
+from opencontext.llm.global_embedding_client import do_vectorize_batch_async
 from opencontext.llm.global_vlm_client import generate_with_messages_async
 from opencontext.models.context import *
 from opencontext.models.enums import get_context_type_descriptions_for_extraction
 from opencontext.monitoring.monitor import record_processing_error
 from opencontext.storage.global_storage import get_storage
 from opencontext.tools.tool_definitions import ALL_TOOL_DEFINITIONS
+from opencontext.utils.adaptive_controller import AdaptiveController
+from opencontext.utils.hamming_index import HammingIndex
 from opencontext.utils.image import calculate_phash, resize_image
 from opencontext.utils.json_parser import parse_json_from_response
 from opencontext.utils.logging_utils import get_logger
@@ -39,6 +41,7 @@ from opencontext.monitoring import (
     increment_data_count,
     increment_recording_stat,
     record_processing_metrics,
+    register_adaptive_controller,
 )
 
 logger = get_logger(__name__)
@@ -70,18 +73,56 @@ class ScreenshotProcessor(BaseContextProcessor):
         self._resize_quality = self.config.get("resize_quality", 95)
         self._enabled_delete = self.config.get("enabled_delete", False)
 
+        # Batches buffered between pipeline stages (extraction -> merge -> storage)
+        self._pipeline_queue_size = max(1, int(self.config.get("pipeline_queue_size", 2)))
+
+        # AIMD tuning of in-flight VLM requests and batch size, fixed values when disabled
+        self._controller: Optional[AdaptiveController] = None
+        queue_batches = self._batch_size
+        adaptive_config = self.config.get("adaptive") or {}
+        if adaptive_config.get("enabled", False):
+            self._controller = AdaptiveController(
+                min_concurrency=adaptive_config.get("min_concurrency", 1),
+                max_concurrency=adaptive_config.get("max_concurrency", 16),
+                initial_concurrency=adaptive_config.get("initial_concurrency", 8),
+                min_batch_size=adaptive_config.get("min_batch_size", 1),
+                max_batch_size=adaptive_config.get("max_batch_size", self._batch_size * 3),
+                initial_batch_size=self._batch_size,
+                target_latency=adaptive_config.get("target_latency", 30),
+                decrease_factor=adaptive_config.get("decrease_factor", 0.5),
+                queue_high_watermark=adaptive_config.get("queue_high_watermark", 0.5),
+            )
+            # Room for a burst of the largest batches while a batch is in flight
+            queue_batches = max(self._batch_size, self._controller.max_batch_size)
+            register_adaptive_controller(self.get_name(), self._controller.get_state)
+
         self._stop_event = threading.Event()
 
         # Pipeline related
-        self._input_queue = queue.Queue(maxsize=self._batch_size * 3)
-        self._processing_task = threading.Thread(target=self._run_processing_loop, daemon=True)
-        self._processing_task.start()
+        self._input_queue = queue.Queue(maxsize=queue_batches * 3)
 
         # State cache
         self._processed_cache = (
             {}
         )
-        self._current_screenshot = deque(maxlen=self._batch_size * 2)
+        # Recent screenshot hashes across all monitors, for near-duplicate lookup
+        self._current_screenshot = HammingIndex(
+            max_distance=self._similarity_hash_threshold,
+            capacity=self.config.get("dedup_cache_size", 5000),
+        )
+        # Latest VLM items per monitor, sent as text context with diff-mode crops
+        self._last_extractions: Dict[str, List[Dict[str, Any]]] = {}
+        # frame_seq of the last screenshot accepted per monitor, the only valid diff base
+        self._diff_chain_heads: Dict[str, int] = {}
+
+        # Journal of accepted screenshots, acknowledged once their batch is stored
+        self._work_queue = open_work_queue(self.get_name())
+
+        # Started last, the pipeline reads the state above
+        self._processing_task = threading.Thread(target=self._run_processing_loop, daemon=True)
+        self._processing_task.start()
+        if self._work_queue is not None and len(self._work_queue):
+            threading.Thread(target=self._replay_work_queue, daemon=True).start()
 
     def shutdown(self, graceful: bool = False):
         """Gracefully shut down background processing tasks."""
@@ -91,7 +132,10 @@ class ScreenshotProcessor(BaseContextProcessor):
         self._input_queue.put(None)
         self._processing_task.join(timeout=5)
         if self._processing_task.is_alive():
+            # The pipeline may still acknowledge screenshots, so the queue stays open
             logger.warning("ScreenshotProcessor background task failed to stop in time.")
+        elif self._work_queue is not None:
+            self._work_queue.close()
         logger.info("ScreenshotProcessor has been shut down.")
 
     def get_name(self) -> str:
@@ -122,27 +166,25 @@ class ScreenshotProcessor(BaseContextProcessor):
         Returns:
             bool: Returns True if it's a new image, False if it's a duplicate image.
         """
-        new_phash = calculate_phash(new_context.content_path)
+        frame = new_context.get_frame()
+        if frame is not None:
+            new_phash = frame.phash()
+        else:
+            new_phash = calculate_phash(new_context.content_path)
         if new_phash is None:
             raise ValueError("Failed to calculate screenshot pHash")
 
-        # To avoid modification during iteration
-        for item in list(self._current_screenshot):
-            diff = bin(int(str(new_phash), 16) ^ int(str(item["phash"]), 16)).count("1")
-            if diff <= self._similarity_hash_threshold:
-                # Find duplicate, move it to end of list (consider as most recently used)
-                self._current_screenshot.remove(item)
-                self._current_screenshot.append(item)
-
-                if self._enabled_delete:
-                    try:
-                        os.remove(new_context.content_path)
-                    except Exception as e:
-                        logger.error(f"Failed to delete duplicate screenshot file: {e}")
-                return True
+        # A match is marked as most recently used, so it stays in the window
+        if self._current_screenshot.find_nearest(new_phash) is not None:
+            if self._enabled_delete and new_context.content_path:
+                try:
+                    os.remove(new_context.content_path)
+                except Exception as e:
+                    logger.error(f"Failed to delete duplicate screenshot file: {e}")
+            return True
 
         # If no duplicate found, it's a new image
-        self._current_screenshot.append({"phash": new_phash, "id": new_context.object_id})
+        self._current_screenshot.add(new_context.object_id, new_phash)
 
         return False
 
@@ -155,10 +197,35 @@ class ScreenshotProcessor(BaseContextProcessor):
         if not self.can_process(context):
             return False
         try:
-            if self._max_image_size > 0:
+            frame = context.get_frame()
+            if frame is not None:
+                # Already downscaled at capture unless this limit is smaller
+                if frame.downscale(self._max_image_size) and context.content_path:
+                    frame.save(context.content_path)
+            elif self._max_image_size > 0:
                 resize_image(context.content_path, self._max_image_size, self._resize_quality)
-            if not self._is_duplicate(context):
-                self._input_queue.put(context, timeout=2)
+            if self._is_duplicate(context):
+                context.release_frame()
+            else:
+                if frame is not None:
+                    self._follow_diff_chain(context, frame)
+                if self._work_queue is not None:
+                    # Journaled before its pixels are released, recovered after a crash
+                    self._work_queue.append(context)
+                if frame is not None:
+                    # Queued frames only keep their encoded upload bytes
+                    frame.release_pixels()
+                try:
+                    self._put_input(context)
+                except queue.Full:
+                    # Dropped, so it must not be replayed from the journal either
+                    self._ack([context.object_id])
+                    context.release_frame()
+                    logger.warning("Screenshot input queue is full, dropping screenshot")
+                    return False
+                frame_seq = (context.additional_info or {}).get("frame_seq")
+                if frame_seq is not None:
+                    self._diff_chain_heads[self._monitor_id(context)] = frame_seq
                 # Record screenshot path for UI display
                 from opencontext.monitoring import record_screenshot_path
 
@@ -169,69 +236,231 @@ class ScreenshotProcessor(BaseContextProcessor):
             return False
         return True
 
+    @staticmethod
+    def _monitor_id(context: RawContextProperties) -> str:
+        return (context.additional_info or {}).get("monitor", "monitor_1")
+
+    def _follow_diff_chain(self, context: RawContextProperties, frame: Any):
+        """
+        A diff frame is cropped against the previous captured frame of its monitor. If
+        that frame was not accepted here (dropped as a duplicate or by backpressure),
+        the crops miss the changes in between, so the frame is sent whole instead.
+        """
+        info = context.additional_info or {}
+        if not frame.regions or info.get("frame_seq") is None:
+            return
+        if info.get("diff_base_seq") != self._diff_chain_heads.get(self._monitor_id(context)):
+            frame.set_regions(None)
+            info.pop("diff_regions", None)
+            info.pop("diff_base_seq", None)
+
+    def _put_input(self, context: RawContextProperties, wait: Optional[bool] = None):
+        """
+        Queue a screenshot for the pipeline. Backpressure lanes (and work queue replay)
+        wait for room, the lane's overflow policy handles captures arriving meanwhile;
+        other callers, such as the capture thread when lanes are disabled, give up after
+        2 seconds and the screenshot is dropped (queue.Full).
+        """
+        if wait is None:
+            from opencontext.managers.backpressure import in_processor_lane
+
+            wait = in_processor_lane()
+        if not wait:
+            self._input_queue.put(context, timeout=2)
+            return
+        while not self._stop_event.is_set():
+            try:
+                self._input_queue.put(context, timeout=1)
+                return
+            except queue.Full:
+                continue
+        raise RuntimeError("ScreenshotProcessor is shutting down")
+
     def _run_processing_loop(self):
-        from opencontext.monitoring import (
-            increment_data_count,
-            increment_recording_stat,
-            record_processing_metrics,
+        """
+        Background thread owning one long-lived event loop, so the async LLM clients
+        keep their HTTP connections across batches instead of reconnecting each time.
+        """
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._run_pipeline())
+        except Exception as e:
+            logger.exception(f"Screenshot processing pipeline stopped unexpectedly: {e}")
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                loop.close()
+
+    async def _run_pipeline(self):
+        """
+        Run extraction, merging and storage as overlapping stages.
+
+        Stages are linked by bounded queues and each handles one batch at a time, so
+        the VLM calls of the next batch start while the previous batch is still being
+        merged or stored, batches stay in order through every stage, and a slow stage
+        backs up into the input queue instead of buffering without limit.
+        """
+        if self._controller is not None:
+            self._controller.bind()
+        merge_queue: asyncio.Queue = asyncio.Queue(maxsize=self._pipeline_queue_size)
+        store_queue: asyncio.Queue = asyncio.Queue(maxsize=self._pipeline_queue_size)
+        await asyncio.gather(
+            self._extract_stage(merge_queue),
+            self._merge_stage(merge_queue, store_queue),
+            self._store_stage(store_queue),
         )
-        """Background processing loop for handling screenshots in input queue."""
+
+    def _next_batch(self) -> Optional[List[RawContextProperties]]:
+        """Block until a batch is ready, returns None on shutdown"""
         unprocessed_contexts = []
         last_process_time = int(time.time())
+        batch_size = self._batch_size
+        backlogged = False
         while not self._stop_event.is_set():
             try:
                 # Wait for new items or timeout
                 raw_context = self._input_queue.get(timeout=self._batch_timeout)
-                if raw_context is None:  # sentinel value
-                    logger.info("Received sentinel value, exiting processing loop")
-                    break
-                # Process deduplication
-                unprocessed_contexts.append(raw_context)
-                if (int(time.time()) - last_process_time) < self._batch_timeout * 2 and len(
-                    unprocessed_contexts
-                ) < self._batch_size:
-                    # logger.info(f"Screenshots in cache: {len(unprocessed_contexts)}")
-                    continue
             except queue.Empty:
-                # logger.info("Queue empty, waiting for new data")
                 continue
-            except Exception as e:
-                logger.error(f"Unexpected error in processing loop: {e}")
-                time.sleep(1)
-            start_time = time.time()
-            increment_data_count("screenshot", count=len(unprocessed_contexts))
+            if raw_context is None:  # sentinel value
+                logger.info("Received sentinel value, exiting processing loop")
+                return None
+            if not unprocessed_contexts and self._controller is not None:
+                # Sized once per batch from the backlog left behind the first item
+                depth, capacity = self._input_queue.qsize(), self._input_queue.maxsize
+                batch_size = self._controller.next_batch_size(depth, capacity)
+                backlogged = self._controller.is_backlogged(depth, capacity)
+            unprocessed_contexts.append(raw_context)
+            if (
+                (int(time.time()) - last_process_time) >= self._batch_timeout * 2
+                or len(unprocessed_contexts) >= batch_size
+                # A backlogged batch goes out once the queue runs dry, without waiting
+                or (backlogged and self._input_queue.empty())
+            ):
+                return unprocessed_contexts
+        return None
+
+    async def _extract_stage(self, merge_queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                # The input queue is a thread queue, wait on it off the loop
+                batch = await loop.run_in_executor(None, self._next_batch)
+                if batch is None:
+                    break
+                start_time = time.time()
+                batch_ids = [raw_context.object_id for raw_context in batch]
+                increment_data_count("screenshot", count=len(batch))
+                try:
+                    vlm_items = await self._extract_batch(batch)
+                except Exception as e:
+                    self._record_batch_failure(e, len(batch))
+                    self._ack(batch_ids)
+                    continue
+                if vlm_items:
+                    await merge_queue.put((start_time, batch_ids, vlm_items))
+                else:
+                    self._ack(batch_ids)
+        finally:
+            await merge_queue.put(None)
+
+    async def _merge_stage(self, merge_queue: asyncio.Queue, store_queue: asyncio.Queue):
+        try:
+            while True:
+                job = await merge_queue.get()
+                if job is None:
+                    break
+                start_time, batch_ids, vlm_items = job
+                # Deletions of merged-away items are applied by the storage stage, after
+                # the upserts of earlier batches that may still be waiting there
+                pending_deletes: List[Tuple[str, str]] = []
+                try:
+                    processed_contexts = await self._merge_contexts(vlm_items, pending_deletes)
+                except Exception as e:
+                    self._record_batch_failure(e, len(batch_ids))
+                    self._ack(batch_ids)
+                    continue
+                await store_queue.put((start_time, batch_ids, processed_contexts, pending_deletes))
+        finally:
+            await store_queue.put(None)
+
+    async def _store_stage(self, store_queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await store_queue.get()
+            if job is None:
+                break
+            start_time, batch_ids, processed_contexts, pending_deletes = job
             try:
-                processed_contexts =  asyncio.run(self.batch_process(unprocessed_contexts))
-                if processed_contexts:
-                    get_storage().batch_upsert_processed_context(processed_contexts)
-            except Exception as e:
-                error_msg = f"Failed during concurrent VLM processing: {e}"
-                logger.error(error_msg)
-                record_processing_error(
-                    error_msg, processor_name=self.get_name(), context_count=len(unprocessed_contexts)
+                await loop.run_in_executor(
+                    None, self._store_batch, processed_contexts, pending_deletes
                 )
-                increment_recording_stat("failed", len(unprocessed_contexts))
+            except Exception as e:
+                self._record_batch_failure(e, len(batch_ids))
                 continue
-            try:
-                duration_ms = int((time.time() - start_time) * 1000)
-                record_processing_metrics(
-                    processor_name=self.get_name(),
-                    operation="screenshot_process",
-                    duration_ms=duration_ms,
-                    context_count=len(processed_contexts),
+            finally:
+                self._ack(batch_ids)
+
+            duration_ms = int((time.time() - start_time) * 1000)
+            record_processing_metrics(
+                processor_name=self.get_name(),
+                operation="screenshot_process",
+                duration_ms=duration_ms,
+                context_count=len(processed_contexts),
+            )
+            # Record context count by type
+            for context in processed_contexts:
+                increment_data_count(
+                    "context", count=1, context_type=context.extracted_data.context_type.value
                 )
-
-                # Record context count by type
-                for context in processed_contexts:
-                    increment_data_count("context", count=1, context_type=context.extracted_data.context_type.value)
-
-                # Increment processed screenshots count
-                increment_recording_stat("processed", len(processed_contexts))
-
-            except ImportError:
-                pass
-            unprocessed_contexts.clear()
-            last_process_time = int(time.time())
+            # Increment processed screenshots count
+            increment_recording_stat("processed", len(processed_contexts))
+
+    def _store_batch(
+        self, processed_contexts: List[ProcessedContext], pending_deletes: List[Tuple[str, str]]
+    ):
+        storage = get_storage()
+        if processed_contexts:
+            storage.batch_upsert_processed_context(processed_contexts)
+        for item_id, context_type in pending_deletes:
+            storage.delete_processed_context(item_id, context_type)
+
+    def _ack(self, object_ids: List[str]):
+        """Screenshots are done, stored or given up on, drop them from the work queue"""
+        if self._work_queue is not None:
+            try:
+                self._work_queue.ack(object_ids)
+            except Exception as e:
+                logger.error(f"Failed to acknowledge screenshots in work queue: {e}")
+
+    def _replay_work_queue(self):
+        """Feed screenshots left over from an earlier run back into the pipeline"""
+        count = 0
+        for context in self._work_queue.recover():
+            if self._stop_event.is_set():
+                return
+            frame = context.get_frame()
+            if frame is not None:
+                frame.release_pixels()
+            try:
+                # Already deduplicated and journaled before the restart
+                self._put_input(context, wait=True)
+            except RuntimeError:
+                return
+            count += 1
+        if count:
+            logger.info(f"Replayed {count} screenshots from the work queue")
+
+    def _record_batch_failure(self, error: Exception, context_count: int):
+        error_msg = f"Failed during concurrent VLM processing: {error}"
+        logger.error(error_msg)
+        record_processing_error(
+            error_msg, processor_name=self.get_name(), context_count=context_count
+        )
+        increment_recording_stat("failed", context_count)
 
     async def _process_vlm_single(self, raw_context: RawContextProperties) -> List[ProcessedContext]:
         """
@@ -246,24 +475,49 @@ class ScreenshotProcessor(BaseContextProcessor):
             logger.error("Failed to get complete prompt for screenshot_analyze.")
             raise ValueError("Missing prompt configuration for screenshot_analyze")
 
-        # Prepare image data
-        image_path = raw_context.content_path
-        if not image_path or not os.path.exists(image_path):
-            logger.error(f"Screenshot path is invalid or does not exist: {image_path}")
-            raise ValueError(f"Screenshot path is invalid or does not exist: {image_path}")
-
-        base64_image = self._encode_image_to_base64(image_path)
-        if not base64_image:
-            logger.warning(f"Failed to encode image: {image_path}")
-            raise ValueError(f"Failed to encode image: {image_path}")
+        monitor_id = self._monitor_id(raw_context)
+        diff_context = None
+
+        # Prepare image data, from the in-memory frame when capture attached one
+        frame = raw_context.get_frame()
+        if frame is not None:
+            previous_items = self._last_extractions.get(monitor_id)
+            if frame.regions and previous_items:
+                # Diff frame: upload only the changed crops
+                base64_images = frame.regions_to_base64()
+                diff_context = self._build_diff_context(frame, previous_items)
+            elif frame.regions and not frame.has_full_encoding:
+                # Only the crops are left, and without an extraction of the frame they
+                # build on the model would take them for the whole screen
+                logger.debug(f"Skipping diff frame {raw_context.object_id} without a base")
+                raw_context.release_frame()
+                return []
+            else:
+                base64_images = [frame.to_base64()]
+            mime_type = frame.mime_type
+            # The encoded copy lives on in the message, drop the frame itself
+            raw_context.release_frame()
+        else:
+            image_path = raw_context.content_path
+            if not image_path or not os.path.exists(image_path):
+                logger.error(f"Screenshot path is invalid or does not exist: {image_path}")
+                raise ValueError(f"Screenshot path is invalid or does not exist: {image_path}")
+
+            base64_image = self._encode_image_to_base64(image_path)
+            if not base64_image:
+                logger.warning(f"Failed to encode image: {image_path}")
+                raise ValueError(f"Failed to encode image: {image_path}")
+            base64_images = [base64_image]
+            mime_type = "image/png"
 
         content = [
             {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{base64_image}",
+                    "url": f"data:{mime_type};base64,{base64_image}",
                 },
             }
+            for base64_image in base64_images
         ]
 
         time_now = datetime.datetime.now()
@@ -272,6 +526,8 @@ class ScreenshotProcessor(BaseContextProcessor):
             current_timestamp=int(time_now.timestamp()),
             current_timezone=time_now.tzname(),
         )
+        if diff_context:
+            user_prompt = f"{user_prompt}\n{diff_context}"
         content.insert(0, {"type": "text", "text": user_prompt})
 
         messages = [
@@ -281,7 +537,12 @@ class ScreenshotProcessor(BaseContextProcessor):
 
         raw_llm_response = ''
         try:
-            raw_llm_response = await generate_with_messages_async(messages)
+            # Requests from other loops (batch_process) are not regulated
+            if self._controller is not None and self._controller.is_bound():
+                async with self._controller.slot():
+                    raw_llm_response = await generate_with_messages_async(messages)
+            else:
+                raw_llm_response = await generate_with_messages_async(messages)
         except Exception as e:
             logger.error(f"Failed to get VLM response. Error: {e}")
             raise ValueError(f"Failed to get VLM response. Error: {e}")
@@ -295,11 +556,38 @@ class ScreenshotProcessor(BaseContextProcessor):
         processed_items = []
         for item in items:
             processed_items.append(self._create_processed_context(item, raw_context))
+        self._last_extractions[monitor_id] = [
+            {"title": item.get("title", ""), "summary": item.get("summary", "")}
+            for item in items
+            if isinstance(item, dict)
+        ]
         return processed_items
 
-    async def _merge_contexts(self, processed_items: List[ProcessedContext]) -> List[ProcessedContext]:
+    def _build_diff_context(
+        self, frame: Any, previous_items: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Text that tells the VLM the images are crops and what the screen showed before"""
+        template = get_prompt_group("processing.extraction.screenshot_diff_context").get("user")
+        if not template:
+            logger.warning("Missing prompt configuration for screenshot_diff_context")
+            return None
+        return template.format(
+            region_count=len(frame.regions),
+            width=frame.size[0],
+            height=frame.size[1],
+            regions=json.dumps(frame.regions),
+            previous_items=json.dumps(previous_items, ensure_ascii=False, indent=2),
+        )
+
+    async def _merge_contexts(
+        self,
+        processed_items: List[ProcessedContext],
+        pending_deletes: Optional[List[Tuple[str, str]]] = None,
+    ) -> List[ProcessedContext]:
         """
         Merge newly processed items with cached items based on context_type semantics.
+        Items merged away are deleted from storage, or collected as (id, context_type)
+        into pending_deletes when given, for the caller to delete later.
         """
         if not processed_items:
             return []
@@ -327,7 +615,10 @@ class ScreenshotProcessor(BaseContextProcessor):
                 all_newly_created.extend(result.get("processed_contexts", []))
                 self._processed_cache[context_type] = result.get("new_ctxs", {})
                 for item_id in result.get("need_to_del_ids", []):
-                    get_storage().delete_processed_context(item_id, context_type)
+                    if pending_deletes is not None:
+                        pending_deletes.append((item_id, context_type))
+                    else:
+                        get_storage().delete_processed_context(item_id, context_type)
         return all_newly_created
 
     async def _merge_items_with_llm(self, context_type: ContextType, new_items: List[ProcessedContext], cached_items: List[ProcessedContext]) -> Dict[str, Any]:
@@ -431,14 +722,24 @@ class ScreenshotProcessor(BaseContextProcessor):
             new_ctxs[final_context.id] = final_context
             entity_refresh_items.append(final_context)
 
-        # Second pass: parallel refresh entities
+        # Second pass: one embedding request for all items, entities refreshed in parallel
+        vectorize_task = do_vectorize_batch_async(
+            [item.vectorize for item in entity_refresh_items]
+        )
         entity_tasks = [
             self._parse_single_context(item, data.get("entities", []))
             for item in entity_refresh_items
         ]
-        # Execute all entity refresh tasks in parallel
-        entities_results = await asyncio.gather(*entity_tasks, return_exceptions=True)
-        for entities_result in entities_results:
+        vectorize_result, *entities_results = await asyncio.gather(
+            vectorize_task, *entity_tasks, return_exceptions=True
+        )
+        if isinstance(vectorize_result, Exception):
+            # The storage backend vectorizes whatever is still missing a vector
+            logger.warning(
+                f"Batch vectorization of {len(entity_refresh_items)} contexts failed: "
+                f"{vectorize_result}"
+            )
+        for item, entities_result in zip(entity_refresh_items, entities_results):
             if isinstance(entities_result, Exception):
                 logger.error(f"Entity refresh failed for context {item.id}: {entities_result}")
             else:
@@ -447,12 +748,9 @@ class ScreenshotProcessor(BaseContextProcessor):
         return {"processed_contexts": result_contexts, "need_to_del_ids": need_to_del_ids, "new_ctxs": new_ctxs, "context_type": context_type.value}
 
     async def _parse_single_context(self, item: ProcessedContext, entities: List[Dict[str, Any]]) -> ProcessedContext:
-        """Parse a single context item."""
+        """Parse a single context item, refreshing its entities."""
         entities_info = validate_and_clean_entities(entities)
-        vectorize_task = do_vectorize_async(item.vectorize)
-        entities_task = refresh_entities(entities_info, item.vectorize.text)
-        _, entities_results = await asyncio.gather(vectorize_task, entities_task)
-        item.extracted_data.entities = entities_results
+        item.extracted_data.entities = await refresh_entities(entities_info, item.vectorize.text)
         return item
 
     def _parse_event_time_str(self, time_str: Optional[str], default: datetime.datetime) -> datetime.datetime:
@@ -496,14 +794,26 @@ class ScreenshotProcessor(BaseContextProcessor):
         """
         Batch process screenshots using Vision LLM with concurrent batch processing
         """
+        all_vlm_items = await self._extract_batch(raw_contexts)
+        if not all_vlm_items:
+            return []
+
+        # Step 2: Merge contexts concurrently
+        newly_processed_contexts = await self._merge_contexts(all_vlm_items)
+        return newly_processed_contexts
 
+    async def _extract_batch(self, raw_contexts: List[RawContextProperties]) -> List[ProcessedContext]:
+        """Run VLM extraction for a batch of screenshots, failed screenshots are skipped"""
         logger.info(f"Processing {len(raw_contexts)} screenshots concurrently")
 
         # Step 1: Process all VLM tasks concurrently
-        vlm_results = await asyncio.gather(
-            *[self._process_vlm_single(raw_context) for raw_context in raw_contexts],
-            return_exceptions=True
-        )
+        if any(self._is_diff_frame(raw_context) for raw_context in raw_contexts):
+            vlm_results = await self._process_vlm_by_monitor(raw_contexts)
+        else:
+            vlm_results = await asyncio.gather(
+                *[self._process_vlm_single(raw_context) for raw_context in raw_contexts],
+                return_exceptions=True
+            )
 
         all_vlm_items = []
         for idx, result in enumerate(vlm_results):
@@ -522,10 +832,39 @@ class ScreenshotProcessor(BaseContextProcessor):
             return []
 
         logger.info(f"VLM parsing completed, got {len(all_vlm_items)} items")
+        return all_vlm_items
 
-        # Step 2: Merge contexts concurrently
-        newly_processed_contexts = await self._merge_contexts(all_vlm_items)
-        return newly_processed_contexts
+    def _is_diff_frame(self, raw_context: RawContextProperties) -> bool:
+        frame = raw_context.get_frame()
+        return frame is not None and bool(frame.regions)
+
+    async def _process_vlm_by_monitor(self, raw_contexts: List[RawContextProperties]) -> List[Any]:
+        """
+        Diff frames build on the extraction of the previous frame of the same monitor,
+        so frames of one monitor run in capture order while monitors run concurrently.
+        Returns results (or exceptions) in the order of raw_contexts.
+        """
+        by_monitor: Dict[str, List[int]] = {}
+        for idx, raw_context in enumerate(raw_contexts):
+            by_monitor.setdefault(self._monitor_id(raw_context), []).append(idx)
+
+        results: List[Any] = [None] * len(raw_contexts)
+
+        async def run_in_order(indices: List[int]):
+            for idx in sorted(indices, key=lambda i: raw_contexts[i].create_time):
+                try:
+                    results[idx] = await self._process_vlm_single(raw_contexts[idx])
+                except Exception as e:
+                    results[idx] = e
+                    # The model never saw this frame, later crops must not build on the
+                    # extraction of an older one: frames accepted from now on are sent
+                    # whole, crops-only frames already queued are skipped
+                    monitor_id = self._monitor_id(raw_contexts[idx])
+                    self._last_extractions.pop(monitor_id, None)
+                    self._diff_chain_heads.pop(monitor_id, None)
+
+        await asyncio.gather(*[run_in_order(indices) for indices in by_monitor.values()])
+        return results
 
     def _create_processed_context(self, analysis: Dict[str, Any], raw_context: RawContextProperties = None) -> ProcessedContext:
         now = datetime.datetime.now()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Durable work queue - Journal of contexts accepted by a processor
+
+Processors append each context they accept and acknowledge it once its results are
+stored (or it is given up on). Contexts that were never acknowledged, because the
+process crashed or was stopped mid-batch, are recovered on the next start.
+
+The journal is a series of append-only segment files with one record per line:
+
+    P <object_id> <json payload>
+    A <object_id>[,<object_id>...]
+
+A segment is deleted once every context it holds is acknowledged and all older
+segments are gone. Deleting only a prefix keeps recovery exact: acknowledgements
+always live in the same or a later segment than the contexts they refer to.
+"""
+
+import base64
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from opencontext.models.context import RawContextProperties
+from opencontext.utils.image import ImageFrame
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_SEGMENT_GLOB = "segment-*.log"
+
+
+def encode_context_payload(context: RawContextProperties) -> Dict[str, Any]:
+    """
+    Serialize a context with its attached frame, if any. The frame is stored as
+    encoded image bytes unless the context already points at a saved image file.
+    """
+    payload: Dict[str, Any] = {"context": context.model_dump(mode="json")}
+    frame = context.get_frame()
+    if frame is not None and not (context.content_path and os.path.exists(context.content_path)):
+        payload["frame"] = {
+            "format": frame.format,
+            "quality": frame.quality,
+            "regions": frame.regions,
+            "data": base64.b64encode(frame.encode()).decode("ascii"),
+        }
+    return payload
+
+
+def decode_context_payload(payload: Dict[str, Any]) -> RawContextProperties:
+    """Rebuild a context serialized by encode_context_payload, reattaching its frame"""
+    context = RawContextProperties.model_validate(payload["context"])
+    frame_data = payload.get("frame")
+    if frame_data:
+        frame = ImageFrame.from_encoded(
+            base64.b64decode(frame_data["data"]),
+            frame_data.get("format", "png"),
+            frame_data.get("quality", 95),
+        )
+        frame.set_regions([tuple(region) for region in frame_data.get("regions") or []])
+        context.attach_frame(frame)
+    return context
+
+
+class DurableWorkQueue:
+    """
+    Segmented append-only journal with acknowledgements.
+
+    Args:
+        directory: Directory holding this queue's segments
+        segment_bytes: Size after which a new segment is started
+        fsync: fsync after every record, survives power loss at the cost of throughput
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024, fsync: bool = False):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = max(1024, int(segment_bytes))
+        self._fsync = fsync
+        self._lock = threading.Lock()
+
+        # Unacknowledged object_id -> segment number, and per-segment open counts
+        self._locations: Dict[str, int] = {}
+        self._open_counts: Dict[int, int] = {}
+        self._segments: List[int] = []
+        # Records recovered from earlier runs: (object_id, segment, byte offset)
+        self._recovered: List[Tuple[str, int, int]] = []
+        self._scan()
+
+        # New records never go to a segment from an earlier run, whose tail may be torn
+        self._active: Optional[int] = None
+        self._file = None
+        self._open_segment((self._segments[-1] + 1) if self._segments else 1)
+        self._truncate()
+
+    def _segment_path(self, number: int) -> Path:
+        return self._dir / f"segment-{number:08d}.log"
+
+    def _scan(self) -> None:
+        """Find unacknowledged records in existing segments without loading payloads"""
+        pending: Dict[str, Tuple[int, int]] = {}
+        for path in sorted(self._dir.glob(_SEGMENT_GLOB)):
+            number = int(path.stem.split("-")[1])
+            self._segments.append(number)
+            self._open_counts.setdefault(number, 0)
+            with open(path, "rb") as f:
+                offset = 0
+                for line in f:
+                    kind, _, rest = line.partition(b" ")
+                    if kind == b"P":
+                        object_id = rest.split(b" ", 1)[0].decode("utf-8", "replace")
+                        pending[object_id] = (number, offset)
+                    elif kind == b"A":
+                        for object_id in rest.strip().decode("utf-8", "replace").split(","):
+                            pending.pop(object_id, None)
+                    offset += len(line)
+
+        for object_id, (number, offset) in pending.items():
+            self._recovered.append((object_id, number, offset))
+            self._locations[object_id] = number
+            self._open_counts[number] += 1
+        self._recovered.sort(key=lambda item: (item[1], item[2]))
+        if self._recovered:
+            logger.info(f"Recovered {len(self._recovered)} unacknowledged contexts from {self._dir}")
+
+    def _open_segment(self, number: int) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._active = number
+        if number not in self._open_counts:
+            self._segments.append(number)
+            self._open_counts[number] = 0
+        self._file = open(self._segment_path(number), "ab")
+
+    def _write(self, line: bytes) -> None:
+        self._file.write(line)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+        if self._file.tell() >= self._segment_bytes:
+            self._open_segment(self._active + 1)
+            self._truncate()
+
+    def _truncate(self) -> None:
+        """Delete fully acknowledged segments from the front of the log"""
+        while self._segments and self._segments[0] != self._active:
+            number = self._segments[0]
+            if self._open_counts.get(number):
+                break
+            self._segments.pop(0)
+            self._open_counts.pop(number, None)
+            try:
+                self._segment_path(number).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Failed to delete work queue segment {number}: {e}")
+                break
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def append(self, context: RawContextProperties) -> None:
+        """Journal a context before it is handed to processing"""
+        data = json.dumps(encode_context_payload(context), ensure_ascii=False)
+        line = f"P {context.object_id} {data}\n".encode("utf-8")
+        with self._lock:
+            if context.object_id in self._locations:
+                return
+            if self._file is None:
+                logger.warning(
+                    f"Work queue {self._dir} is closed, not journaling {context.object_id}"
+                )
+                return
+            self._write(line)
+            self._locations[context.object_id] = self._active
+            self._open_counts[self._active] += 1
+
+    def ack(self, object_ids: Iterable[str]) -> None:
+        """Mark contexts as done, successfully or not"""
+        with self._lock:
+            done = [object_id for object_id in object_ids if object_id in self._locations]
+            if not done:
+                return
+            if self._file is None:
+                # Left pending, so they are replayed on the next start
+                logger.warning(f"Work queue {self._dir} is closed, not acknowledging {done}")
+                return
+            self._write(f"A {','.join(done)}\n".encode("utf-8"))
+            for object_id in done:
+                number = self._locations.pop(object_id)
+                self._open_counts[number] -= 1
+            self._truncate()
+
+    def recover(self) -> Iterator[RawContextProperties]:
+        """
+        Yield the contexts left unacknowledged by earlier runs, oldest first. Payloads
+        are read one at a time, so a large backlog is not loaded into memory at once.
+        Records that cannot be decoded (e.g. a torn last write) are acknowledged and skipped,
+        and so are contexts acknowledged since the queue was opened.
+        """
+        recovered, self._recovered = self._recovered, []
+        handles: Dict[int, Any] = {}
+        try:
+            for object_id, number, offset in recovered:
+                with self._lock:
+                    if object_id not in self._locations:
+                        continue
+                try:
+                    f = handles.get(number)
+                    if f is None:
+                        f = handles[number] = open(self._segment_path(number), "rb")
+                    f.seek(offset)
+                    line = f.readline()
+                    data = line.split(b" ", 2)[2]
+                    yield decode_context_payload(json.loads(data))
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable work queue record {object_id}: {e}")
+                    self.ack([object_id])
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": len(self._locations),
+                "segments": len(self._segments),
+                "active_segment": self._active,
+            }
+
+
+def open_work_queue(name: str, config: Optional[Dict[str, Any]] = None) -> Optional[DurableWorkQueue]:
+    """Open the work queue of a processor from processing.work_queue, None if disabled"""
+    if config is None:
+        from opencontext.config.global_config import get_config
+
+        config = get_config("processing.work_queue") or {}
+    if not config.get("enabled", False):
+        return None
+    try:
+        return DurableWorkQueue(
+            os.path.join(config.get("path", "./persist/work_queue"), name),
+            segment_bytes=int(config.get("segment_size_mb", 64)) * 1024 * 1024,
+            fsync=config.get("fsync", False),
+        )
+    except Exception as e:
+        logger.error(f"Failed to open work queue for {name}, continuing without it: {e}")
+        return None
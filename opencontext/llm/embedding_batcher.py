@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Embedding request coalescer
+Gathers concurrent embedding requests issued on the same event loop within a short
+window and sends them as one multi-input embedding call
+"""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from opencontext.llm.llm_client import LLMClient
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Per-event-loop embedding coalescer.
+
+    Requests submitted through `embed` are buffered until either the batch window
+    elapses or the pending batch reaches the client's size/token limits, then
+    flushed as a single `embeddings.create` call whose results are scattered back
+    to the waiting callers. The embedding cache is checked once per flushed batch,
+    off the event loop.
+    """
+
+    def __init__(self, client: LLMClient, window_ms: int = 20):
+        self._client = client
+        self._window = max(0, window_ms) / 1000.0
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._pending_tokens = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def embed(self, text: str) -> List[float]:
+        """Queue a text for embedding and wait for its vector"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        tokens = self._client.estimate_tokens(text)
+
+        if self._pending and (
+            len(self._pending) >= self._client.max_batch_size
+            or self._pending_tokens + tokens > self._client.max_batch_tokens
+        ):
+            self._flush()
+
+        self._pending.append((text, future))
+        self._pending_tokens += tokens
+
+        if len(self._pending) >= self._client.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        self._pending_tokens = 0
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        # Keep a strong reference until the request completes
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        # Identical texts in one window are only embedded once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = dict(zip(texts, await self._client.generate_embeddings_async(texts)))
+        except Exception as e:
+            logger.error(f"Coalesced embedding request for {len(batch)} texts failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Coalesced {len(batch)} embedding requests into one call")
+        for text, future in batch:
+            if not future.done():
+                future.set_result(embeddings[text])
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Content-addressed persistent embedding cache
+Embeddings are keyed by (model, output_dim, sha256(text)) and stored as compact
+float32/float16 blobs in a SQLite file with LRU eviction
+"""
+
+import array
+import hashlib
+import os
+import sqlite3
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_DEFAULT_CACHE_PATH = "./persist/embedding_cache/embeddings.db"
+# Pending last-access updates are written back once this many hits accumulate
+_TOUCH_FLUSH_SIZE = 256
+
+
+class EmbeddingCache:
+    """
+    Disk-backed embedding cache with LRU eviction.
+
+    Hits only bump an in-memory access clock; access order is written back in
+    batches together with inserts so lookups stay read-only on the hot path.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000, dtype: str = "float32"):
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self._path = path
+        self._max_entries = max_entries
+        self._dtype = dtype
+        self._lock = threading.Lock()
+        self._pending_touches: Dict[str, int] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                output_dim INTEGER NOT NULL,
+                dtype TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_access INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+        self._size, last_tick = self._conn.execute(
+            "SELECT COUNT(*), MAX(last_access) FROM embeddings"
+        ).fetchone()
+        # Logical access clock, gives a strict LRU order without relying on wall time
+        self._tick = last_tick or 0
+        logger.info(f"Embedding cache opened at {path} with {self._size} entries")
+
+    @staticmethod
+    def make_key(model: str, output_dim: int, text: str) -> str:
+        """Build the content-addressed cache key"""
+        text_hash = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        return f"{model}:{output_dim or 0}:{text_hash}"
+
+    def _encode(self, vector: Sequence[float]) -> bytes:
+        if self._dtype == "float16":
+            return struct.pack(f"<{len(vector)}e", *vector)
+        return array.array("f", vector).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes, dtype: str, dim: int) -> List[float]:
+        if dtype == "float16":
+            return list(struct.unpack(f"<{dim}e", blob))
+        values = array.array("f")
+        values.frombytes(blob)
+        return values.tolist()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given keys, missing keys are omitted"""
+        if not keys:
+            return {}
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            try:
+                # Stay well below SQLite's bound-parameter limit
+                for i in range(0, len(unique_keys), 500):
+                    chunk = unique_keys[i : i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT cache_key, dtype, dim, vector FROM embeddings "
+                        f"WHERE cache_key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for cache_key, dtype, dim, blob in rows:
+                        found[cache_key] = self._decode(blob, dtype, dim)
+                        self._tick += 1
+                        self._pending_touches[cache_key] = self._tick
+                if len(self._pending_touches) >= _TOUCH_FLUSH_SIZE:
+                    self._flush_touches()
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache lookup failed: {e}")
+                return {}
+
+        hits = sum(1 for key in keys if key in found)
+        _record_cache_access(hits=hits, misses=len(keys) - hits)
+        return found
+
+    def put_many(self, entries: Dict[str, List[float]], model: str, output_dim: int):
+        """Store vectors and evict least recently used entries beyond max_entries"""
+        if not entries:
+            return
+        evicted = 0
+        with self._lock:
+            rows = []
+            for key, vector in entries.items():
+                if not vector:
+                    continue
+                self._tick += 1
+                blob = self._encode(vector)
+                rows.append((key, model, output_dim or 0, self._dtype, len(vector), blob, self._tick))
+            try:
+                self._flush_touches()
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings "
+                    "(cache_key, model, output_dim, dtype, dim, vector, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._size += self._conn.total_changes - before
+                if self._max_entries and self._size > self._max_entries:
+                    evicted = self._size - self._max_entries
+                    self._conn.execute(
+                        "DELETE FROM embeddings WHERE cache_key IN ("
+                        "SELECT cache_key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                        (evicted,),
+                    )
+                    self._size -= evicted
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+                return
+        _record_cache_access(writes=len(rows), evictions=evicted)
+
+    def _flush_touches(self):
+        """Write back pending last-access times (caller holds the lock)"""
+        if not self._pending_touches:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE cache_key = ?",
+            [(ts, key) for key, ts in self._pending_touches.items()],
+        )
+        self._pending_touches.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size information"""
+        with self._lock:
+            return {
+                "path": self._path,
+                "entries": self._size,
+                "max_entries": self._max_entries,
+                "dtype": self._dtype,
+            }
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush_touches()
+                self._conn.commit()
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close embedding cache: {e}")
+
+
+def _record_cache_access(hits: int = 0, misses: int = 0, writes: int = 0, evictions: int = 0):
+    try:
+        from opencontext.monitoring import record_embedding_cache_access
+
+        record_embedding_cache_access(hits=hits, misses=misses, writes=writes, evictions=evictions)
+    except Exception:
+        pass  # Monitoring is best effort
+
+
+# path -> EmbeddingCache, shared by all clients using the same cache file
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(config: Optional[Dict[str, Any]]) -> Optional[EmbeddingCache]:
+    """
+    Get the embedding cache described by the embedding_model.cache config section.
+    Returns None when caching is disabled or the cache cannot be opened.
+    """
+    cache_config = (config or {}).get("cache") or {}
+    if not cache_config.get("enabled", True):
+        return None
+    path = cache_config.get("path") or _DEFAULT_CACHE_PATH
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            try:
+                cache = EmbeddingCache(
+                    path,
+                    max_entries=cache_config.get("max_entries", 200000),
+                    dtype=cache_config.get("dtype", "float32"),
+                )
+            except Exception as e:
+                logger.error(f"Failed to open embedding cache at {path}: {e}")
+                return None
+            _caches[path] = cache
+        return cache
@@ -9,10 +9,13 @@ Global embedding client singleton wrapper
 Provides global access to embedding client instances
 """
 
+import asyncio
 import threading
+import weakref
 from typing import Dict, List, Optional
 
 from opencontext.config.global_config import get_config
+from opencontext.llm.embedding_batcher import EmbeddingBatcher
 from opencontext.llm.llm_client import LLMClient, LLMType
 from opencontext.models.context import Vectorize
 from opencontext.utils.logging_utils import get_logger
@@ -44,6 +47,8 @@ class GlobalEmbeddingClient:
                 if not self._initialized:
                     self._embedding_client: Optional[LLMClient] = None
                     self._auto_initialized = False
+                    # event loop -> EmbeddingBatcher, used to coalesce concurrent async requests
+                    self._batchers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
                     GlobalEmbeddingClient._initialized = True
 
     @classmethod
@@ -92,6 +97,7 @@ class GlobalEmbeddingClient:
                 new_client = LLMClient(llm_type=LLMType.EMBEDDING, config=embedding_config)
                 old_client = self._embedding_client
                 self._embedding_client = new_client
+                self._batchers = weakref.WeakKeyDictionary()
                 logger.info("Embedding client reinitialization completed")
             except Exception as e:
                 logger.error(f"Failed to reinitialize embedding client: {e}")
@@ -112,16 +118,47 @@ class GlobalEmbeddingClient:
             return
         self._embedding_client.vectorize(vectorize, **kwargs)
         return
-    
+
     async def do_vectorize_async(self, vectorize: Vectorize, **kwargs):
         """
-        Vectorize a Vectorize object asynchronously
+        Vectorize a Vectorize object asynchronously.
+        Concurrent calls on the same event loop are coalesced into one embedding request.
         """
         if vectorize.vector:
             return
-        await self._embedding_client.vectorize_async(vectorize, **kwargs)
+        batcher = None if kwargs else self._get_batcher()
+        if batcher is None:
+            await self._embedding_client.vectorize_async(vectorize, **kwargs)
+            return
+        vectorize.vector = await batcher.embed(vectorize.get_vectorize_content())
         return
 
+    def do_vectorize_batch(self, vectorizes: List[Vectorize], **kwargs):
+        """
+        Vectorize multiple Vectorize objects with as few embedding requests as possible
+        """
+        self._embedding_client.vectorize_batch(vectorizes, **kwargs)
+
+    async def do_vectorize_batch_async(self, vectorizes: List[Vectorize], **kwargs):
+        """
+        Vectorize multiple Vectorize objects asynchronously
+        """
+        await self._embedding_client.vectorize_batch_async(vectorizes, **kwargs)
+
+    def _get_batcher(self) -> Optional[EmbeddingBatcher]:
+        """Get the coalescer bound to the running event loop, None if coalescing is disabled"""
+        config = self._embedding_client.config
+        if not config.get("coalesce_requests", True):
+            return None
+        loop = asyncio.get_running_loop()
+        batcher = self._batchers.get(loop)
+        if batcher is None:
+            batcher = EmbeddingBatcher(
+                self._embedding_client, window_ms=config.get("batch_window_ms", 20)
+            )
+            self._batchers[loop] = batcher
+        return batcher
+
 
 def is_initialized() -> bool:
     return GlobalEmbeddingClient.get_instance().is_initialized()
@@ -133,6 +170,17 @@ def do_embedding(text: str, **kwargs) -> List[float]:
 
 def do_vectorize(vectorize_obj: Vectorize, **kwargs):
     return GlobalEmbeddingClient.get_instance().do_vectorize(vectorize_obj, **kwargs)
-  
+
+
 async def do_vectorize_async(vectorize_obj: Vectorize, **kwargs):
     return await GlobalEmbeddingClient.get_instance().do_vectorize_async(vectorize_obj, **kwargs)
+
+
+def do_vectorize_batch(vectorize_objs: List[Vectorize], **kwargs):
+    return GlobalEmbeddingClient.get_instance().do_vectorize_batch(vectorize_objs, **kwargs)
+
+
+async def do_vectorize_batch_async(vectorize_objs: List[Vectorize], **kwargs):
+    return await GlobalEmbeddingClient.get_instance().do_vectorize_batch_async(
+        vectorize_objs, **kwargs
+    )
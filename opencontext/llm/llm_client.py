@@ -44,6 +44,11 @@ class LLMClient:
         self.async_client = AsyncOpenAI(
             api_key=self.api_key, base_url=self.base_url, timeout=self.timeout
         )
+        self.embedding_cache = None
+        if self.llm_type == LLMType.EMBEDDING:
+            from opencontext.llm.embedding_cache import get_embedding_cache
+
+            self.embedding_cache = get_embedding_cache(config)
 
     def generate(self, prompt: str, **kwargs) -> str:
         messages = [{"role": "user", "content": prompt}]
@@ -77,13 +82,14 @@ class LLMClient:
 
     def generate_embedding(self, text: str, **kwargs) -> List[float]:
         if self.llm_type == LLMType.EMBEDDING:
-            return self._openai_embedding(text, **kwargs)
+            return self.generate_embeddings([text], **kwargs)[0]
         else:
             raise ValueError(f"Unsupported LLM type for embedding generation: {self.llm_type}")
 
     async def generate_embedding_async(self, text: str, **kwargs) -> List[float]:
         if self.llm_type == LLMType.EMBEDDING:
-            return await self._openai_embedding_async(text, **kwargs)
+            embeddings = await self.generate_embeddings_async([text], **kwargs)
+            return embeddings[0]
         else:
             raise ValueError(f"Unsupported LLM type for embedding generation: {self.llm_type}")
 
@@ -260,86 +266,202 @@ class LLMClient:
             logger.error(f"OpenAI API async stream error: {e}")
             raise
 
-    def _openai_embedding(self, text: str, **kwargs) -> List[float]:
+    def _openai_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed several texts with a single multi-input request"""
         try:
-            response = self.client.embeddings.create(model=self.model, input=[text])
-            embedding = response.data[0].embedding
+            response = self.client.embeddings.create(model=self.model, input=texts)
+            return self._parse_embedding_response(response, len(texts), **kwargs)
+        except APIError as e:
+            logger.error(f"OpenAI API error during embedding: {e}")
+            raise
 
-            # Record token usage
-            if hasattr(response, "usage") and response.usage:
-                try:
-                    from opencontext.monitoring import record_token_usage
+    async def _openai_embeddings_async(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed several texts with a single multi-input request (async)"""
+        try:
+            response = await self.async_client.embeddings.create(model=self.model, input=texts)
+            return self._parse_embedding_response(response, len(texts), **kwargs)
+        except APIError as e:
+            logger.error(f"OpenAI API error during embedding: {e}")
+            raise
 
-                    record_token_usage(
-                        model=self.model,
-                        prompt_tokens=response.usage.prompt_tokens,
-                        completion_tokens=0,  # embedding has no completion tokens
-                        total_tokens=response.usage.total_tokens,
-                    )
-                except ImportError:
-                    pass  # Monitoring module not installed or initialized
+    def _parse_embedding_response(self, response, expected: int, **kwargs) -> List[List[float]]:
+        """Order embeddings by input index, record usage and apply output_dim truncation"""
+        data = sorted(response.data, key=lambda item: getattr(item, "index", 0) or 0)
+        if len(data) != expected:
+            raise ValueError(f"Embedding response size mismatch: expected {expected}, got {len(data)}")
 
-            output_dim = kwargs.get("output_dim", self.config.get("output_dim", 0))
-            if output_dim and len(embedding) > output_dim:
-                import math
+        # Record token usage
+        if hasattr(response, "usage") and response.usage:
+            try:
+                from opencontext.monitoring import record_token_usage
 
-                embedding = embedding[:output_dim]
-                norm = math.sqrt(sum(x**2 for x in embedding))
-                if norm > 0:
-                    embedding = [x / norm for x in embedding]
+                record_token_usage(
+                    model=self.model,
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=0,  # embedding has no completion tokens
+                    total_tokens=response.usage.total_tokens,
+                )
+            except ImportError:
+                pass  # Monitoring module not installed or initialized
 
-            return embedding
-        except APIError as e:
-            logger.error(f"OpenAI API error during embedding: {e}")
-            raise
-          
-    async def _openai_embedding_async(self, text: str, **kwargs) -> List[float]:
-        try:
-            response = await self.async_client.embeddings.create(model=self.model, input=[text])
-            embedding = response.data[0].embedding
+        output_dim = kwargs.get("output_dim", self.config.get("output_dim", 0))
+        return [self._truncate_embedding(item.embedding, output_dim) for item in data]
 
-            # Record token usage
-            if hasattr(response, "usage") and response.usage:
-                try:
-                    from opencontext.monitoring import record_token_usage
+    @staticmethod
+    def _truncate_embedding(embedding: List[float], output_dim: int) -> List[float]:
+        if output_dim and len(embedding) > output_dim:
+            import math
 
-                    record_token_usage(
-                        model=self.model,
-                        prompt_tokens=response.usage.prompt_tokens,
-                        completion_tokens=0,  # embedding has no completion tokens
-                        total_tokens=response.usage.total_tokens,
-                    )
-                except ImportError:
-                    pass  # Monitoring module not installed or initialized
+            embedding = embedding[:output_dim]
+            norm = math.sqrt(sum(x**2 for x in embedding))
+            if norm > 0:
+                embedding = [x / norm for x in embedding]
+        return embedding
 
-            output_dim = kwargs.get("output_dim", self.config.get("output_dim", 0))
-            if output_dim and len(embedding) > output_dim:
-                import math
+    def generate_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """
+        Generate embeddings for many texts. Cached vectors are reused, the rest are
+        requested in batches that respect max_batch_size and max_batch_tokens.
+        """
+        if self.llm_type != LLMType.EMBEDDING:
+            raise ValueError(f"Unsupported LLM type for embedding generation: {self.llm_type}")
+        cached = self.get_cached_embeddings(texts, **kwargs)
+        missing = list(dict.fromkeys(t for t in texts if t not in cached))
+        if missing:
+            cached.update(zip(missing, self.request_embeddings(missing, **kwargs)))
+        return [cached[text] for text in texts]
 
-                embedding = embedding[:output_dim]
-                norm = math.sqrt(sum(x**2 for x in embedding))
-                if norm > 0:
-                    embedding = [x / norm for x in embedding]
+    async def generate_embeddings_async(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Async version of generate_embeddings, the cache is read off the event loop"""
+        import asyncio
 
-            return embedding
-        except APIError as e:
-            logger.error(f"OpenAI API error during embedding: {e}")
-            raise
+        if self.llm_type != LLMType.EMBEDDING:
+            raise ValueError(f"Unsupported LLM type for embedding generation: {self.llm_type}")
+        cached = {}
+        if self.embedding_cache:
+            cached = await asyncio.to_thread(self.get_cached_embeddings, texts, **kwargs)
+        missing = list(dict.fromkeys(t for t in texts if t not in cached))
+        if missing:
+            cached.update(zip(missing, await self.request_embeddings_async(missing, **kwargs)))
+        return [cached[text] for text in texts]
+
+    def request_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Request embeddings from the API without a cache lookup, results are cached"""
+        embeddings: List[List[float]] = []
+        for batch in self.split_embedding_batches(texts):
+            embeddings.extend(self._openai_embeddings(batch, **kwargs))
+        self._store_cached_embeddings(dict(zip(texts, embeddings)), **kwargs)
+        return embeddings
+
+    async def request_embeddings_async(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """
+        Async version of request_embeddings, batches are sent concurrently and the
+        results are cached off the event loop
+        """
+        import asyncio
 
+        results = await asyncio.gather(
+            *[
+                self._openai_embeddings_async(batch, **kwargs)
+                for batch in self.split_embedding_batches(texts)
+            ]
+        )
+        embeddings = [embedding for batch_result in results for embedding in batch_result]
+        if self.embedding_cache:
+            await asyncio.to_thread(
+                self._store_cached_embeddings, dict(zip(texts, embeddings)), **kwargs
+            )
+        return embeddings
+
+    def _embedding_output_dim(self, **kwargs) -> int:
+        return kwargs.get("output_dim", self.config.get("output_dim", 0)) or 0
+
+    def get_cached_embeddings(self, texts: List[str], **kwargs) -> Dict[str, List[float]]:
+        """Look up texts in the embedding cache, returns text -> vector for hits only"""
+        if not self.embedding_cache or not texts:
+            return {}
+        output_dim = self._embedding_output_dim(**kwargs)
+        keys = {text: self.embedding_cache.make_key(self.model, output_dim, text) for text in texts}
+        found = self.embedding_cache.get_many(list(keys.values()))
+        return {text: found[key] for text, key in keys.items() if key in found}
+
+    def _store_cached_embeddings(self, embeddings: Dict[str, List[float]], **kwargs):
+        if not self.embedding_cache or not embeddings:
+            return
+        output_dim = self._embedding_output_dim(**kwargs)
+        self.embedding_cache.put_many(
+            {
+                self.embedding_cache.make_key(self.model, output_dim, text): vector
+                for text, vector in embeddings.items()
+            },
+            model=self.model,
+            output_dim=output_dim,
+        )
 
+    @property
+    def max_batch_size(self) -> int:
+        return max(1, int(self.config.get("max_batch_size", 32)))
+
+    @property
+    def max_batch_tokens(self) -> int:
+        return max(1, int(self.config.get("max_batch_tokens", 8000)))
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token estimate: ~4 ASCII chars per token, one token per non-ASCII char"""
+        if not text:
+            return 1
+        non_ascii = sum(1 for ch in text if ord(ch) > 127)
+        return non_ascii + (len(text) - non_ascii) // 4 + 1
+
+    def split_embedding_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into request batches bounded by item count and estimated tokens"""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for text in texts:
+            tokens = self.estimate_tokens(text)
+            if current and (
+                len(current) >= self.max_batch_size
+                or current_tokens + tokens > self.max_batch_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
 
     def vectorize(self, vectorize: Vectorize, **kwargs):
         if vectorize.vector:
             return
         vectorize.vector = self.generate_embedding(vectorize.get_vectorize_content(), **kwargs)
         return
-      
+
     async def vectorize_async(self, vectorize: Vectorize, **kwargs):
         if vectorize.vector:
             return
         vectorize.vector = await self.generate_embedding_async(vectorize.get_vectorize_content(), **kwargs)
         return
-      
+
+    def vectorize_batch(self, vectorizes: List[Vectorize], **kwargs):
+        pending = [v for v in vectorizes if not v.vector]
+        if not pending:
+            return
+        embeddings = self.generate_embeddings([v.get_vectorize_content() for v in pending], **kwargs)
+        for vectorize, embedding in zip(pending, embeddings):
+            vectorize.vector = embedding
+
+    async def vectorize_batch_async(self, vectorizes: List[Vectorize], **kwargs):
+        pending = [v for v in vectorizes if not v.vector]
+        if not pending:
+            return
+        embeddings = await self.generate_embeddings_async(
+            [v.get_vectorize_content() for v in pending], **kwargs
+        )
+        for vectorize, embedding in zip(pending, embeddings):
+            vectorize.vector = embedding
 
     def validate(self) -> tuple[bool, str]:
         """
@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Backpressure between capture and processing
+
+Captured contexts are handed to a bounded per-processor queue, so the capture
+threads never wait on a slow processor. When a queue is full its policy decides
+what happens to the overflow:
+
+- block: wait up to block_timeout for room, then drop the new context
+- drop_oldest: evict the oldest queued context
+- coalesce: replace the queued context from the same monitor / file with the newer
+  one (a newer frame of the same screen supersedes the queued one, and is sent as a
+  full frame if it was a diff frame), falling back to drop_oldest when there is none
+- spill: write the overflow to an on-disk spool and replay it in order as the
+  queue drains, contexts still queued at shutdown are spilled too and replayed on
+  the next start
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from opencontext.context_processing.work_queue import (
+    decode_context_payload,
+    encode_context_payload,
+)
+from opencontext.models.context import RawContextProperties
+from opencontext.monitoring import record_backpressure
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Set on lane threads, whose queue policy handles overflow while a processor waits
+_lane_local = threading.local()
+
+
+def in_processor_lane() -> bool:
+    """True when called from a lane thread, which may wait on its processor without limit"""
+    return getattr(_lane_local, "lane", None) is not None
+
+
+class BackpressurePolicy(str, Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    SPILL = "spill"
+
+
+def coalesce_key(context: RawContextProperties) -> Optional[Hashable]:
+    """Contexts with the same key supersede each other: frames of one monitor, one file"""
+    monitor = (context.additional_info or {}).get("monitor")
+    if monitor is not None:
+        return (context.source, "monitor", monitor)
+    if context.content_path:
+        return (context.source, "path", context.content_path)
+    return None
+
+
+def _release(context: RawContextProperties) -> None:
+    """Free the in-memory image of a context that will not be processed"""
+    context.release_frame()
+
+
+def _as_keyframe(context: RawContextProperties) -> None:
+    """
+    A diff frame's crops are relative to the previous frame of its monitor, which a
+    coalesced frame replaces without it ever being processed: send it whole instead
+    """
+    frame = context.get_frame()
+    if frame is not None and frame.regions:
+        frame.set_regions(None)
+        info = context.additional_info or {}
+        info.pop("diff_regions", None)
+        info.pop("diff_base_seq", None)
+
+
+class SpillQueue:
+    """
+    FIFO spool of contexts on disk, one JSON file per context.
+
+    Attached in-memory frames are stored with the context (see encode_context_payload),
+    so a replayed context carries the same frame. Files are written atomically and
+    named by a sortable sequence, so the spool survives restarts in order.
+    """
+
+    def __init__(self, directory: str):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        for tmp in self._dir.glob("*.tmp"):
+            tmp.unlink(missing_ok=True)
+        self._files: Deque[Path] = deque(sorted(self._dir.glob("*.json")))
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _write(self, name: str, context: RawContextProperties) -> Path:
+        data = json.dumps(encode_context_payload(context), ensure_ascii=False)
+        path = self._dir / name
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, path)
+        context.release_frame()
+        return path
+
+    def put(self, context: RawContextProperties) -> None:
+        with self._lock:
+            self._sequence += 1
+            name = f"{time.time_ns():020d}-{self._sequence:06d}.json"
+            self._files.append(self._write(name, context))
+
+    def put_front(self, contexts: List[RawContextProperties]) -> None:
+        """Spill contexts older than everything in the spool, they are replayed first"""
+        with self._lock:
+            head = int(self._files[0].name.split("-")[0]) if self._files else time.time_ns()
+            paths = [
+                self._write(f"{head - len(contexts) + idx:020d}-{0:06d}.json", context)
+                for idx, context in enumerate(contexts)
+            ]
+            self._files.extendleft(reversed(paths))
+
+    def pop(self) -> Optional[RawContextProperties]:
+        """Remove and return the oldest spilled context, None if the spool is empty"""
+        while True:
+            with self._lock:
+                if not self._files:
+                    return None
+                path = self._files.popleft()
+                try:
+                    payload = json.loads(path.read_text(encoding="utf-8"))
+                    path.unlink(missing_ok=True)
+                except Exception as e:
+                    logger.error(f"Dropping unreadable spilled context {path}: {e}")
+                    path.unlink(missing_ok=True)
+                    continue
+            try:
+                return decode_context_payload(payload)
+            except Exception as e:
+                logger.error(f"Dropping invalid spilled context {path}: {e}")
+
+
+class BackpressureQueue:
+    """
+    Bounded, thread-safe queue of captured contexts with an overflow policy.
+
+    `put` never blocks longer than block_timeout (and only under the block policy);
+    `get` is used by the single consumer that feeds the processor.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int = 100,
+        policy: str = BackpressurePolicy.DROP_OLDEST.value,
+        spill_dir: Optional[str] = None,
+        block_timeout: float = 2.0,
+        key_func: Callable[[RawContextProperties], Optional[Hashable]] = coalesce_key,
+    ):
+        self.name = name
+        self.capacity = max(1, int(capacity))
+        self.policy = BackpressurePolicy(policy)
+        self._block_timeout = block_timeout
+        self._key_func = key_func
+        self._items: Deque[RawContextProperties] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._spill: Optional[SpillQueue] = None
+        # Spilled contexts not yet moved back, including writes still in progress
+        self._spilled = 0
+        # Replay from the spool while the queue is below this depth
+        self._refill_level = max(1, self.capacity // 2)
+        if self.policy == BackpressurePolicy.SPILL:
+            if not spill_dir:
+                raise ValueError(f"Backpressure queue '{name}' uses spill but has no spill_dir")
+            self._spill = SpillQueue(spill_dir)
+            self._spilled = len(self._spill)
+            if self._spilled:
+                logger.info(f"Replaying {self._spilled} spilled contexts for '{name}'")
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items) + self._spilled
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _record(self, event: str, count: int = 1) -> None:
+        record_backpressure(self.name, event, count, len(self._items) + self._spilled)
+
+    def put(self, context: RawContextProperties) -> bool:
+        """Queue a context, returns False if it (not an older one) was dropped"""
+        evicted: Optional[RawContextProperties] = None
+        event = "enqueued"
+        with self._cond:
+            if self._closed:
+                return False
+            # Once anything is spilled, newer contexts follow it to keep the order
+            full = len(self._items) >= self.capacity or self._spilled > 0
+            if not full:
+                self._items.append(context)
+            elif self.policy == BackpressurePolicy.SPILL:
+                self._spilled += 1
+                event = "spilled"
+            elif self.policy == BackpressurePolicy.COALESCE and (
+                evicted := self._coalesce(context)
+            ):
+                event = "coalesced"
+            elif self.policy == BackpressurePolicy.BLOCK:
+                if not self._cond.wait_for(
+                    lambda: len(self._items) < self.capacity or self._closed, self._block_timeout
+                ) or self._closed:
+                    self._record("dropped")
+                    return False
+                self._items.append(context)
+            else:
+                evicted, event = self._items.popleft(), "dropped"
+                self._items.append(context)
+            self._cond.notify_all()
+
+        if event == "spilled":
+            try:
+                self._spill.put(context)
+            except Exception as e:
+                logger.error(f"Failed to spill context for '{self.name}': {e}")
+                with self._cond:
+                    self._spilled -= 1
+                self._record("dropped")
+                return False
+        if evicted is not None:
+            _release(evicted)
+        self._record(event)
+        return True
+
+    def _coalesce(self, context: RawContextProperties) -> Optional[RawContextProperties]:
+        """Replace the newest queued context with the same key in place, returns it"""
+        key = self._key_func(context)
+        if key is None:
+            return None
+        for idx in range(len(self._items) - 1, -1, -1):
+            replaced = self._items[idx]
+            if self._key_func(replaced) == key:
+                _as_keyframe(context)
+                self._items[idx] = context
+                return replaced
+        return None
+
+    def get(self, timeout: Optional[float] = None) -> Optional[RawContextProperties]:
+        """Take the next context, None on timeout or once closed and drained"""
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._items or self._spilled or self._closed, timeout
+            ):
+                return None
+            refill = self._spill is not None and self._spilled and (
+                len(self._items) < self._refill_level
+            )
+        if refill and not self._closed:
+            # Disk reads happen outside the lock so producers are not held up
+            restored = self._spill.pop()
+            if restored is not None:
+                with self._cond:
+                    self._items.append(restored)
+                    self._spilled -= 1
+                self._record("replayed")
+        with self._cond:
+            if self._items:
+                context = self._items.popleft()
+                self._cond.notify_all()
+                return context
+        return None
+
+    def close(self) -> None:
+        """Stop accepting contexts, spill policy persists what is still queued"""
+        with self._cond:
+            self._closed = True
+            remaining = list(self._items) if self._spill is not None else []
+            if remaining:
+                self._items.clear()
+                self._spilled += len(remaining)
+            self._cond.notify_all()
+        if remaining:
+            # Queued contexts are older than anything spilled, they replay first on restart
+            try:
+                self._spill.put_front(remaining)
+            except Exception as e:
+                logger.error(f"Failed to spill queued contexts for '{self.name}' on close: {e}")
+            logger.info(f"Spilled {len(remaining)} queued contexts for '{self.name}'")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "policy": self.policy.value,
+                "capacity": self.capacity,
+                "depth": len(self._items),
+                "spilled_pending": self._spilled,
+            }
+
+
+class ProcessorLane:
+    """A backpressure queue and the thread feeding its contexts to one processor"""
+
+    def __init__(self, queue: BackpressureQueue, handler: Callable[[RawContextProperties], Any]):
+        self.queue = queue
+        self._handler = handler
+        self._thread = threading.Thread(
+            target=self._run, name=f"backpressure-{queue.name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, context: RawContextProperties) -> bool:
+        return self.queue.put(context)
+
+    def _run(self):
+        _lane_local.lane = self.queue.name
+        while True:
+            context = self.queue.get(timeout=1.0)
+            if context is None:
+                if self.queue.closed:
+                    break
+                continue
+            try:
+                self._handler(context)
+            except Exception as e:
+                logger.exception(f"Processor lane '{self.queue.name}' failed on a context: {e}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.queue.close()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Processor lane '{self.queue.name}' failed to stop in time.")
+
+
+def create_lanes(
+    config: Dict[str, Any],
+    handlers: Dict[str, Callable[[RawContextProperties], Any]],
+) -> Dict[str, ProcessorLane]:
+    """
+    Build one lane per processor from the processing.backpressure config.
+    Per-processor sections override the defaults section.
+    """
+    defaults = config.get("defaults") or {}
+    spill_path = config.get("spill_path", "./persist/spill")
+    lanes = {}
+    for name, handler in handlers.items():
+        options = {**defaults, **(config.get(name) or {})}
+        queue = BackpressureQueue(
+            name,
+            capacity=options.get("capacity", 100),
+            policy=options.get("policy", BackpressurePolicy.DROP_OLDEST.value),
+            spill_dir=os.path.join(spill_path, name),
+            block_timeout=options.get("block_timeout", 2.0),
+        )
+        lanes[name] = ProcessorLane(queue, handler)
+    return lanes
@@ -4,18 +4,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 """
-Event Manager - Cached version, supports get and clear mechanism
+Event Manager - Ring-buffered event stream with push subscriptions and the legacy
+fetch and clear mechanism
 """
 
-import json
+import asyncio
 import threading
 import time
 import uuid
 from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 from opencontext.utils.logging_utils import get_logger
 
@@ -41,60 +41,191 @@ class Event:
     type: EventType
     data: Dict[str, Any]
     timestamp: float
+    seq: int = 0  # Position in the event stream, increases by one per event
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format"""
         return {
             "id": self.id,
+            "seq": self.seq,
             "type": self.type.value,
             "data": self.data,
             "timestamp": self.timestamp,
         }
 
 
-class EventManager:
-    """Cached Event Manager"""
+class EventSubscription:
+    """
+    Push subscription to the event stream, consumed on one asyncio event loop.
+
+    Published events are handed to a bounded per-subscriber queue. A subscriber that
+    falls behind is not allowed to hold up publishers: when its queue is full it is
+    marked as lagging and catches up from the manager's ring buffer instead, so it
+    only misses events that were evicted from the ring (reported as `missed`).
+    """
+
+    def __init__(
+        self,
+        manager: "EventManager",
+        loop: asyncio.AbstractEventLoop,
+        last_seq: int,
+        event_types: Optional[Set[EventType]] = None,
+        max_queue: int = 256,
+    ):
+        self._manager = manager
+        self.loop = loop
+        self.last_seq = last_seq
+        self._event_types = event_types
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._lagging = False
+        self.missed = 0
+
+    def _offer(self, event: Event) -> None:
+        """Runs on the subscriber's loop"""
+        if self._event_types and event.type not in self._event_types:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._lagging = True
+
+    def request_replay(self) -> None:
+        """Catch up from the ring buffer (starting after last_seq) on the next get"""
+        self._lagging = True
+
+    async def get(self, timeout: Optional[float] = None) -> List[Event]:
+        """Wait for the next events after last_seq, empty list on timeout"""
+        if self._lagging:
+            self._lagging = False
+            events, missed = self._manager.events_since(self.last_seq, self._event_types)
+            self.missed += missed
+            # Queued events are also in the ring, drop them
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        else:
+            try:
+                events = [await asyncio.wait_for(self._queue.get(), timeout)]
+            except asyncio.TimeoutError:
+                return []
+            while not self._queue.empty():
+                events.append(self._queue.get_nowait())
+
+        events = [event for event in events if event.seq > self.last_seq]
+        if events:
+            self.last_seq = events[-1].seq
+        return events
+
+    def close(self) -> None:
+        self._manager.unsubscribe(self)
 
-    def __init__(self):
-        self.event_cache: deque[Event] = deque()
-        self.max_cache_size = 1000
+
+class EventManager:
+    """
+    Event Manager
+
+    Events are kept in a ring buffer of the last max_cache_size events, numbered by
+    seq. Push subscribers (see subscribe) each get their own queue and can resume
+    from any seq still in the ring. The legacy fetch_and_clear_events API reads the
+    same ring through its own cursor, so it no longer removes events from other
+    consumers.
+    """
+
+    def __init__(self, max_cache_size: int = 1000):
+        self.max_cache_size = max_cache_size
+        self.event_cache: Deque[Event] = deque(maxlen=max_cache_size)
         self._lock = threading.Lock()  # Ensure thread safety
+        self._seq = 0
+        # Last seq returned by fetch_and_clear_events
+        self._fetch_cursor = 0
+        self._subscribers: Set[EventSubscription] = set()
 
     def publish_event(self, event_type: EventType, data: Dict[str, Any]) -> str:
         """Publish event to cache"""
         event_id = str(uuid.uuid4())
-        event = Event(id=event_id, type=event_type, data=data, timestamp=time.time())
 
         with self._lock:
+            self._seq += 1
+            event = Event(
+                id=event_id, type=event_type, data=data, timestamp=time.time(), seq=self._seq
+            )
             self.event_cache.append(event)
+            subscribers = list(self._subscribers)
 
-            # Limit cache size to avoid memory overflow
-            while len(self.event_cache) > self.max_cache_size:
-                removed_event = self.event_cache.popleft()
-                logger.warning(f"Cache overflow, removing old event: {removed_event.id}")
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._offer, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(subscription)
 
         logger.info(f"Published event to cache: {event_type.value}, ID: {event_id}")
         return event_id
 
+    def events_since(
+        self, seq: int, event_types: Optional[Set[EventType]] = None
+    ) -> Tuple[List[Event], int]:
+        """
+        Events in the ring after seq, and how many events after seq were already
+        evicted from the ring.
+        """
+        with self._lock:
+            first_seq = self.event_cache[0].seq if self.event_cache else self._seq + 1
+            missed = max(0, first_seq - seq - 1)
+            events = [event for event in self.event_cache if event.seq > seq]
+        if event_types:
+            events = [event for event in events if event.type in event_types]
+        return events, missed
+
+    def subscribe(
+        self,
+        after: Optional[int] = None,
+        event_types: Optional[Set[EventType]] = None,
+        max_queue: int = 256,
+    ) -> EventSubscription:
+        """
+        Subscribe the running event loop to new events. With `after`, events after
+        that seq still in the ring are replayed first.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            last_seq = self._seq if after is None else min(after, self._seq)
+            subscription = EventSubscription(self, loop, last_seq, event_types, max_queue)
+            self._subscribers.add(subscription)
+        if after is not None:
+            subscription.request_replay()
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
     def fetch_and_clear_events(self) -> List[Dict[str, Any]]:
-        """Fetch all cached events and clear the cache"""
+        """Fetch events not returned by an earlier call (events stay in the ring)"""
         with self._lock:
-            # Get all current events
-            events = [event.to_dict() for event in self.event_cache]
-            # Clear the cache
-            self.event_cache.clear()
+            first_seq = self.event_cache[0].seq if self.event_cache else self._seq + 1
+            missed = max(0, first_seq - self._fetch_cursor - 1)
+            events = [event.to_dict() for event in self.event_cache if event.seq > self._fetch_cursor]
+            self._fetch_cursor = self._seq
 
+        if missed:
+            logger.warning(f"Cache overflow, {missed} events were evicted before being fetched")
         logger.info(f"Returned and cleared {len(events)} cached events")
         return events
 
     def get_cache_status(self) -> Dict[str, Any]:
         """Get cache status"""
         with self._lock:
-            cache_size = len(self.event_cache)
+            cache_size = sum(1 for event in self.event_cache if event.seq > self._fetch_cursor)
+            buffered = len(self.event_cache)
+            subscribers = len(self._subscribers)
+            last_seq = self._seq
 
         return {
             "cache_size": cache_size,
             "max_cache_size": self.max_cache_size,
+            "buffered_events": buffered,
+            "subscribers": subscribers,
+            "last_seq": last_seq,
             "supported_event_types": [t.value for t in EventType],
         }
 
@@ -14,7 +14,9 @@ from typing import Any, Callable, Dict, List, Optional
 
 from loguru import logger
 
+from opencontext.config.global_config import get_config
 from opencontext.interfaces import IContextProcessor
+from opencontext.managers.backpressure import ProcessorLane, create_lanes
 from opencontext.models import ContentFormat, ContextSource, ProcessedContext, RawContextProperties
 
 
@@ -42,6 +44,8 @@ class ContextProcessorManager:
         self._max_workers = max_workers
         self._compression_timer: Optional[Timer] = None
         self._compression_interval: int = 1800  # default 1 hour
+        # Bounded queues between capture callbacks and processors, created on first submit
+        self._lanes: Optional[Dict[str, ProcessorLane]] = None
 
     def start_periodic_compression(self):
         """Start periodic memory compression"""
@@ -153,6 +157,33 @@ class ContextProcessorManager:
             logger.exception(f"Processing component '{processor_name}' encountered exception while processing data: {e}")
             return False
 
+    def submit(self, initial_input: RawContextProperties) -> bool:
+        """
+        Hand a captured input to its processor without blocking the caller.
+        The input goes through the processor's backpressure queue, whose policy
+        decides what to do when the processor falls behind. Returns False if the
+        input was dropped or has no processor.
+        """
+        processor_name = self._routing_table.get(initial_input.source)
+        lane = self._get_lanes().get(processor_name) if processor_name else None
+        if lane is None:
+            return self.process(initial_input)
+        return lane.submit(initial_input)
+
+    def _get_lanes(self) -> Dict[str, ProcessorLane]:
+        if self._lanes is None:
+            with self._lock:
+                if self._lanes is None:
+                    config = get_config("processing.backpressure") or {}
+                    if not config.get("enabled", True):
+                        self._lanes = {}
+                    else:
+                        # Lanes call process(), which applies routing and error handling
+                        self._lanes = create_lanes(
+                            config, {name: self.process for name in self._processors}
+                        )
+        return self._lanes
+
     def batch_process(
         self, initial_inputs: List[RawContextProperties]
     ) -> Dict[str, List[ProcessedContext]]:
@@ -181,13 +212,20 @@ class ContextProcessorManager:
             # Update latest processor statistics
             for name, processor in self._processors.items():
                 self._statistics["processors"][name] = processor.get_statistics()
-            return self._statistics.copy()
+            statistics = self._statistics.copy()
+            statistics["queues"] = {
+                name: lane.queue.get_stats() for name, lane in (self._lanes or {}).items()
+            }
+            return statistics
 
     def shutdown(self, graceful: bool = False) -> None:
         """
         Close manager and all processors
         """
         logger.info("Shutting down context processing manager...")
+        # Stop intake first, spilling lanes persist what is still queued
+        for lane in (self._lanes or {}).values():
+            lane.stop()
         for processor in self._processors.values():
             processor.shutdown()
         self.stop_periodic_compression()
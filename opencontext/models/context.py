@@ -12,7 +12,7 @@ import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from opencontext.utils.logging_utils import get_logger
 
@@ -44,6 +44,21 @@ class RawContextProperties(BaseModel):
     additional_info: Optional[Dict[str, Any]] = None  # additional information
     enable_merge: bool = True
 
+    # In-memory image (utils.image.ImageFrame) for screenshots, never serialized
+    _frame: Any = PrivateAttr(default=None)
+
+    def attach_frame(self, frame: Any) -> None:
+        """Attach the in-memory image so processors can skip reading content_path"""
+        self._frame = frame
+
+    def get_frame(self) -> Any:
+        """Get the attached in-memory image, None if there is none"""
+        return self._frame
+
+    def release_frame(self) -> None:
+        """Drop the in-memory image once it is no longer needed"""
+        self._frame = None
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
         return self.model_dump(exclude_none=True)
@@ -118,6 +133,27 @@ class Vectorize(BaseModel):
     # Future extension for multimodal embedding:
     # images: Optional[List[Any]] = None  # PIL Images or image data for multimodal models
 
+    # Normalized float32 copy of vector, rebuilt when vector is assigned. The cache
+    # cannot see in-place edits of the list, so replace vector rather than mutate it
+    # (or assign it again afterwards)
+    _unit_vector: Any = PrivateAttr(default=None)
+    _unit_vector_key: Any = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any):
+        if name == "vector":
+            self._unit_vector_key = None
+        super().__setattr__(name, value)
+
+    def get_unit_vector(self):
+        """Get the L2-normalized float32 array of vector (cached), None if there is no vector"""
+        key = None if self.vector is None else (id(self.vector), len(self.vector))
+        if key is None or key != self._unit_vector_key:
+            from opencontext.utils.similarity import to_unit_vector
+
+            self._unit_vector = to_unit_vector(self.vector)
+            self._unit_vector_key = key
+        return self._unit_vector
+
     def get_vectorize_content(self) -> str:
         """Get vectorization content"""
         if self.content_format == ContentFormat.TEXT:
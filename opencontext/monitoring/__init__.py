@@ -19,11 +19,16 @@ from .monitor import (
     initialize_monitor,
     record_processing_error,
     record_processing_metrics,
+    record_embedding_cache_access,
     record_processing_stage,
     record_retrieval_metrics,
     record_token_usage,
     reset_recording_stats,
     record_screenshot_path,
+    record_backpressure,
+    record_sqlite_write,
+    register_adaptive_controller,
+    update_document_progress,
 )
 
 __all__ = [
@@ -43,4 +48,9 @@ __all__ = [
     "reset_recording_stats",
     "MetricsCollector",
     "record_screenshot_path",
+    "record_embedding_cache_access",
+    "record_sqlite_write",
+    "record_backpressure",
+    "register_adaptive_controller",
+    "update_document_progress",
 ]
@@ -9,10 +9,10 @@ System Monitor - Collects and manages various system metrics
 
 import threading
 import time
-from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from opencontext.models.enums import ContextType
 from opencontext.storage.global_storage import get_storage
@@ -80,12 +80,65 @@ class RecordingSessionStats:
 
     processed_screenshots: int = 0
     failed_screenshots: int = 0
+    skipped_screenshots: int = 0  # Unchanged frames dropped at capture, never encoded
     generated_activities: int = 0
     last_activity_time: Optional[datetime] = None
     session_start_time: datetime = field(default_factory=datetime.now)
     recent_screenshot_paths: deque = field(default_factory=lambda: deque(maxlen=5))
 
 
+@dataclass
+class EmbeddingCacheStats:
+    """Embedding cache access statistics"""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class SQLiteWriteStats:
+    """SQLite writer queue statistics"""
+
+    transactions: int = 0
+    busy_errors: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    total_hold_ms: float = 0.0
+    max_hold_ms: float = 0.0
+    max_queue_depth: int = 0
+
+
+@dataclass
+class BackpressureStats:
+    """Capture -> processor queue statistics"""
+
+    enqueued: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    spilled: int = 0
+    replayed: int = 0
+    depth: int = 0
+    max_depth: int = 0
+
+
+@dataclass
+class DocumentProgress:
+    """Ingestion progress of one document"""
+
+    object_id: str
+    name: str = ""
+    status: str = "queued"  # queued, processing, done, failed, interrupted
+    stage: str = ""
+    pages_done: int = 0
+    pages_total: int = 0
+    queued_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
 class Monitor:
     """System Monitor"""
 
@@ -114,12 +167,41 @@ class Monitor:
         # Recording session statistics
         self._recording_stats = RecordingSessionStats()
 
+        # Embedding cache statistics
+        self._embedding_cache_stats = EmbeddingCacheStats()
+
+        # SQLite writer queue statistics
+        self._sqlite_write_stats = SQLiteWriteStats()
+
+        # Capture -> processor queue statistics, per processor
+        self._backpressure_stats: Dict[str, BackpressureStats] = {}
+
+        # Document ingestion progress, most recently updated last (keep last 200)
+        self._document_progress: "OrderedDict[str, DocumentProgress]" = OrderedDict()
+
+        # State getters of adaptive controllers, read on demand
+        self._adaptive_controllers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
         # Start time
         self._start_time = datetime.now()
 
+        # Monitoring rows waiting to be persisted, aggregated per hour bucket
+        self._pending_lock = threading.Lock()
+        self._pending_token_usage: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._pending_stage_timing: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._pending_data_stats: Dict[Tuple[str, str, Optional[str]], Dict[str, Any]] = {}
+
         # Auto cleanup old monitoring data on startup
         self._cleanup_old_data()
 
+        # Background flush of the aggregated rows
+        self._flush_interval = self._get_flush_interval()
+        self._flush_stop = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="monitor-flush", daemon=True
+        )
+        self._flush_thread.start()
+
         logger.info("System monitor initialized")
 
     def _cleanup_old_data(self):
@@ -154,13 +236,16 @@ class Monitor:
     def _persist_token_usage(
         self, model: str, prompt_tokens: int, completion_tokens: int, total_tokens: int
     ):
-        """Persist token usage to database"""
-        try:
-            get_storage().save_monitoring_token_usage(
-                model, prompt_tokens, completion_tokens, total_tokens
-            )
-        except Exception as e:
-            logger.error(f"Failed to persist token usage: {e}")
+        """Queue token usage for the next background flush"""
+        self._merge_token_usage(
+            {
+                "time_bucket": self._time_bucket(),
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": total_tokens,
+            }
+        )
 
     def record_processing_metrics(
         self,
@@ -244,6 +329,7 @@ class Monitor:
         }
 
         try:
+            self.flush_monitoring_data()
             rows = get_storage().query_monitoring_token_usage(hours)
 
             model_stats = defaultdict(
@@ -341,11 +427,21 @@ class Monitor:
         status: str = "success",
         metadata: Optional[str] = None,
     ):
-        """Record processing stage timing"""
-        try:
-            get_storage().save_monitoring_stage_timing(stage_name, duration_ms, status, metadata)
-        except Exception as e:
-            logger.error(f"Failed to record processing stage: {e}")
+        """Record processing stage timing (persisted by the background flush)"""
+        success = status == "success"
+        self._merge_stage_timing(
+            {
+                "time_bucket": self._time_bucket(),
+                "stage_name": stage_name,
+                "count": 1,
+                "total_duration_ms": duration_ms,
+                "min_duration_ms": duration_ms,
+                "max_duration_ms": duration_ms,
+                "success_count": 1 if success else 0,
+                "error_count": 0 if success else 1,
+                "metadata": metadata,
+            }
+        )
 
     def increment_data_count(
         self,
@@ -354,11 +450,100 @@ class Monitor:
         context_type: Optional[str] = None,
         metadata: Optional[str] = None,
     ):
-        """Increment data count"""
+        """Increment data count (persisted by the background flush)"""
+        self._merge_data_stats(
+            {
+                "time_bucket": self._time_bucket(),
+                "data_type": data_type,
+                "context_type": context_type,
+                "count": count,
+                "metadata": metadata,
+            }
+        )
+
+    @staticmethod
+    def _time_bucket() -> str:
+        """Hour bucket the monitoring tables aggregate by"""
+        return datetime.now().strftime("%Y-%m-%d %H:00:00")
+
+    def _merge_token_usage(self, row: Dict[str, Any]):
+        key = (row["time_bucket"], row["model"])
+        with self._pending_lock:
+            pending = self._pending_token_usage.get(key)
+            if pending is None:
+                self._pending_token_usage[key] = dict(row)
+                return
+            for field_name in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                pending[field_name] += row[field_name]
+
+    def _merge_stage_timing(self, row: Dict[str, Any]):
+        key = (row["time_bucket"], row["stage_name"])
+        with self._pending_lock:
+            pending = self._pending_stage_timing.get(key)
+            if pending is None:
+                self._pending_stage_timing[key] = dict(row)
+                return
+            for field_name in ("count", "total_duration_ms", "success_count", "error_count"):
+                pending[field_name] += row[field_name]
+            pending["min_duration_ms"] = min(pending["min_duration_ms"], row["min_duration_ms"])
+            pending["max_duration_ms"] = max(pending["max_duration_ms"], row["max_duration_ms"])
+
+    def _merge_data_stats(self, row: Dict[str, Any]):
+        key = (row["time_bucket"], row["data_type"], row["context_type"])
+        with self._pending_lock:
+            pending = self._pending_data_stats.get(key)
+            if pending is None:
+                self._pending_data_stats[key] = dict(row)
+                return
+            pending["count"] += row["count"]
+
+    def flush_monitoring_data(self) -> bool:
+        """Persist all aggregated monitoring rows in one transaction"""
+        with self._pending_lock:
+            token_usage = list(self._pending_token_usage.values())
+            stage_timing = list(self._pending_stage_timing.values())
+            data_stats = list(self._pending_data_stats.values())
+            self._pending_token_usage = {}
+            self._pending_stage_timing = {}
+            self._pending_data_stats = {}
+
+        if not (token_usage or stage_timing or data_stats):
+            return True
+
         try:
-            get_storage().save_monitoring_data_stats(data_type, count, context_type, metadata)
+            if get_storage().save_monitoring_batch(token_usage, stage_timing, data_stats):
+                return True
         except Exception as e:
-            logger.error(f"Failed to increment data count: {e}")
+            logger.error(f"Failed to flush monitoring data: {e}")
+
+        # Keep the rows for the next flush
+        for row in token_usage:
+            self._merge_token_usage(row)
+        for row in stage_timing:
+            self._merge_stage_timing(row)
+        for row in data_stats:
+            self._merge_data_stats(row)
+        return False
+
+    def _get_flush_interval(self) -> float:
+        try:
+            from opencontext.config.global_config import GlobalConfig
+
+            config = GlobalConfig.get_instance().get_config() or {}
+            return float(config.get("monitoring", {}).get("flush_interval", 5))
+        except Exception:
+            return 5.0
+
+    def _flush_loop(self):
+        while not self._flush_stop.wait(self._flush_interval):
+            self.flush_monitoring_data()
+
+    def stop(self):
+        """Stop the background flush and persist what is still pending"""
+        self._flush_stop.set()
+        if self._flush_thread.is_alive():
+            self._flush_thread.join(timeout=self._flush_interval + 5)
+        self.flush_monitoring_data()
 
     def get_stage_timing_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get stage timing summary from database"""
@@ -369,6 +554,7 @@ class Monitor:
         }
 
         try:
+            self.flush_monitoring_data()
             rows = get_storage().query_monitoring_stage_timing(hours)
 
             stage_stats = defaultdict(
@@ -421,6 +607,7 @@ class Monitor:
         }
 
         try:
+            self.flush_monitoring_data()
             rows = get_storage().query_monitoring_data_stats(hours)
 
             # Process the grouped data
@@ -449,6 +636,7 @@ class Monitor:
     def get_data_stats_trend(self, hours: int = 24) -> Dict[str, Any]:
         """Get data statistics trend with time series data"""
         try:
+            self.flush_monitoring_data()
             rows = get_storage().query_monitoring_data_stats_trend(hours)
 
             # Organize data by data_type for easy frontend consumption
@@ -591,6 +779,8 @@ class Monitor:
                 self._recording_stats.processed_screenshots += count
             elif stat_type == "failed":
                 self._recording_stats.failed_screenshots += count
+            elif stat_type == "skipped":
+                self._recording_stats.skipped_screenshots += count
             elif stat_type == "activity":
                 self._recording_stats.generated_activities += count
                 self._recording_stats.last_activity_time = datetime.now()
@@ -606,6 +796,7 @@ class Monitor:
             stats = {
                 "processed_screenshots": self._recording_stats.processed_screenshots,
                 "failed_screenshots": self._recording_stats.failed_screenshots,
+                "skipped_screenshots": self._recording_stats.skipped_screenshots,
                 "generated_activities": self._recording_stats.generated_activities,
                 "last_activity_time": (
                     self._recording_stats.last_activity_time.isoformat()
@@ -664,6 +855,118 @@ class Monitor:
             logger.info("Resetting recording session statistics")
             self._recording_stats = RecordingSessionStats()
 
+    def record_embedding_cache_access(
+        self, hits: int = 0, misses: int = 0, writes: int = 0, evictions: int = 0
+    ):
+        """Record embedding cache hits, misses, writes and evictions"""
+        with self._lock:
+            self._embedding_cache_stats.hits += hits
+            self._embedding_cache_stats.misses += misses
+            self._embedding_cache_stats.writes += writes
+            self._embedding_cache_stats.evictions += evictions
+
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache statistics since startup"""
+        with self._lock:
+            stats = self._embedding_cache_stats
+            lookups = stats.hits + stats.misses
+            return {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "writes": stats.writes,
+                "evictions": stats.evictions,
+                "hit_rate": stats.hits / lookups if lookups else 0.0,
+            }
+
+    def record_sqlite_write(
+        self, wait_ms: float, hold_ms: float, queue_depth: int = 0, busy: bool = False
+    ):
+        """Record one SQLite write transaction: time queued for the writer and time holding it"""
+        with self._lock:
+            stats = self._sqlite_write_stats
+            stats.transactions += 1
+            stats.busy_errors += 1 if busy else 0
+            stats.total_wait_ms += wait_ms
+            stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+            stats.total_hold_ms += hold_ms
+            stats.max_hold_ms = max(stats.max_hold_ms, hold_ms)
+            stats.max_queue_depth = max(stats.max_queue_depth, queue_depth)
+
+    def get_sqlite_stats(self) -> Dict[str, Any]:
+        """Get SQLite writer lock wait statistics since startup"""
+        with self._lock:
+            stats = self._sqlite_write_stats
+            count = stats.transactions
+            return {
+                "transactions": count,
+                "busy_errors": stats.busy_errors,
+                "avg_wait_ms": round(stats.total_wait_ms / count, 3) if count else 0.0,
+                "max_wait_ms": round(stats.max_wait_ms, 3),
+                "avg_hold_ms": round(stats.total_hold_ms / count, 3) if count else 0.0,
+                "max_hold_ms": round(stats.max_hold_ms, 3),
+                "max_queue_depth": stats.max_queue_depth,
+            }
+
+    def record_backpressure(self, queue_name: str, event: str, count: int = 1, depth: int = 0):
+        """Record a queue event (enqueued, dropped, coalesced, spilled, replayed) and the depth"""
+        with self._lock:
+            stats = self._backpressure_stats.get(queue_name)
+            if stats is None:
+                stats = self._backpressure_stats[queue_name] = BackpressureStats()
+            if hasattr(stats, event) and event not in ("depth", "max_depth"):
+                setattr(stats, event, getattr(stats, event) + count)
+            stats.depth = depth
+            stats.max_depth = max(stats.max_depth, depth)
+
+    def get_backpressure_stats(self) -> Dict[str, Any]:
+        """Get capture -> processor queue statistics since startup"""
+        with self._lock:
+            return {name: asdict(stats) for name, stats in self._backpressure_stats.items()}
+
+    def update_document_progress(self, object_id: str, **fields):
+        """Create or update the ingestion progress of a document"""
+        with self._lock:
+            progress = self._document_progress.get(object_id)
+            if progress is None:
+                progress = DocumentProgress(object_id=object_id, queued_at=time.time())
+                self._document_progress[object_id] = progress
+            for name, value in fields.items():
+                if hasattr(progress, name):
+                    setattr(progress, name, value)
+            self._document_progress.move_to_end(object_id)
+            if len(self._document_progress) > 200:
+                # Evict the oldest finished entry, documents in progress are kept
+                for key, entry in self._document_progress.items():
+                    if entry.status in ("done", "failed", "interrupted"):
+                        del self._document_progress[key]
+                        break
+
+    def get_document_progress(self) -> Dict[str, Any]:
+        """Get ingestion progress of queued, running and recently finished documents"""
+        with self._lock:
+            documents = [asdict(progress) for progress in self._document_progress.values()]
+        counts: Dict[str, int] = defaultdict(int)
+        for document in documents:
+            counts[document["status"]] += 1
+        return {"counts": dict(counts), "documents": documents[::-1]}
+
+    def register_adaptive_controller(self, name: str, get_state: Callable[[], Dict[str, Any]]):
+        """Register a controller whose state is reported by get_adaptive_controller_stats"""
+        with self._lock:
+            self._adaptive_controllers[name] = get_state
+
+    def get_adaptive_controller_stats(self) -> Dict[str, Any]:
+        """Get the current state of every registered adaptive controller"""
+        with self._lock:
+            controllers = dict(self._adaptive_controllers)
+        stats = {}
+        for name, get_state in controllers.items():
+            try:
+                stats[name] = get_state()
+            except Exception as e:
+                stats[name] = {"error": str(e)}
+        return stats
+
     def get_system_overview(self) -> Dict[str, Any]:
         """Get system overview"""
         uptime = datetime.now() - self._start_time
@@ -677,6 +980,10 @@ class Monitor:
             "processing": self.get_processing_summary(hours=24),
             "stage_timing": self.get_stage_timing_summary(hours=24),
             "data_stats_24h": self.get_data_stats_summary(hours=24),
+            "embedding_cache": self.get_embedding_cache_stats(),
+            "sqlite": self.get_sqlite_stats(),
+            "backpressure": self.get_backpressure_stats(),
+            "adaptive_controllers": self.get_adaptive_controller_stats(),
             "last_updated": datetime.now().isoformat(),
         }
 
@@ -782,3 +1089,32 @@ def reset_recording_stats():
 def record_screenshot_path(screenshot_path: str):
     """Global function: Record a screenshot path"""
     get_monitor().record_screenshot_path(screenshot_path)
+
+
+def record_embedding_cache_access(
+    hits: int = 0, misses: int = 0, writes: int = 0, evictions: int = 0
+):
+    """Global function: Record embedding cache access"""
+    get_monitor().record_embedding_cache_access(hits, misses, writes, evictions)
+
+
+def record_sqlite_write(wait_ms: float, hold_ms: float, queue_depth: int = 0, busy: bool = False):
+    """Global function: Record a SQLite write transaction"""
+    # Never create the monitor from here: its startup cleanup writes to SQLite itself
+    if _monitor is not None:
+        _monitor.record_sqlite_write(wait_ms, hold_ms, queue_depth, busy)
+
+
+def record_backpressure(queue_name: str, event: str, count: int = 1, depth: int = 0):
+    """Global function: Record a capture -> processor queue event"""
+    get_monitor().record_backpressure(queue_name, event, count, depth)
+
+
+def register_adaptive_controller(name: str, get_state: Callable[[], Dict[str, Any]]):
+    """Global function: Register an adaptive controller for monitoring"""
+    get_monitor().register_adaptive_controller(name, get_state)
+
+
+def update_document_progress(object_id: str, **fields):
+    """Global function: Update the ingestion progress of a document"""
+    get_monitor().update_document_progress(object_id, **fields)
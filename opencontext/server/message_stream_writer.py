@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Streaming message writer - Coalesces streamed chat output into few database writes
+
+Content chunks and thinking records of a streaming assistant message are buffered in
+memory and written in one transaction once enough text has accumulated, after a
+short delay, or when the stream ends. Writes run in a worker thread, one at a time
+and in order, so the event loop never waits on SQLite while streaming.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamingMessageWriter:
+    """
+    Buffered writer for one streaming message.
+
+    Args:
+        storage: Storage exposing append_message_stream
+        message_id: The streaming message being written
+        max_chars: Buffered content size that triggers a flush
+        max_delay: Seconds buffered data may wait before it is flushed
+    """
+
+    def __init__(self, storage, message_id: int, max_chars: int = 2048, max_delay: float = 0.5):
+        self._storage = storage
+        self._message_id = message_id
+        self._max_chars = max_chars
+        self._max_delay = max_delay
+
+        self._chunks: List[str] = []
+        self._chars = 0
+        self._tokens = 0
+        self._thinking: List[Dict[str, Any]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Last scheduled write, each write waits for the previous one to keep order
+        self._write_task: Optional[asyncio.Task] = None
+        self._writes = 0
+        self._closed = False
+
+    def append_content(self, content_chunk: str, token_count: int = 0) -> None:
+        """Buffer a content chunk of the message"""
+        self._chunks.append(content_chunk)
+        self._chars += len(content_chunk)
+        self._tokens += token_count
+        self._after_append()
+
+    def add_thinking(
+        self,
+        content: str,
+        stage: Optional[str] = None,
+        progress: float = 0.0,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Buffer a thinking record of the message"""
+        self._thinking.append(
+            {"content": content, "stage": stage, "progress": progress, "metadata": metadata}
+        )
+        self._after_append()
+
+    def _after_append(self) -> None:
+        if self._closed:
+            raise RuntimeError(f"Writer for message {self._message_id} is closed")
+        if self._chars >= self._max_chars:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_delay, self.flush)
+
+    def flush(self) -> None:
+        """Schedule a write of everything buffered so far"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._chunks and not self._thinking:
+            return
+        content, tokens, thinking = "".join(self._chunks), self._tokens, self._thinking
+        self._chunks, self._chars, self._tokens, self._thinking = [], 0, 0, []
+        self._write_task = asyncio.get_running_loop().create_task(
+            self._write(self._write_task, content, tokens, thinking)
+        )
+
+    async def _write(
+        self,
+        previous: Optional[asyncio.Task],
+        content: str,
+        tokens: int,
+        thinking: List[Dict[str, Any]],
+    ) -> None:
+        if previous is not None:
+            await previous
+        start = time.perf_counter()
+        try:
+            ok = await asyncio.to_thread(
+                self._storage.append_message_stream,
+                message_id=self._message_id,
+                content_chunk=content,
+                token_count=tokens,
+                thinking=thinking,
+            )
+        except Exception as e:
+            ok = False
+            logger.exception(f"Failed to write streamed output of message {self._message_id}: {e}")
+        self._writes += 1
+        if ok:
+            logger.debug(
+                f"Wrote {len(content)} chars and {len(thinking)} thinking records to message "
+                f"{self._message_id} in {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+
+    async def close(self) -> None:
+        """Flush what is left and wait until every write has completed"""
+        self._closed = True
+        self.flush()
+        if self._write_task is not None:
+            await self._write_task
+
+    @property
+    def writes(self) -> int:
+        """Number of database writes made so far"""
+        return self._writes
@@ -108,8 +108,9 @@ class OpenContext:
             return False
 
         try:
+            # Queued per processor, capture threads never wait on processing
             for context_data in contexts:
-                self.processor_manager.process(context_data)
+                self.processor_manager.submit(context_data)
             return True
         except Exception as e:
             logger.error(f"Error processing captured contexts: {e}")
@@ -170,6 +171,14 @@ class OpenContext:
             self.capture_manager.shutdown(graceful=graceful)
             self.processor_manager.shutdown(graceful=graceful)
 
+            # Persist buffered monitoring data
+            try:
+                from opencontext.monitoring import get_monitor
+
+                get_monitor().stop()
+            except Exception as e:
+                logger.warning(f"Error flushing monitoring data: {e}")
+
             if self.web_server and self.web_server.is_alive():
                 logger.info("Web server will close when main thread exits.")
 
@@ -9,6 +9,7 @@ Agent Chat Routes
 Intelligent conversation routing based on Context Agent
 """
 
+import asyncio
 import json
 import uuid
 from typing import Any, Dict, Optional
@@ -20,6 +21,7 @@ from pydantic import BaseModel, Field
 from opencontext.context_consumption.context_agent import ContextAgent
 from opencontext.context_consumption.context_agent.models import WorkflowStage
 from opencontext.context_consumption.context_agent.models.enums import EventType
+from opencontext.server.message_stream_writer import StreamingMessageWriter
 from opencontext.server.middleware.auth import auth_dependency
 from opencontext.storage.global_storage import get_storage
 from opencontext.utils.logging_utils import get_logger
@@ -123,6 +125,7 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
         user_message_id = None
         assistant_message_id = None
         storage = None
+        writer = None
 
         try:
             agent = get_agent()
@@ -161,6 +164,8 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                 logger.info(f"Created assistant streaming message {assistant_message_id}")
                 # Register this message as an active stream
                 active_streams[assistant_message_id] = False
+                # Streamed content and thinking are written in coalesced batches
+                writer = StreamingMessageWriter(storage, assistant_message_id)
 
             # Send session start event with assistant_message_id
             yield f"data: {json.dumps({'type': 'session_start', 'session_id': request.session_id, 'assistant_message_id': assistant_message_id}, ensure_ascii=False)}\n\n"
@@ -192,23 +197,16 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                     # Check if this is a thinking event
                     if event.type == EventType.THINKING:
                         # Save thinking messages separately to message_thinking table
-                        storage.add_message_thinking(
-                            message_id=assistant_message_id,
+                        writer.add_thinking(
                             content=event.content,
                             stage=event.stage.value if event.stage else None,
                             progress=event.progress if hasattr(event, 'progress') else 0.0,
                             metadata=event.metadata if hasattr(event, 'metadata') else None
                         )
-                        logger.debug(f"Saved thinking to message {assistant_message_id}: stage={event.stage.value if event.stage else 'unknown'}, content_len={len(event.content)}")
                     elif event.type == EventType.STREAM_CHUNK:
                         # Only stream_chunk content goes to message.content
                         accumulated_content += event.content
-                        storage.append_message_content(
-                            message_id=assistant_message_id,
-                            content_chunk=event.content,
-                            token_count=1  # Approximate token count
-                        )
-                        logger.debug(f"Appended stream_chunk to message {assistant_message_id}: content_len={len(event.content)}")
+                        writer.append_content(event.content, token_count=1)  # Approximate token count
                     else:
                         # Other event types (running, done, etc.) go to metadata as lists
                         event_type_key = event.type.value
@@ -225,9 +223,13 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                 yield f"data: {json.dumps(converted_event, ensure_ascii=False)}\n\n"
 
                 if event.stage in [WorkflowStage.COMPLETED, WorkflowStage.FAILED]:
+                    # Buffered content lands before the message is finished
+                    if writer:
+                        await writer.close()
                     # Update metadata with collected events before finishing
                     if assistant_message_id and event_metadata:
-                        storage.update_message_metadata(
+                        await asyncio.to_thread(
+                            storage.update_message_metadata,
                             message_id=assistant_message_id,
                             metadata=event_metadata
                         )
@@ -236,7 +238,8 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
                     # Mark assistant message as finished
                     if assistant_message_id:
                         status = "completed" if event.stage == WorkflowStage.COMPLETED else "failed"
-                        storage.mark_message_finished(
+                        await asyncio.to_thread(
+                            storage.mark_message_finished,
                             message_id=assistant_message_id,
                             status=status,
                             error_message=event.metadata.get("error") if status == "failed" else None
@@ -246,9 +249,11 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
 
             # Handle interrupted stream - save accumulated data and mark as cancelled
             if interrupted and assistant_message_id:
+                await writer.close()
                 # Update metadata with collected events
                 if event_metadata:
-                    storage.update_message_metadata(
+                    await asyncio.to_thread(
+                        storage.update_message_metadata,
                         message_id=assistant_message_id,
                         metadata=event_metadata
                     )
@@ -263,7 +268,10 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
             # Mark assistant message as failed if it exists
             if assistant_message_id and storage:
                 try:
-                    storage.mark_message_finished(
+                    if writer:
+                        await writer.close()
+                    await asyncio.to_thread(
+                        storage.mark_message_finished,
                         message_id=assistant_message_id,
                         status="failed",
                         error_message=str(e)
@@ -274,6 +282,12 @@ async def chat_stream(request: ChatRequest, _auth: str = auth_dependency):
             yield f"data: {json.dumps({'type': 'error', 'content': str(e)}, ensure_ascii=False)}\n\n"
 
         finally:
+            # Keep what was streamed when the client disconnects mid-answer
+            if writer:
+                try:
+                    await writer.close()
+                except Exception as close_error:
+                    logger.exception(f"Failed to flush streamed message: {close_error}")
             # Clean up the interrupt flag when stream ends
             if assistant_message_id and assistant_message_id in active_streams:
                 del active_streams[assistant_message_id]
@@ -4,12 +4,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 """
-Event push routes - Cached version, supports fetch and clear mechanism
+Event push routes - Server-sent event stream with resume, plus the cached fetch and
+clear mechanism for polling clients
 """
 
+import json
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from opencontext.managers.event_manager import EventType, get_event_manager
@@ -32,8 +35,9 @@ async def fetch_and_clear_events(_auth: str = auth_dependency):
     """
     Fetch and clear cached events - Core API
 
-    Returns all cached events and clears the cache.
-    Frontend should call this endpoint periodically to get new events.
+    Returns the events published since the previous call. Events stay in the ring
+    buffer for /api/events and /api/events/stream subscribers.
+    Prefer /api/events/stream over calling this endpoint periodically.
     """
     try:
         event_manager = get_event_manager()
@@ -46,6 +50,105 @@ async def fetch_and_clear_events(_auth: str = auth_dependency):
         return convert_resp(code=500, status=500, message=f"Failed to fetch events: {str(e)}")
 
 
+def _parse_event_types(types: Optional[str]):
+    """Comma separated event type values to a set, None for all types"""
+    if not types:
+        return None
+    return {EventType(value.strip()) for value in types.split(",") if value.strip()}
+
+
+def _format_sse(event) -> str:
+    return (
+        f"id: {event.seq}\n"
+        f"event: {event.type.value}\n"
+        f"data: {json.dumps(event.to_dict(), ensure_ascii=False)}\n\n"
+    )
+
+
+@router.get("/api/events/stream")
+async def stream_events(
+    after: Optional[int] = Query(None, description="Replay events after this seq"),
+    types: Optional[str] = Query(None, description="Comma separated event types"),
+    last_event_id: Optional[str] = Header(None),
+    _auth: str = auth_dependency,
+):
+    """
+    Stream events as server-sent events.
+
+    Each event carries its seq as the SSE id, so a reconnecting EventSource resumes
+    after the last event it received (Last-Event-ID header) as long as it is still
+    in the event ring buffer. Events evicted before they could be delivered are
+    reported by a `gap` event with the number missed. Any number of clients can
+    subscribe, none of them removes events for the others.
+    """
+    try:
+        event_types = _parse_event_types(types)
+    except ValueError:
+        return convert_resp(code=400, status=400, message=f"Invalid event types: {types}")
+    if after is None and last_event_id and last_event_id.isdigit():
+        after = int(last_event_id)
+
+    subscription = get_event_manager().subscribe(after=after, event_types=event_types)
+
+    async def generate():
+        missed = 0
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                events = await subscription.get(timeout=15.0)
+                if subscription.missed > missed:
+                    data = {"missed": subscription.missed - missed}
+                    missed = subscription.missed
+                    yield f"event: gap\ndata: {json.dumps(data)}\n\n"
+                if not events:
+                    # Keep-alive comment, also lets a closed connection be noticed
+                    yield ": keepalive\n\n"
+                    continue
+                for event in events:
+                    yield _format_sse(event)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get("/api/events")
+async def get_events_since(
+    after: int = Query(0, description="Return events after this seq"),
+    types: Optional[str] = Query(None, description="Comma separated event types"),
+    _auth: str = auth_dependency,
+):
+    """
+    Non-destructive polling: events after a seq that are still in the ring buffer.
+    Pass the returned last_seq as `after` on the next call.
+    """
+    try:
+        event_types = _parse_event_types(types)
+    except ValueError:
+        return convert_resp(code=400, status=400, message=f"Invalid event types: {types}")
+    try:
+        events, missed = get_event_manager().events_since(after, event_types)
+        return convert_resp(
+            data={
+                "events": [event.to_dict() for event in events],
+                "count": len(events),
+                "missed": missed,
+                "last_seq": events[-1].seq if events else after,
+            }
+        )
+    except Exception as e:
+        logger.exception(f"Failed to get events: {e}")
+        return convert_resp(code=500, status=500, message=f"Failed to get events: {str(e)}")
+
+
 @router.get("/api/events/status")
 async def get_event_status(
     opencontext: OpenContext = Depends(get_context_lab), _auth: str = auth_dependency
@@ -172,6 +172,96 @@ async def monitoring_health(_auth: str = auth_dependency):
         return {"success": False, "error": str(e)}
 
 
+@router.get("/embedding-cache")
+async def get_embedding_cache_stats(_auth: str = auth_dependency):
+    """
+    Get embedding cache hit/miss statistics
+    """
+    try:
+        monitor = get_monitor()
+        stats = monitor.get_embedding_cache_stats()
+        try:
+            from opencontext.llm.global_embedding_client import GlobalEmbeddingClient
+
+            client = GlobalEmbeddingClient.get_instance()._embedding_client
+            if client and client.embedding_cache:
+                stats.update(client.embedding_cache.get_stats())
+        except Exception:
+            pass
+        return {"success": True, "data": stats}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get embedding cache statistics: {str(e)}"
+        )
+
+
+@router.get("/sqlite")
+async def get_sqlite_stats(_auth: str = auth_dependency):
+    """
+    Get SQLite writer lock wait statistics and connection pool state
+    """
+    try:
+        monitor = get_monitor()
+        stats = monitor.get_sqlite_stats()
+        try:
+            from opencontext.storage.base_storage import StorageType
+            from opencontext.storage.global_storage import get_storage
+
+            backend = get_storage().get_default_backend(StorageType.DOCUMENT_DB)
+            if backend and hasattr(backend, "get_connection_stats"):
+                stats.update(backend.get_connection_stats())
+        except Exception:
+            pass
+        return {"success": True, "data": stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get SQLite statistics: {str(e)}")
+
+
+@router.get("/backpressure")
+async def get_backpressure_stats(_auth: str = auth_dependency):
+    """
+    Get capture -> processor queue depth, drop, coalesce and spill statistics
+    """
+    try:
+        monitor = get_monitor()
+        stats = monitor.get_backpressure_stats()
+        return {"success": True, "data": stats}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get backpressure statistics: {str(e)}"
+        )
+
+
+@router.get("/document-progress")
+async def get_document_progress(_auth: str = auth_dependency):
+    """
+    Get ingestion status and page progress of queued, running and recently finished documents
+    """
+    try:
+        monitor = get_monitor()
+        progress = monitor.get_document_progress()
+        return {"success": True, "data": progress}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get document progress: {str(e)}"
+        )
+
+
+@router.get("/adaptive-controllers")
+async def get_adaptive_controller_stats(_auth: str = auth_dependency):
+    """
+    Get the current concurrency limit, batch size and request outcomes of adaptive controllers
+    """
+    try:
+        monitor = get_monitor()
+        stats = monitor.get_adaptive_controller_stats()
+        return {"success": True, "data": stats}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get adaptive controller statistics: {str(e)}"
+        )
+
+
 @router.get("/processing-errors")
 async def get_processing_errors(
     hours: int = Query(1, ge=1, le=24, description="Statistics time range (hours)"),
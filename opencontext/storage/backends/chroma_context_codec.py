@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+ChromaDB context codec - Rebuilds ProcessedContext objects from flattened Chroma rows
+
+The routing table (which flattened field belongs to which nested model) and the set
+of JSON-encoded fields are computed once from the model definitions. Each row is
+routed in a single pass, only fields typed as lists or dicts are JSON-decoded, and
+the nested dict is validated by pydantic in one call.
+"""
+
+import json
+from functools import cached_property
+from typing import Any, Dict, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from opencontext.models.context import (
+    ContextProperties,
+    ExtractedData,
+    ProcessedContext,
+    ProfileContextMetadata,
+    Vectorize,
+)
+from opencontext.models.enums import ContextType
+
+# Nested sections of ProcessedContext a flattened field can be routed to
+_SECTIONS: Tuple[Tuple[str, Type[BaseModel]], ...] = (
+    ("extracted_data", ExtractedData),
+    ("properties", ContextProperties),
+    ("vectorize", Vectorize),
+)
+# Entity contexts keep their profile fields in ProcessedContext.metadata
+_METADATA_SECTION = ("metadata", ProfileContextMetadata)
+
+# field name -> (section name, whether the stored value is a JSON string)
+FieldRoutes = Dict[str, Tuple[str, bool]]
+
+
+def _is_json_field(annotation: Any) -> bool:
+    """Lists and dicts are stored as JSON strings by the serializer"""
+    if get_origin(annotation) is Union:
+        return any(_is_json_field(arg) for arg in get_args(annotation))
+    return (get_origin(annotation) or annotation) in (list, dict)
+
+
+def _build_routes(sections: Tuple[Tuple[str, Type[BaseModel]], ...]) -> FieldRoutes:
+    """Map each flattened field name to its section, earlier sections win"""
+    routes: FieldRoutes = {}
+    for section, model_cls in sections:
+        for name, field in model_cls.model_fields.items():
+            # *_ts fields are redundant timestamps written for range filters
+            if not name.endswith("_ts"):
+                routes.setdefault(name, (section, _is_json_field(field.annotation)))
+    return routes
+
+
+_DEFAULT_ROUTES = _build_routes(_SECTIONS)
+_ENTITY_ROUTES = _build_routes(_SECTIONS + (_METADATA_SECTION,))
+_ENTITY_TYPE = ContextType.ENTITY_CONTEXT.value
+
+
+def route_fields(
+    metadata: Dict[str, Any], document: Optional[str], embedding: Any
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a flattened Chroma row into per-section dicts, decoding JSON fields.
+    Fields that belong to no section are dropped, as ProcessedContext would ignore
+    them anyway.
+    """
+    routes = _ENTITY_ROUTES if metadata.get("context_type") == _ENTITY_TYPE else _DEFAULT_ROUTES
+    sections: Dict[str, Dict[str, Any]] = {
+        "extracted_data": {},
+        "properties": {},
+        "vectorize": {},
+        "metadata": {},
+    }
+    for key, value in metadata.items():
+        route = routes.get(key)
+        if route is None:
+            continue
+        section, is_json = route
+        if is_json and isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass  # Keep the raw value, validation reports it
+        sections[section][key] = value
+
+    vectorize = sections["vectorize"]
+    if document:
+        vectorize["text"] = document
+    if embedding is not None and hasattr(embedding, "tolist"):
+        embedding = embedding.tolist()
+    vectorize["vector"] = embedding
+    return sections
+
+
+def decode_processed_context(
+    doc_id: str,
+    document: Optional[str],
+    metadata: Dict[str, Any],
+    embedding: Any = None,
+    need_vector: bool = True,
+) -> ProcessedContext:
+    """Build a ProcessedContext from one Chroma row"""
+    sections = route_fields(metadata or {}, document, embedding if need_vector else None)
+    sections["id"] = doc_id
+    if not sections["metadata"]:
+        del sections["metadata"]
+    return ProcessedContext.model_validate(sections)
+
+
+class LazyProcessedContext:
+    """
+    Read-only view of a Chroma row with the ProcessedContext attribute layout.
+
+    The row is routed up front, but each nested model is only validated the first
+    time it is accessed, so scans that read a few fields per row (cleanup, counting,
+    filtering) skip building the rest. Use `to_context()` to get a full
+    ProcessedContext, e.g. before modifying and upserting it.
+    """
+
+    def __init__(
+        self,
+        doc_id: str,
+        document: Optional[str],
+        metadata: Dict[str, Any],
+        embedding: Any = None,
+        need_vector: bool = True,
+    ):
+        self.id = doc_id
+        self._sections = route_fields(metadata or {}, document, None)
+        # Converted together with the vectorize section, on first access
+        self._embedding = embedding if need_vector else None
+
+    @cached_property
+    def extracted_data(self) -> ExtractedData:
+        return ExtractedData.model_validate(self._sections["extracted_data"])
+
+    @cached_property
+    def properties(self) -> ContextProperties:
+        return ContextProperties.model_validate(self._sections["properties"])
+
+    @cached_property
+    def vectorize(self) -> Vectorize:
+        vectorize = self._sections["vectorize"]
+        embedding = self._embedding
+        if embedding is not None and hasattr(embedding, "tolist"):
+            embedding = embedding.tolist()
+        vectorize["vector"] = embedding
+        return Vectorize.model_validate(vectorize)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._sections["metadata"]
+
+    def to_context(self) -> ProcessedContext:
+        """Materialize every section into a ProcessedContext"""
+        return ProcessedContext(
+            id=self.id,
+            extracted_data=self.extracted_data,
+            properties=self.properties,
+            vectorize=self.vectorize,
+            metadata=self.metadata,
+        )
+
+    def __repr__(self) -> str:
+        return f"LazyProcessedContext(id={self.id!r})"
@@ -12,20 +12,27 @@ Creates independent collections for each context_type
 
 import atexit
 import datetime
+import heapq
 import json
 import signal
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import chromadb
 
-from opencontext.llm.global_embedding_client import do_vectorize
-from opencontext.models.context import ContextProperties, ExtractedData, ProcessedContext, Vectorize
+from opencontext.llm.global_embedding_client import do_vectorize, do_vectorize_batch
+from opencontext.models.context import ProcessedContext, Vectorize
 from opencontext.models.enums import ContentFormat, ContextType
+from opencontext.storage.backends.chroma_context_codec import (
+    LazyProcessedContext,
+    decode_processed_context,
+)
 from opencontext.storage.base_storage import IVectorStorageBackend, StorageType
 from opencontext.utils.logging_utils import get_logger
+from opencontext.utils.rw_lock import ReadWriteLock
 
 logger = get_logger(__name__)
 
@@ -48,8 +55,15 @@ class ChromaDBBackend(IVectorStorageBackend):
         self._max_retry_count = 3
         self._retry_delay = 1.0  # seconds
         self._pending_writes = []  # Pending writes
-        self._write_lock = threading.Lock()  # Write lock
+        # Reads (get/query/count) share the lock, upserts and deletes are exclusive
+        self._rw_lock = ReadWriteLock()
         self._cleanup_registered = False
+        # context_type -> cached collection.count(), dropped whenever the collection is written
+        self._count_cache: Dict[str, int] = {}
+        self._count_cache_lock = threading.Lock()
+        # Fan-out of multi-collection searches
+        self._parallel_search = True
+        self._search_executor: Optional[ThreadPoolExecutor] = None
 
         # Register graceful shutdown handler
         self._register_cleanup_handlers()
@@ -80,7 +94,7 @@ class ChromaDBBackend(IVectorStorageBackend):
     def _cleanup(self) -> None:
         """Clean up resources and persist data"""
         try:
-            with self._write_lock:
+            with self._rw_lock.write_lock():
                 # Complete all pending writes
                 if self._pending_writes:
                     logger.info(
@@ -88,6 +102,10 @@ class ChromaDBBackend(IVectorStorageBackend):
                     )
                     self._flush_pending_writes()
 
+                if self._search_executor:
+                    self._search_executor.shutdown(wait=False)
+                    self._search_executor = None
+
                 logger.info("Persisting ChromaDB index...")
                 # self._client.persist()
                 logger.info("ChromaDB safely shut down")
@@ -109,6 +127,7 @@ class ChromaDBBackend(IVectorStorageBackend):
                         metadatas=write_op["metadatas"],
                         embeddings=write_op["embeddings"],
                     )
+                    self._invalidate_count(write_op["context_type"])
                     logger.debug(f"Completed pending write: {len(write_op['ids'])} documents")
                 except Exception as e:
                     logger.error(f"Failed to flush write operation: {e}")
@@ -180,6 +199,14 @@ class ChromaDBBackend(IVectorStorageBackend):
             )
             self._collections["todo"] = todo_collection
 
+            # Searches without context_types query every collection concurrently
+            self._parallel_search = chroma_config.get("parallel_search", True)
+            if self._parallel_search:
+                self._search_executor = ThreadPoolExecutor(
+                    max_workers=chroma_config.get("search_workers", len(context_types)),
+                    thread_name_prefix="chroma-search",
+                )
+
             self._initialized = True
             logger.info(
                 f"ChromaDB vector backend initialized successfully, created {len(self._collections)} collections"
@@ -369,6 +396,15 @@ class ChromaDBBackend(IVectorStorageBackend):
         if not self._ensure_connection():
             raise RuntimeError("ChromaDB connection not available")
 
+        # Vectorize everything missing a vector with multi-input requests up front,
+        # _ensure_vectorized falls back to per-item calls if this fails
+        pending = [c.vectorize for c in contexts if c.vectorize and not c.vectorize.vector]
+        if pending:
+            try:
+                do_vectorize_batch(pending)
+            except Exception as e:
+                logger.warning(f"Batch vectorization of {len(pending)} contexts failed: {e}")
+
         contexts_by_type = {}
         for context in contexts:
             context_type = context.extracted_data.context_type.value
@@ -418,11 +454,12 @@ class ChromaDBBackend(IVectorStorageBackend):
                 continue
 
             try:
-                with self._write_lock:
+                with self._rw_lock.write_lock():
                     collection.upsert(
                         ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
                     )
                     stored_ids.extend(ids)
+                    self._invalidate_count(context_type)
 
                     # Persist immediately to prevent data loss
                     if self._client and hasattr(self._client, "persist"):
@@ -432,7 +469,7 @@ class ChromaDBBackend(IVectorStorageBackend):
                 logger.error(f"Batch storing context to {context_type} collection failed: {e}")
 
                 # If write fails, record pending writes for later retry
-                with self._write_lock:
+                with self._rw_lock.write_lock():
                     self._pending_writes.append(
                         {
                             "collection": collection,
@@ -458,7 +495,7 @@ class ChromaDBBackend(IVectorStorageBackend):
             return None
         # Search in all collections
         try:
-            with self._write_lock:
+            with self._rw_lock.read_lock():
                 result = self._collections[context_type].get(
                     ids=[id],
                     include=(
@@ -498,43 +535,14 @@ class ChromaDBBackend(IVectorStorageBackend):
         if not context_types:
             context_types = list(self._collections.keys())
 
+        where_clause = self._build_where_clause(filter)
         for context_type in context_types:
             if context_type not in self._collections:
                 continue
-            collection = self._collections[context_type]
             try:
-                where_clause = self._build_where_clause(filter)
-
-                # ChromaDB's get method does not directly support offset, so pagination needs to be implemented in other ways
-                with self._write_lock:
-                    results = collection.get(
-                        limit=limit + offset,  # Get more data to simulate offset
-                        where=where_clause,
-                        include=(
-                            ["metadatas", "documents", "embeddings"]
-                            if need_vector
-                            else ["metadatas", "documents"]
-                        ),
-                    )
-
-                contexts = []
-                if results and results["ids"]:
-                    # Manually apply offset
-                    start_idx = min(offset, len(results["ids"]))
-                    end_idx = min(start_idx + limit, len(results["ids"]))
-
-                    for i in range(start_idx, end_idx):
-                        doc = {
-                            "id": results["ids"][i],
-                            "document": results["documents"][i],
-                            "metadata": results["metadatas"][i],
-                        }
-                        if need_vector:
-                            doc["embedding"] = results["embeddings"][i]
-                        context = self._chroma_result_to_context(doc, need_vector)
-                        if context:
-                            contexts.append(context)
-
+                _, contexts = self._get_context_page(
+                    context_type, where_clause, limit, offset, need_vector
+                )
                 if contexts:
                     result[context_type] = contexts
 
@@ -544,6 +552,92 @@ class ChromaDBBackend(IVectorStorageBackend):
 
         return result
 
+    def iter_processed_context_pages(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+        lazy: bool = False,
+    ) -> Iterator[List[ProcessedContext]]:
+        """
+        Iterate over the contexts of one type page by page.
+        Each page is fetched with a real offset, so a full scan reads every row once
+        and only one page is held in memory at a time. With lazy=True the pages hold
+        LazyProcessedContext views that decode nested models on first access.
+        """
+        if not self._initialized or context_type not in self._collections:
+            return
+
+        where_clause = self._build_where_clause(filter)
+        offset = 0
+        while True:
+            row_count, contexts = self._get_context_page(
+                context_type, where_clause, page_size, offset, need_vector, lazy
+            )
+            if contexts:
+                yield contexts
+            # Rows that fail to deserialize are dropped, so use the raw row count
+            if row_count < page_size:
+                return
+            offset += row_count
+
+    def iter_processed_contexts(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+        lazy: bool = False,
+    ) -> Iterator[ProcessedContext]:
+        """Iterate over the contexts of one type, fetched page by page"""
+        for page in self.iter_processed_context_pages(
+            context_type,
+            filter=filter,
+            page_size=page_size,
+            need_vector=need_vector,
+            lazy=lazy,
+        ):
+            yield from page
+
+    def _get_context_page(
+        self,
+        context_type: str,
+        where_clause: Optional[Dict[str, Any]],
+        limit: int,
+        offset: int,
+        need_vector: bool,
+        lazy: bool = False,
+    ) -> Tuple[int, List[ProcessedContext]]:
+        """Fetch one page of a collection, returns (raw row count, contexts)"""
+        collection = self._collections[context_type]
+        with self._rw_lock.read_lock():
+            results = collection.get(
+                limit=limit,
+                offset=offset,
+                where=where_clause,
+                include=(
+                    ["metadatas", "documents", "embeddings"]
+                    if need_vector
+                    else ["metadatas", "documents"]
+                ),
+            )
+
+        contexts = []
+        ids = results["ids"] if results else []
+        for i in range(len(ids)):
+            doc = {
+                "id": ids[i],
+                "document": results["documents"][i],
+                "metadata": results["metadatas"][i],
+            }
+            if need_vector:
+                doc["embedding"] = results["embeddings"][i]
+            context = self._chroma_result_to_context(doc, need_vector, lazy)
+            if context:
+                contexts.append(context)
+        return len(ids), contexts
+
     def delete_processed_context(self, id: str, context_type: str) -> bool:
         """Delete ProcessedContext by ID"""
         return self.delete_contexts([id], context_type)
@@ -559,6 +653,23 @@ class ChromaDBBackend(IVectorStorageBackend):
         """Vector search for ProcessedContext"""
         if not self._initialized:
             return []
+        return self.batch_search([query], top_k, context_types, filters, need_vector)[0]
+
+    def batch_search(
+        self,
+        queries: List[Vectorize],
+        top_k: int = 10,
+        context_types: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        need_vector: bool = False,
+    ) -> List[List[Tuple[ProcessedContext, float]]]:
+        """
+        Vector search for several queries at once.
+        Each collection is queried once with all query embeddings, results are
+        returned per query in input order.
+        """
+        if not self._initialized or not queries:
+            return [[] for _ in queries]
 
         # Determine which collections to search
         target_collections = {}
@@ -571,167 +682,144 @@ class ChromaDBBackend(IVectorStorageBackend):
         else:
             target_collections = self._collections
 
-        # Ensure query is vectorized
-        query_vector = None
-        if query.vector and len(query.vector) > 0:
-            query_vector = query.vector
-        else:
-            do_vectorize(query)
-            query_vector = query.vector
+        # Ensure queries are vectorized, with one embedding request for all missing vectors
+        missing = [query for query in queries if not query.vector]
+        if missing:
+            if len(missing) == 1:
+                do_vectorize(missing[0])
+            else:
+                do_vectorize_batch(missing)
+
+        # Queries that still have no vector get an empty result
+        positions = [i for i, query in enumerate(queries) if query.vector]
+        if len(positions) < len(queries):
+            logger.warning(
+                f"Unable to get query vector for {len(queries) - len(positions)} queries, "
+                "skipping them"
+            )
+        if not positions:
+            return [[] for _ in queries]
+        query_vectors = [queries[i].vector for i in positions]
 
-        if not query_vector:
-            logger.warning("Unable to get query vector, search failed")
-            return []
+        where_clause = self._build_where_clause(filters)
+
+        def search_one(context_type: str) -> List[List[Tuple[ProcessedContext, float]]]:
+            return self._search_collection(
+                context_type, query_vectors, top_k, where_clause, need_vector
+            )
 
-        all_results = []
+        if self._search_executor and len(target_collections) > 1:
+            result_lists = list(self._search_executor.map(search_one, target_collections))
+        else:
+            result_lists = [search_one(context_type) for context_type in target_collections]
+
+        # Each list is already limited to top_k, keep the best top_k overall per query
+        results: List[List[Tuple[ProcessedContext, float]]] = [[] for _ in queries]
+        for n, position in enumerate(positions):
+            results[position] = heapq.nlargest(
+                top_k,
+                (item for per_query in result_lists for item in per_query[n]),
+                key=lambda x: x[1],
+            )
+        return results
 
-        for context_type, collection in target_collections.items():
+    def _search_collection(
+        self,
+        context_type: str,
+        query_vectors: List[List[float]],
+        top_k: int,
+        where_clause: Optional[Dict[str, Any]],
+        need_vector: bool,
+    ) -> List[List[Tuple[ProcessedContext, float]]]:
+        """Query a single collection, returns (context, score) pairs for each query vector"""
+        collection = self._collections[context_type]
+        results_with_scores: List[List[Tuple[ProcessedContext, float]]] = [
+            [] for _ in query_vectors
+        ]
+        try:
+            # Check if collection is empty
             try:
-                # Check if collection is empty
-                try:
-                    with self._write_lock:
-                        count = collection.count()
-                    if count == 0:
-                        continue
-                except Exception as count_error:
-                    logger.debug(
-                        f"Unable to get count for collection '{context_type}': {count_error}"
-                    )
-                    # If count fails, collection has issues, skip
-                    continue
+                if self._get_collection_count(context_type) == 0:
+                    return results_with_scores
+            except Exception as count_error:
+                logger.debug(f"Unable to get count for collection '{context_type}': {count_error}")
+                # If count fails, collection has issues, skip
+                return results_with_scores
+
+            with self._rw_lock.read_lock():
+                results = collection.query(
+                    query_embeddings=query_vectors,
+                    n_results=top_k,
+                    where=where_clause,
+                    include=(
+                        ["metadatas", "documents", "distances", "embeddings"]
+                        if need_vector
+                        else ["metadatas", "documents", "distances"]
+                    ),
+                )
 
-                where_clause = self._build_where_clause(filters)
-
-                with self._write_lock:
-                    results = collection.query(
-                        query_embeddings=[query_vector],
-                        n_results=top_k,
-                        where=where_clause,
-                        include=(
-                            ["metadatas", "documents", "distances", "embeddings"]
-                            if need_vector
-                            else ["metadatas", "documents", "distances"]
-                        ),
-                    )
+            if not results:
+                return results_with_scores
+            for q, ids in enumerate(results["ids"]):
+                for i in range(len(ids)):
+                    doc = {
+                        "id": ids[i],
+                        "document": results["documents"][q][i],
+                        "metadata": results["metadatas"][q][i],
+                    }
+                    if need_vector:
+                        doc["embedding"] = results["embeddings"][q][i]
+                    context = self._chroma_result_to_context(doc, need_vector)
+                    if context:
+                        distance = results["distances"][q][i]
+                        score = 1 - distance  # Convert to similarity score
+                        results_with_scores[q].append((context, score))
 
-                if results and results["ids"][0]:
-                    for i in range(len(results["ids"][0])):
-                        doc = {
-                            "id": results["ids"][0][i],
-                            "document": results["documents"][0][i],
-                            "metadata": results["metadatas"][0][i],
-                        }
-                        if need_vector:
-                            doc["embedding"] = results["embeddings"][0][i]
-                        context = self._chroma_result_to_context(doc, need_vector)
-                        if context:
-                            distance = results["distances"][0][i]
-                            score = 1 - distance  # Convert to similarity score
-                            all_results.append((context, score))
+        except Exception as e:
+            # Special handling for HNSW index errors
+            if "hnsw segment reader" in str(e).lower() or "nothing found on disk" in str(e).lower():
+                logger.error(
+                    f"Collection '{context_type}' index not initialized (no data), skipping search: {e}"
+                )
+            else:
+                logger.exception(f"Vector search failed in {context_type} collection: {e}")
 
-            except Exception as e:
-                # Special handling for HNSW index errors
-                if (
-                    "hnsw segment reader" in str(e).lower()
-                    or "nothing found on disk" in str(e).lower()
-                ):
-                    logger.error(
-                        f"Collection '{context_type}' index not initialized (no data), skipping search: {e}"
-                    )
-                    continue
-                else:
-                    logger.exception(f"Vector search failed in {context_type} collection: {e}")
-                    continue
+        return results_with_scores
 
-        # Sort by score and limit results
-        all_results.sort(key=lambda x: x[1], reverse=True)
-        # logger.info(f"Found {len(all_results)} results, returning top {top_k}")
-        return all_results[:top_k]
+    def _get_collection_count(self, context_type: str) -> int:
+        """Get a collection's record count, cached until the collection is next written"""
+        with self._count_cache_lock:
+            count = self._count_cache.get(context_type)
+        if count is not None:
+            return count
+        with self._rw_lock.read_lock():
+            count = self._collections[context_type].count()
+            # Cached under the read lock, so no write can invalidate it in between
+            with self._count_cache_lock:
+                self._count_cache[context_type] = count
+        return count
+
+    def _invalidate_count(self, context_type: str):
+        """Drop the cached count of a collection (caller holds the write lock)"""
+        with self._count_cache_lock:
+            self._count_cache.pop(context_type, None)
 
     def _chroma_result_to_context(
-        self, doc: Dict[str, Any], need_vector: bool = True
-    ) -> Optional[ProcessedContext]:
-        """Convert ChromaDB query result to ProcessedContext"""
+        self, doc: Dict[str, Any], need_vector: bool = True, lazy: bool = False
+    ) -> Optional[Union[ProcessedContext, LazyProcessedContext]]:
+        """Convert ChromaDB query result to ProcessedContext, or a lazy view of it"""
         try:
             if not doc.get("id"):
                 logger.warning("ChromaDB result missing id field")
                 return None
-            extracted_data_field_names = set(ExtractedData.model_fields.keys())
-            properties_field_names = set(ContextProperties.model_fields.keys())
-            vectorize_field_names = set(Vectorize.model_fields.keys())
-
-            extracted_data_dict = {}
-            properties_dict = {}
-            context_dict = {}
-            vectorize_dict = {}
-            metadata_dict = {}
-
-            # All fields are now at the same level
-            document = doc.pop("document", None)
-            embedding = doc.pop("embedding", None)
-            metadata = doc.pop("metadata", {})
-            doc_id = doc.pop("id")
-
-            # Process vectorize data
-            if document:
-                vectorize_dict["text"] = document
-            vectorize_dict["vector"] = embedding
-
-            # Determine metadata fields based on context_type
-            metadata_field_names = set()
-            context_type_value = metadata.get("context_type")
-
-            if context_type_value == ContextType.ENTITY_CONTEXT.value:
-                # Import ProfileContextMetadata to get its field names
-                from opencontext.models.context import ProfileContextMetadata
-
-                metadata_field_names = set(ProfileContextMetadata.model_fields.keys())
-            # Other context_types can add corresponding metadata models here
-            # elif context_type_value == ContextType.ACTIVITY_CONTEXT.value:
-            #     from opencontext.models.context import ActivityContextMetadata
-            #     metadata_field_names = set(ActivityContextMetadata.model_fields.keys())
-
-            # Reconstruct objects from flattened fields
-            for key, value in metadata.items():
-                # timestamp fields are redundant
-                if key.endswith("_ts"):
-                    continue
-
-                # Try to deserialize if it looks like a JSON string
-                val = value
-                if isinstance(value, str) and value.startswith(("{", "[")):
-                    try:
-                        val = json.loads(value)
-                    except (json.JSONDecodeError, TypeError):
-                        pass  # Keep original value if not valid JSON
-                # Assign to appropriate dictionary
-                if key in extracted_data_field_names:
-                    extracted_data_dict[key] = val
-                elif key in properties_field_names:
-                    properties_dict[key] = val
-                elif key in vectorize_field_names:
-                    vectorize_dict[key] = val
-                elif metadata_field_names and key in metadata_field_names:
-                    # This is a metadata field
-                    metadata_dict[key] = val
-                else:
-                    context_dict[key] = val
-
-            # logger.info(f"extracted_data_dict: {extracted_data_dict}")
-            # Create the nested Pydantic models and add them to the main context dict
-            context_dict["id"] = doc_id
-            context_dict["extracted_data"] = ExtractedData.model_validate(extracted_data_dict)
-            context_dict["properties"] = ContextProperties.model_validate(properties_dict)
-            context_dict["vectorize"] = Vectorize.model_validate(vectorize_dict)
-
-            # If there are metadata fields, add to context_dict
-            if metadata_dict:
-                context_dict["metadata"] = metadata_dict
-            # Validate the final ProcessedContext object
-            context = ProcessedContext.model_validate(context_dict)
-            if not need_vector:
-                context.vectorize.vector = None
-            return context
+            factory = LazyProcessedContext if lazy else decode_processed_context
+            return factory(
+                doc["id"],
+                doc.get("document"),
+                doc.get("metadata") or {},
+                doc.get("embedding"),
+                need_vector,
+            )
 
         except Exception as e:
             logger.exception(f"Failed to convert ChromaDB result to ProcessedContext: {e}")
@@ -780,8 +868,9 @@ class ChromaDBBackend(IVectorStorageBackend):
 
         collection = self._collections[context_type]
         try:
-            with self._write_lock:
+            with self._rw_lock.write_lock():
                 collection.delete(ids=ids)
+                self._invalidate_count(context_type)
             return True
         except Exception as e:
             logger.exception(f"Failed to delete ChromaDB contexts: {e}")
@@ -796,11 +885,7 @@ class ChromaDBBackend(IVectorStorageBackend):
             return 0
 
         try:
-            collection = self._collections[context_type]
-            # Use count method to get the number of documents in the collection
-            with self._write_lock:
-                count = collection.count()
-            return count
+            return self._get_collection_count(context_type)
         except Exception as e:
             logger.warning(f"Failed to get record count for {context_type}: {e}")
             return 0
@@ -844,7 +929,7 @@ class ChromaDBBackend(IVectorStorageBackend):
                 meta.update(metadata)
 
             # Store to vector database
-            with self._write_lock:
+            with self._rw_lock.write_lock():
                 collection.upsert(
                     ids=[f"todo_{todo_id}"],
                     embeddings=[embedding],
@@ -884,14 +969,14 @@ class ChromaDBBackend(IVectorStorageBackend):
                 return []
 
             # Check if collection is empty
-            with self._write_lock:
+            with self._rw_lock.read_lock():
                 count = collection.count()
             if count == 0:
                 logger.debug("Todo collection is empty, no similar todos found")
                 return []
 
             # Query vector database
-            with self._write_lock:
+            with self._rw_lock.read_lock():
                 results = collection.query(
                     query_embeddings=[query_embedding],
                     n_results=min(top_k, count),
@@ -931,7 +1016,7 @@ class ChromaDBBackend(IVectorStorageBackend):
                 logger.error("Todo collection not found")
                 return False
 
-            with self._write_lock:
+            with self._rw_lock.write_lock():
                 collection.delete(ids=[f"todo_{todo_id}"])
             logger.debug(f"Deleted todo embedding: id={todo_id}")
             return True
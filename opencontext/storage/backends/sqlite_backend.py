@@ -11,9 +11,12 @@ SQLite document note storage backend implementation
 import json
 import os
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union
 
+from opencontext.storage.backends.sqlite_connection import SQLiteConnectionPool
 from opencontext.storage.base_storage import (
     DataType,
     DocumentData,
@@ -25,6 +28,9 @@ from opencontext.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# How often a wait for vault changes checks its stop event, in seconds
+_STOP_POLL_INTERVAL = 0.5
+
 
 class SQLiteBackend(IDocumentStorageBackend):
     """
@@ -34,8 +40,10 @@ class SQLiteBackend(IDocumentStorageBackend):
 
     def __init__(self):
         self.db_path: Optional[str] = None
-        self.connection: Optional[sqlite3.Connection] = None
+        self._pool: Optional[SQLiteConnectionPool] = None
         self._initialized = False
+        # Notified after commits that change the vaults table
+        self._vault_change_cond = threading.Condition()
 
     def initialize(self, config: Dict[str, Any]) -> bool:
         """Initialize SQLite database"""
@@ -47,9 +55,9 @@ class SQLiteBackend(IDocumentStorageBackend):
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
-            self.connection = sqlite3.connect(
-                self.db_path, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row  # Allow column name access
+            # WAL mode, per-thread readers and a single queued writer connection
+            self._pool = SQLiteConnectionPool(
+                self.db_path, pragmas=config.get("config", {}).get("pragmas"))
 
             # Create table structure
             self._create_tables()
@@ -65,7 +73,14 @@ class SQLiteBackend(IDocumentStorageBackend):
 
     def _create_tables(self):
         """Create database table structure"""
-        cursor = self.connection.cursor()
+        with self._pool.write() as conn:
+            self._create_table_structure(conn.cursor())
+
+        # Add default Quick Start document (only on first initialization)
+        self._insert_default_vault_document()
+
+    def _create_table_structure(self, cursor: sqlite3.Cursor):
+        """Create tables, columns and indexes that do not exist yet"""
 
         # vaults table - reports
         cursor.execute(
@@ -88,6 +103,83 @@ class SQLiteBackend(IDocumentStorageBackend):
         """
         )
 
+        # Vault change feed - one row per insert, update or delete of a vault, written by
+        # triggers so every write path is captured; seq is never reused
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vault_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                vault_id INTEGER NOT NULL,
+                operation TEXT NOT NULL,
+                changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_vaults_change_insert AFTER INSERT ON vaults
+            BEGIN
+                INSERT INTO vault_changes (vault_id, operation) VALUES (NEW.id, 'created');
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_vaults_change_update AFTER UPDATE ON vaults
+            BEGIN
+                INSERT INTO vault_changes (vault_id, operation) VALUES (
+                    NEW.id,
+                    CASE WHEN NEW.is_deleted AND NOT OLD.is_deleted
+                        THEN 'deleted' ELSE 'updated' END
+                );
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_vaults_change_delete AFTER DELETE ON vaults
+            BEGIN
+                INSERT INTO vault_changes (vault_id, operation) VALUES (OLD.id, 'deleted');
+            END
+        """
+        )
+
+        # Vault fingerprints - content hash and chunk segments of ingested vault documents
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vault_fingerprints (
+                vault_id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                segments JSON DEFAULT '[]',
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+        # Ingestion checkpoints - next chunk to store of a structured file being ingested
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_checkpoints (
+                object_id TEXT PRIMARY KEY,
+                file_signature TEXT,
+                chunk_index INTEGER NOT NULL DEFAULT 0,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+        # Merged context sources - contexts already merged into another, pending deletion
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS merged_context_sources (
+                context_id TEXT PRIMARY KEY,
+                context_type TEXT NOT NULL,
+                merged_into TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
         # Todo table - todo items
         cursor.execute(
             """
@@ -337,14 +429,9 @@ class SQLiteBackend(IDocumentStorageBackend):
             "CREATE INDEX IF NOT EXISTS idx_message_thinking_sequence ON message_thinking(message_id, sequence)"
         )
 
-        self.connection.commit()
-
-        # Add default Quick Start document (only on first initialization)
-        self._insert_default_vault_document()
-
     def _insert_default_vault_document(self):
         """Insert default Quick Start document"""
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
 
         # Check if Quick Start document already exists
         cursor.execute(
@@ -371,23 +458,24 @@ class SQLiteBackend(IDocumentStorageBackend):
 
         # Insert default document
         try:
-            cursor.execute(
-                """
-                INSERT INTO vaults (title, summary, content, document_type, tags, is_folder, is_deleted)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    "Start With Tutorial",
-                    "",
-                    default_content,
-                    "vaults",
-                    "guide,welcome,quick-start",
-                    False,
-                    False,
-                ),
-            )
-            vault_id = cursor.lastrowid
-            self.connection.commit()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO vaults (title, summary, content, document_type, tags, is_folder, is_deleted)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        "Start With Tutorial",
+                        "",
+                        default_content,
+                        "vaults",
+                        "guide,welcome,quick-start",
+                        False,
+                        False,
+                    ),
+                )
+                vault_id = cursor.lastrowid
             logger.info("Default Quick Start document inserted")
             from opencontext.managers.event_manager import EventType, get_event_manager
 
@@ -404,7 +492,6 @@ class SQLiteBackend(IDocumentStorageBackend):
         except Exception as e:
             logger.exception(
                 f"Failed to insert default Quick Start document: {e}")
-            self.connection.rollback()
 
     # Report table operations
     def insert_vaults(
@@ -421,32 +508,32 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                """
-                INSERT INTO vaults (title, summary, content, tags, parent_id, is_folder, document_type, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    title,
-                    summary,
-                    content,
-                    tags,
-                    parent_id,
-                    is_folder,
-                    document_type,
-                    datetime.now(),
-                    datetime.now(),
-                ),
-            )
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO vaults (title, summary, content, tags, parent_id, is_folder, document_type, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        title,
+                        summary,
+                        content,
+                        tags,
+                        parent_id,
+                        is_folder,
+                        document_type,
+                        datetime.now(),
+                        datetime.now(),
+                    ),
+                )
 
-            vault_id = cursor.lastrowid
-            self.connection.commit()
+                vault_id = cursor.lastrowid
+            self._notify_vault_change()
             logger.info(f"Report inserted, ID: {vault_id}")
             return vault_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert report: {e}")
             raise
 
@@ -457,7 +544,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             cursor.execute(
                 """
@@ -508,7 +595,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             # Build WHERE conditions and parameters
             where_clauses = ["is_deleted = ?"]
@@ -562,7 +649,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             cursor.execute(
                 """
@@ -582,44 +669,290 @@ class SQLiteBackend(IDocumentStorageBackend):
             logger.exception(f"Failed to get vaults: {e}")
             return None
 
-    def update_vault(self, vault_id: int, **kwargs) -> bool:
-        """Update report"""
+    def _notify_vault_change(self):
+        with self._vault_change_cond:
+            self._vault_change_cond.notify_all()
+
+    def get_latest_vault_change_seq(self) -> int:
+        """Sequence number of the newest vault change, 0 if there is none"""
+        if not self._initialized:
+            return 0
+
+        cursor = self._pool.reader().cursor()
+        try:
+            cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM vault_changes")
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.exception(f"Failed to get latest vault change: {e}")
+            return 0
+
+    def get_vault_changes(self, after_seq: int = 0, limit: int = 500) -> List[Dict]:
+        """
+        Vault changes after a sequence number, oldest first, each with the current state
+        of the vault (vault columns are None once the row has been deleted)
+        """
+        if not self._initialized:
+            return []
+
+        cursor = self._pool.reader().cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT c.seq, c.vault_id, c.operation, c.changed_at,
+                       v.id, v.title, v.summary, v.content, v.tags, v.parent_id, v.is_folder,
+                       v.is_deleted, v.created_at, v.updated_at, v.document_type
+                FROM vault_changes c
+                LEFT JOIN vaults v ON v.id = c.vault_id
+                WHERE c.seq > ?
+                ORDER BY c.seq
+                LIMIT ?
+            """,
+                (after_seq, limit),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.exception(f"Failed to get vault changes: {e}")
+            return []
+
+    def wait_for_vault_changes(
+        self, after_seq: int, timeout: float, stop_event: Optional[threading.Event] = None
+    ) -> bool:
+        """
+        Block until the change feed has entries after after_seq, or the timeout expires.
+        Writes through this backend wake waiters immediately, writes by other processes
+        are seen when the timeout expires. With a stop_event, the wait also ends soon
+        after it is set.
+        """
+        deadline = time.monotonic() + timeout
+        with self._vault_change_cond:
+            while True:
+                if self.get_latest_vault_change_seq() > after_seq:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+                    return False
+                if stop_event is not None:
+                    remaining = min(remaining, _STOP_POLL_INTERVAL)
+                self._vault_change_cond.wait(remaining)
+
+    def compact_vault_changes(self) -> int:
+        """Delete changes superseded by a later change of the same vault, returns the count"""
+        if not self._initialized:
+            return 0
+
+        try:
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    DELETE FROM vault_changes
+                    WHERE seq NOT IN (SELECT MAX(seq) FROM vault_changes GROUP BY vault_id)
+                """
+                )
+                return cursor.rowcount
+        except Exception as e:
+            logger.exception(f"Failed to compact vault changes: {e}")
+            return 0
+
+    def get_vault_fingerprint(self, vault_id: int) -> Optional[Dict]:
+        """Get the content hash and chunk segments recorded when a vault was last ingested"""
+        if not self._initialized:
+            return None
+
+        cursor = self._pool.reader().cursor()
+        try:
+            cursor.execute(
+                "SELECT content_hash, segments FROM vault_fingerprints WHERE vault_id = ?",
+                (vault_id,),
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return {
+                "content_hash": row["content_hash"],
+                "segments": json.loads(row["segments"]) if row["segments"] else [],
+            }
+        except Exception as e:
+            logger.exception(f"Failed to get vault fingerprint: {e}")
+            return None
+
+    def save_vault_fingerprint(
+        self, vault_id: int, content_hash: str, segments: List[Dict[str, Any]]
+    ) -> bool:
+        """Record the content hash and chunk segments of an ingested vault"""
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
-            # Build dynamic update statement
-            set_clauses = []
-            params = []
+            with self._pool.write() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO vault_fingerprints
+                        (vault_id, content_hash, segments, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (vault_id, content_hash, json.dumps(segments), datetime.now()),
+                )
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to save vault fingerprint: {e}")
+            return False
 
-            for key, value in kwargs.items():
-                if key in [
-                    "title",
-                    "summary",
-                    "content",
-                    "tags",
-                    "parent_id",
-                    "is_folder",
-                    "is_deleted",
-                ]:
-                    set_clauses.append(f"{key} = ?")
-                    params.append(value)
-
-            if not set_clauses:
-                return False
-
-            set_clauses.append("updated_at = CURRENT_TIMESTAMP")
-            params.append(vault_id)
-
-            sql = f"UPDATE vaults SET {', '.join(set_clauses)} WHERE id = ?"
-            cursor.execute(sql, params)
+    def get_ingestion_checkpoint(self, object_id: str) -> Optional[Dict]:
+        """Get the checkpoint (file_signature, chunk_index) of a document being ingested"""
+        if not self._initialized:
+            return None
+
+        cursor = self._pool.reader().cursor()
+        try:
+            cursor.execute(
+                "SELECT file_signature, chunk_index FROM ingestion_checkpoints WHERE object_id = ?",
+                (object_id,),
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        except Exception as e:
+            logger.exception(f"Failed to get ingestion checkpoint: {e}")
+            return None
+
+    def save_ingestion_checkpoint(
+        self, object_id: str, chunk_index: int, file_signature: str = ""
+    ) -> bool:
+        """Record the index of the next chunk to store for a document"""
+        if not self._initialized:
+            return False
+
+        try:
+            with self._pool.write() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO ingestion_checkpoints
+                        (object_id, file_signature, chunk_index, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (object_id, file_signature, chunk_index, datetime.now()),
+                )
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to save ingestion checkpoint: {e}")
+            return False
 
-            success = cursor.rowcount > 0
-            self.connection.commit()
+    def delete_ingestion_checkpoint(self, object_id: str) -> bool:
+        """Remove the checkpoint of a document once it is fully ingested"""
+        if not self._initialized:
+            return False
+
+        try:
+            with self._pool.write() as conn:
+                conn.execute(
+                    "DELETE FROM ingestion_checkpoints WHERE object_id = ?", (object_id,)
+                )
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to delete ingestion checkpoint: {e}")
+            return False
+
+    def record_merged_sources(
+        self, merged_into: str, context_type: str, source_ids: List[str]
+    ) -> bool:
+        """Record contexts that were merged into merged_into, to be deleted later"""
+        if not self._initialized:
+            return False
+
+        try:
+            with self._pool.write() as conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO merged_context_sources
+                        (context_id, context_type, merged_into, created_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    [
+                        (source_id, context_type, merged_into, datetime.now())
+                        for source_id in source_ids
+                    ],
+                )
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to record merged sources: {e}")
+            return False
+
+    def get_merged_sources(self, context_type: str, limit: int = 500) -> List[str]:
+        """Ids of merged contexts of one type that are still pending deletion"""
+        if not self._initialized:
+            return []
+
+        cursor = self._pool.reader().cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT context_id FROM merged_context_sources
+                WHERE context_type = ?
+                ORDER BY created_at
+                LIMIT ?
+                """,
+                (context_type, limit),
+            )
+            return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.exception(f"Failed to get merged sources: {e}")
+            return []
+
+    def delete_merged_sources(self, context_ids: List[str]) -> bool:
+        """Forget merged contexts once they have been deleted"""
+        if not self._initialized:
+            return False
+
+        try:
+            with self._pool.write() as conn:
+                conn.executemany(
+                    "DELETE FROM merged_context_sources WHERE context_id = ?",
+                    [(context_id,) for context_id in context_ids],
+                )
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to delete merged sources: {e}")
+            return False
+
+    def update_vault(self, vault_id: int, **kwargs) -> bool:
+        """Update report"""
+        if not self._initialized:
+            return False
+
+        try:
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                # Build dynamic update statement
+                set_clauses = []
+                params = []
+
+                for key, value in kwargs.items():
+                    if key in [
+                        "title",
+                        "summary",
+                        "content",
+                        "tags",
+                        "parent_id",
+                        "is_folder",
+                        "is_deleted",
+                    ]:
+                        set_clauses.append(f"{key} = ?")
+                        params.append(value)
+
+                if not set_clauses:
+                    return False
+
+                set_clauses.append("updated_at = CURRENT_TIMESTAMP")
+                params.append(vault_id)
+
+                sql = f"UPDATE vaults SET {', '.join(set_clauses)} WHERE id = ?"
+                cursor.execute(sql, params)
+
+                success = cursor.rowcount > 0
+            if success:
+                self._notify_vault_change()
             return success
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update report: {e}")
             return False
 
@@ -638,31 +971,30 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                """
-                INSERT INTO todo (content, start_time, end_time, status, urgency, assignee, reason, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    content,
-                    start_time or datetime.now(),
-                    end_time,
-                    status,
-                    urgency,
-                    assignee,
-                    reason,
-                    datetime.now(),
-                ),
-            )
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO todo (content, start_time, end_time, status, urgency, assignee, reason, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        content,
+                        start_time or datetime.now(),
+                        end_time,
+                        status,
+                        urgency,
+                        assignee,
+                        reason,
+                        datetime.now(),
+                    ),
+                )
 
-            todo_id = cursor.lastrowid
-            self.connection.commit()
+                todo_id = cursor.lastrowid
             logger.info(f"Todo item inserted, ID: {todo_id}")
             return todo_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert todo item: {e}")
             raise
 
@@ -677,7 +1009,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         """Get todo item list"""
         if not self._initialized:
             return []
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             where_conditions = []
             params = []
@@ -714,24 +1046,23 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
-            if status == 1 and end_time is None:
-                end_time = datetime.now()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                if status == 1 and end_time is None:
+                    end_time = datetime.now()
 
-            cursor.execute(
-                """
-                UPDATE todo SET status = ?, end_time = ?
-                WHERE id = ?
-            """,
-                (status, end_time, todo_id),
-            )
+                cursor.execute(
+                    """
+                    UPDATE todo SET status = ?, end_time = ?
+                    WHERE id = ?
+                """,
+                    (status, end_time, todo_id),
+                )
 
-            success = cursor.rowcount > 0
-            self.connection.commit()
+                success = cursor.rowcount > 0
             return success
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update todo item status: {e}")
             return False
 
@@ -761,29 +1092,28 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                """
-                INSERT INTO activity (title, content, resources, metadata, start_time, end_time)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    title,
-                    content,
-                    resources,
-                    metadata,
-                    start_time or datetime.now(),
-                    end_time or datetime.now(),
-                ),
-            )
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO activity (title, content, resources, metadata, start_time, end_time)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        title,
+                        content,
+                        resources,
+                        metadata,
+                        start_time or datetime.now(),
+                        end_time or datetime.now(),
+                    ),
+                )
 
-            activity_id = cursor.lastrowid
-            self.connection.commit()
+                activity_id = cursor.lastrowid
             logger.info(f"Activity record inserted, ID: {activity_id}")
             return activity_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert activity record: {e}")
             raise
 
@@ -798,7 +1128,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             where_conditions = []
             params = []
@@ -837,22 +1167,21 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                """
-                INSERT INTO tips (content, created_at)
-                VALUES (?, ?)
-            """,
-                (content, datetime.now()),
-            )
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO tips (content, created_at)
+                    VALUES (?, ?)
+                """,
+                    (content, datetime.now()),
+                )
 
-            tip_id = cursor.lastrowid
-            self.connection.commit()
+                tip_id = cursor.lastrowid
             logger.info(f"Tip inserted, ID: {tip_id}")
             return tip_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to insert tip: {e}")
             raise
 
@@ -867,7 +1196,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             where_conditions = []
             params = []
@@ -900,6 +1229,12 @@ class SQLiteBackend(IDocumentStorageBackend):
             logger.exception(f"Failed to get tip list: {e}")
             return []
 
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get connection pool and write queue state"""
+        if not self._pool:
+            return {}
+        return self._pool.get_stats()
+
     def get_name(self) -> str:
         return "sqlite"
 
@@ -915,44 +1250,38 @@ class SQLiteBackend(IDocumentStorageBackend):
             return False
 
         try:
-            cursor = self.connection.cursor()
-
-            # Calculate time bucket (hour precision)
-            now = datetime.now()
-            time_bucket = now.strftime("%Y-%m-%d %H:00:00")
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                # Calculate time bucket (hour precision)
+                now = datetime.now()
+                time_bucket = now.strftime("%Y-%m-%d %H:00:00")
 
-            # Use INSERT ... ON CONFLICT to update or insert
-            cursor.execute(
-                """
-                INSERT INTO monitoring_token_usage (time_bucket, model, prompt_tokens, completion_tokens, total_tokens, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(time_bucket, model)
-                DO UPDATE SET
-                    prompt_tokens = prompt_tokens + ?,
-                    completion_tokens = completion_tokens + ?,
-                    total_tokens = total_tokens + ?
-                """,
-                (
-                    time_bucket,
-                    model,
-                    prompt_tokens,
-                    completion_tokens,
-                    total_tokens,
-                    now,
-                    prompt_tokens,
-                    completion_tokens,
-                    total_tokens,
-                ),
-            )
-
-            self.connection.commit()
+                # Use INSERT ... ON CONFLICT to update or insert
+                cursor.execute(
+                    """
+                    INSERT INTO monitoring_token_usage (time_bucket, model, prompt_tokens, completion_tokens, total_tokens, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(time_bucket, model)
+                    DO UPDATE SET
+                        prompt_tokens = prompt_tokens + ?,
+                        completion_tokens = completion_tokens + ?,
+                        total_tokens = total_tokens + ?
+                    """,
+                    (
+                        time_bucket,
+                        model,
+                        prompt_tokens,
+                        completion_tokens,
+                        total_tokens,
+                        now,
+                        prompt_tokens,
+                        completion_tokens,
+                        total_tokens,
+                    ),
+                )
             return True
         except Exception as e:
             logger.error(f"Failed to save token usage: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
             return False
 
     def save_monitoring_stage_timing(
@@ -967,88 +1296,82 @@ class SQLiteBackend(IDocumentStorageBackend):
             return False
 
         try:
-            cursor = self.connection.cursor()
-
-            # Calculate time bucket (hour precision)
-            now = datetime.now()
-            time_bucket = now.strftime("%Y-%m-%d %H:00:00")
-
-            # First, get existing stats if any
-            cursor.execute(
-                """
-                SELECT count, total_duration_ms, min_duration_ms, max_duration_ms, success_count, error_count
-                FROM monitoring_stage_timing
-                WHERE time_bucket = ? AND stage_name = ?
-                """,
-                (time_bucket, stage_name),
-            )
-            existing = cursor.fetchone()
-
-            if existing:
-                # Update existing record with aggregated stats
-                old_count, old_total, old_min, old_max, old_success, old_error = existing
-                new_count = old_count + 1
-                new_total = old_total + duration_ms
-                new_min = min(old_min, duration_ms)
-                new_max = max(old_max, duration_ms)
-                new_avg = new_total // new_count
-                new_success = old_success + (1 if status == "success" else 0)
-                new_error = old_error + (0 if status == "success" else 1)
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                # Calculate time bucket (hour precision)
+                now = datetime.now()
+                time_bucket = now.strftime("%Y-%m-%d %H:00:00")
 
+                # First, get existing stats if any
                 cursor.execute(
                     """
-                    UPDATE monitoring_stage_timing
-                    SET count = ?,
-                        total_duration_ms = ?,
-                        min_duration_ms = ?,
-                        max_duration_ms = ?,
-                        avg_duration_ms = ?,
-                        success_count = ?,
-                        error_count = ?
+                    SELECT count, total_duration_ms, min_duration_ms, max_duration_ms, success_count, error_count
+                    FROM monitoring_stage_timing
                     WHERE time_bucket = ? AND stage_name = ?
                     """,
-                    (
-                        new_count,
-                        new_total,
-                        new_min,
-                        new_max,
-                        new_avg,
-                        new_success,
-                        new_error,
-                        time_bucket,
-                        stage_name,
-                    ),
-                )
-            else:
-                # Insert new record
-                cursor.execute(
-                    """
-                    INSERT INTO monitoring_stage_timing
-                    (time_bucket, stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, metadata, created_at)
-                    VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        time_bucket,
-                        stage_name,
-                        duration_ms,
-                        duration_ms,
-                        duration_ms,
-                        duration_ms,
-                        1 if status == "success" else 0,
-                        0 if status == "success" else 1,
-                        metadata,
-                        now,
-                    ),
+                    (time_bucket, stage_name),
                 )
-
-            self.connection.commit()
+                existing = cursor.fetchone()
+
+                if existing:
+                    # Update existing record with aggregated stats
+                    old_count, old_total, old_min, old_max, old_success, old_error = existing
+                    new_count = old_count + 1
+                    new_total = old_total + duration_ms
+                    new_min = min(old_min, duration_ms)
+                    new_max = max(old_max, duration_ms)
+                    new_avg = new_total // new_count
+                    new_success = old_success + (1 if status == "success" else 0)
+                    new_error = old_error + (0 if status == "success" else 1)
+
+                    cursor.execute(
+                        """
+                        UPDATE monitoring_stage_timing
+                        SET count = ?,
+                            total_duration_ms = ?,
+                            min_duration_ms = ?,
+                            max_duration_ms = ?,
+                            avg_duration_ms = ?,
+                            success_count = ?,
+                            error_count = ?
+                        WHERE time_bucket = ? AND stage_name = ?
+                        """,
+                        (
+                            new_count,
+                            new_total,
+                            new_min,
+                            new_max,
+                            new_avg,
+                            new_success,
+                            new_error,
+                            time_bucket,
+                            stage_name,
+                        ),
+                    )
+                else:
+                    # Insert new record
+                    cursor.execute(
+                        """
+                        INSERT INTO monitoring_stage_timing
+                        (time_bucket, stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, metadata, created_at)
+                        VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (
+                            time_bucket,
+                            stage_name,
+                            duration_ms,
+                            duration_ms,
+                            duration_ms,
+                            duration_ms,
+                            1 if status == "success" else 0,
+                            0 if status == "success" else 1,
+                            metadata,
+                            now,
+                        ),
+                    )
             return True
         except Exception as e:
             logger.error(f"Failed to save stage timing: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
             return False
 
     def save_monitoring_data_stats(
@@ -1063,32 +1386,129 @@ class SQLiteBackend(IDocumentStorageBackend):
             return False
 
         try:
-            cursor = self.connection.cursor()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                # Calculate time bucket (hour precision)
+                now = datetime.now()
+                time_bucket = now.strftime("%Y-%m-%d %H:00:00")
+
+                # Use INSERT ... ON CONFLICT to update or insert
+                # First, try to get existing count
+                cursor.execute(
+                    """
+                    INSERT INTO monitoring_data_stats (time_bucket, data_type, count, context_type, metadata, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(time_bucket, data_type, context_type)
+                    DO UPDATE SET count = count + ?
+                    """,
+                    (time_bucket, data_type, count, context_type, metadata, now, count),
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save data stats: {e}")
+            return False
+
+    def save_monitoring_batch(
+        self,
+        token_usage: List[Dict[str, Any]],
+        stage_timing: List[Dict[str, Any]],
+        data_stats: List[Dict[str, Any]],
+    ) -> bool:
+        """
+        Save pre-aggregated monitoring data in one transaction.
+        Each row carries the counters accumulated for one hour bucket and is merged
+        into the stored bucket with INSERT ... ON CONFLICT DO UPDATE.
+        """
+        if not self._initialized:
+            return False
+        if not (token_usage or stage_timing or data_stats):
+            return True
 
-            # Calculate time bucket (hour precision)
+        try:
             now = datetime.now()
-            time_bucket = now.strftime("%Y-%m-%d %H:00:00")
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                if token_usage:
+                    cursor.executemany(
+                        """
+                        INSERT INTO monitoring_token_usage (time_bucket, model, prompt_tokens, completion_tokens, total_tokens, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(time_bucket, model)
+                        DO UPDATE SET
+                            prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                            completion_tokens = completion_tokens + excluded.completion_tokens,
+                            total_tokens = total_tokens + excluded.total_tokens
+                        """,
+                        [
+                            (
+                                row["time_bucket"],
+                                row["model"],
+                                row["prompt_tokens"],
+                                row["completion_tokens"],
+                                row["total_tokens"],
+                                now,
+                            )
+                            for row in token_usage
+                        ],
+                    )
 
-            # Use INSERT ... ON CONFLICT to update or insert
-            # First, try to get existing count
-            cursor.execute(
-                """
-                INSERT INTO monitoring_data_stats (time_bucket, data_type, count, context_type, metadata, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(time_bucket, data_type, context_type)
-                DO UPDATE SET count = count + ?
-                """,
-                (time_bucket, data_type, count, context_type, metadata, now, count),
-            )
+                if stage_timing:
+                    cursor.executemany(
+                        """
+                        INSERT INTO monitoring_stage_timing
+                        (time_bucket, stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, metadata, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(time_bucket, stage_name)
+                        DO UPDATE SET
+                            count = count + excluded.count,
+                            total_duration_ms = total_duration_ms + excluded.total_duration_ms,
+                            min_duration_ms = MIN(min_duration_ms, excluded.min_duration_ms),
+                            max_duration_ms = MAX(max_duration_ms, excluded.max_duration_ms),
+                            avg_duration_ms = (total_duration_ms + excluded.total_duration_ms) / (count + excluded.count),
+                            success_count = success_count + excluded.success_count,
+                            error_count = error_count + excluded.error_count
+                        """,
+                        [
+                            (
+                                row["time_bucket"],
+                                row["stage_name"],
+                                row["count"],
+                                row["total_duration_ms"],
+                                row["min_duration_ms"],
+                                row["max_duration_ms"],
+                                row["total_duration_ms"] // row["count"],
+                                row["success_count"],
+                                row["error_count"],
+                                row["metadata"],
+                                now,
+                            )
+                            for row in stage_timing
+                        ],
+                    )
 
-            self.connection.commit()
+                if data_stats:
+                    cursor.executemany(
+                        """
+                        INSERT INTO monitoring_data_stats (time_bucket, data_type, count, context_type, metadata, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(time_bucket, data_type, context_type)
+                        DO UPDATE SET count = count + excluded.count
+                        """,
+                        [
+                            (
+                                row["time_bucket"],
+                                row["data_type"],
+                                row["count"],
+                                row["context_type"],
+                                row["metadata"],
+                                now,
+                            )
+                            for row in data_stats
+                        ],
+                    )
             return True
         except Exception as e:
-            logger.error(f"Failed to save data stats: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
+            logger.error(f"Failed to save monitoring batch: {e}")
             return False
 
     def query_monitoring_token_usage(self, hours: int = 24) -> List[Dict[str, Any]]:
@@ -1099,7 +1519,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
+            cursor = self._pool.reader().cursor()
             cursor.execute(
                 """
                 SELECT model, prompt_tokens, completion_tokens, total_tokens, time_bucket
@@ -1132,7 +1552,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
+            cursor = self._pool.reader().cursor()
             cursor.execute(
                 """
                 SELECT stage_name, count, total_duration_ms, min_duration_ms, max_duration_ms, avg_duration_ms, success_count, error_count, time_bucket
@@ -1171,7 +1591,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
+            cursor = self._pool.reader().cursor()
             cursor.execute(
                 """
                 SELECT data_type, SUM(count) as total_count, context_type
@@ -1212,7 +1632,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
+            cursor = self._pool.reader().cursor()
 
             # Query using time_bucket directly (already hourly grouped)
             cursor.execute(
@@ -1251,35 +1671,29 @@ class SQLiteBackend(IDocumentStorageBackend):
         try:
             cutoff_time = datetime.now() - timedelta(days=days)
             cutoff_bucket = cutoff_time.strftime("%Y-%m-%d %H:00:00")
-            cursor = self.connection.cursor()
-
-            # Clean up token usage data (use time_bucket)
-            cursor.execute(
-                "DELETE FROM monitoring_token_usage WHERE time_bucket < ?",
-                (cutoff_bucket,),
-            )
-
-            # Clean up stage timing data (use time_bucket)
-            cursor.execute(
-                "DELETE FROM monitoring_stage_timing WHERE time_bucket < ?",
-                (cutoff_bucket,),
-            )
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                # Clean up token usage data (use time_bucket)
+                cursor.execute(
+                    "DELETE FROM monitoring_token_usage WHERE time_bucket < ?",
+                    (cutoff_bucket,),
+                )
 
-            # Clean up data stats (use time_bucket)
-            cursor.execute(
-                "DELETE FROM monitoring_data_stats WHERE time_bucket < ?",
-                (cutoff_bucket,),
-            )
+                # Clean up stage timing data (use time_bucket)
+                cursor.execute(
+                    "DELETE FROM monitoring_stage_timing WHERE time_bucket < ?",
+                    (cutoff_bucket,),
+                )
 
-            self.connection.commit()
+                # Clean up data stats (use time_bucket)
+                cursor.execute(
+                    "DELETE FROM monitoring_data_stats WHERE time_bucket < ?",
+                    (cutoff_bucket,),
+                )
             logger.info(f"Cleaned up monitoring data older than {days} days")
             return True
         except Exception as e:
             logger.error(f"Failed to cleanup old monitoring data: {e}")
-            try:
-                self.connection.rollback()
-            except:
-                pass
             return False
 
     # Conversation/Message operations
@@ -1296,25 +1710,24 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
         try:
-            now = datetime.now()
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
+                meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
 
-            cursor.execute(
-                """
-                INSERT INTO conversations (page_name, user_id, title, metadata, status, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (page_name, user_id, title, meta_str, "active", now, now),
-            )
+                cursor.execute(
+                    """
+                    INSERT INTO conversations (page_name, user_id, title, metadata, status, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (page_name, user_id, title, meta_str, "active", now, now),
+                )
 
-            conversation_id = cursor.lastrowid
-            self.connection.commit()
+                conversation_id = cursor.lastrowid
             logger.info(f"Conversation created, ID: {conversation_id}")
             return self.get_conversation(conversation_id)
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to create conversation: {e}")
             return None
 
@@ -1325,7 +1738,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             cursor.execute(
                 """
@@ -1358,7 +1771,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return {"items": [], "total": 0}
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             where_clauses = []
             params = []
@@ -1421,31 +1834,30 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
         try:
-            set_clauses = []
-            params = []
-
-            if title is not None:
-                set_clauses.append("title = ?")
-                params.append(title)
-            if status is not None:
-                # Handle typo in spec 'delected' -> 'deleted'
-                set_clauses.append("status = ?")
-                params.append("deleted" if status == "delected" else status)
-
-            if not set_clauses:
-                # No change, return current
-                return self.get_conversation(conversation_id)
-
-            set_clauses.append("updated_at = ?")
-            params.append(datetime.now())
-            params.append(conversation_id)
-
-            sql = f"UPDATE conversations SET {', '.join(set_clauses)} WHERE id = ?"
-            cursor.execute(sql, params)
-
-            self.connection.commit()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                set_clauses = []
+                params = []
+
+                if title is not None:
+                    set_clauses.append("title = ?")
+                    params.append(title)
+                if status is not None:
+                    # Handle typo in spec 'delected' -> 'deleted'
+                    set_clauses.append("status = ?")
+                    params.append("deleted" if status == "delected" else status)
+
+                if not set_clauses:
+                    # No change, return current
+                    return self.get_conversation(conversation_id)
+
+                set_clauses.append("updated_at = ?")
+                params.append(datetime.now())
+                params.append(conversation_id)
+
+                sql = f"UPDATE conversations SET {', '.join(set_clauses)} WHERE id = ?"
+                cursor.execute(sql, params)
 
             if cursor.rowcount > 0:
                 logger.info(f"Conversation {conversation_id} updated.")
@@ -1455,7 +1867,6 @@ class SQLiteBackend(IDocumentStorageBackend):
                     f"Failed to update conversation {conversation_id}, row not found or no change.")
                 return None
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update conversation: {e}")
             return None
 
@@ -1488,7 +1899,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             cursor.execute(
                 """
@@ -1526,46 +1937,44 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             raise RuntimeError("SQLite backend not initialized")
 
-        cursor = self.connection.cursor()
         try:
-            now = datetime.now()
-            # Map is_complete to status and completed_at
-            status = "completed" if is_complete else "streaming"
-            completed_at = now if is_complete else None
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
-
-            cursor.execute(
-                """
-                INSERT INTO messages (conversation_id, role, content, status, token_count,
-                                      parent_message_id, metadata, completed_at, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    conversation_id,
-                    role,
-                    content,
-                    status,
-                    token_count,
-                    parent_message_id,
-                    meta_str,
-                    completed_at,
-                    now,
-                    now,
-                ),
-            )
-            message_id = cursor.lastrowid
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
+                # Map is_complete to status and completed_at
+                status = "completed" if is_complete else "streaming"
+                completed_at = now if is_complete else None
+                meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
 
-            # Update conversation's updated_at timestamp
-            cursor.execute(
-                "UPDATE conversations SET updated_at = ? WHERE id = ?",
-                (now, conversation_id),
-            )
+                cursor.execute(
+                    """
+                    INSERT INTO messages (conversation_id, role, content, status, token_count,
+                                          parent_message_id, metadata, completed_at, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        conversation_id,
+                        role,
+                        content,
+                        status,
+                        token_count,
+                        parent_message_id,
+                        meta_str,
+                        completed_at,
+                        now,
+                        now,
+                    ),
+                )
+                message_id = cursor.lastrowid
 
-            self.connection.commit()
+                # Update conversation's updated_at timestamp
+                cursor.execute(
+                    "UPDATE conversations SET updated_at = ? WHERE id = ?",
+                    (now, conversation_id),
+                )
             logger.info(f"Message created, ID: {message_id}")
             return self.get_message(message_id)  # Return the created message
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to create message: {e}")
             return None
 
@@ -1603,41 +2012,40 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return None
 
-        cursor = self.connection.cursor()
         try:
-            now = datetime.now()
-            set_clauses = ["content = ?", "updated_at = ?"]
-            params = [new_content, now]
-
-            if token_count is not None:
-                set_clauses.append("token_count = ?")
-                params.append(token_count)
-
-            if is_complete is True:
-                set_clauses.append("status = ?")
-                params.append("completed")
-                set_clauses.append("completed_at = ?")
-                params.append(now)
-            elif is_complete is False:
-                set_clauses.append("status = ?")
-                params.append("streaming")  # Assume if update, it's streaming
-                set_clauses.append("completed_at = NULL")
-
-            params.append(message_id)
-
-            sql = f"UPDATE messages SET {', '.join(set_clauses)} WHERE id = ?"
-            cursor.execute(sql, params)
-
-            # Update conversation's updated_at
-            cursor.execute(
-                """
-                UPDATE conversations SET updated_at = ?
-                WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
-                """,
-                (now, message_id),
-            )
-
-            self.connection.commit()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
+                set_clauses = ["content = ?", "updated_at = ?"]
+                params = [new_content, now]
+
+                if token_count is not None:
+                    set_clauses.append("token_count = ?")
+                    params.append(token_count)
+
+                if is_complete is True:
+                    set_clauses.append("status = ?")
+                    params.append("completed")
+                    set_clauses.append("completed_at = ?")
+                    params.append(now)
+                elif is_complete is False:
+                    set_clauses.append("status = ?")
+                    params.append("streaming")  # Assume if update, it's streaming
+                    set_clauses.append("completed_at = NULL")
+
+                params.append(message_id)
+
+                sql = f"UPDATE messages SET {', '.join(set_clauses)} WHERE id = ?"
+                cursor.execute(sql, params)
+
+                # Update conversation's updated_at
+                cursor.execute(
+                    """
+                    UPDATE conversations SET updated_at = ?
+                    WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
+                    """,
+                    (now, message_id),
+                )
 
             if cursor.rowcount > 0:
                 return self.get_message(message_id)
@@ -1646,7 +2054,6 @@ class SQLiteBackend(IDocumentStorageBackend):
                     f"Failed to update message {message_id}, not found.")
                 return None
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update message: {e}")
             return None
 
@@ -1662,45 +2069,118 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
-            now = datetime.now()
-
-            # Use SQLite string concatenation ||
-            # Also update status to 'streaming' if it was 'pending'
-            cursor.execute(
-                """
-                UPDATE messages
-                SET content = content || ?,
-                    token_count = token_count + ?,
-                    status = CASE WHEN status = 'pending' THEN 'streaming' ELSE status END,
-                    updated_at = ?
-                WHERE id = ?
-                """,
-                (content_chunk, token_count, now, message_id),
-            )
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
 
-            if cursor.rowcount == 0:
-                logger.warning(
-                    f"Failed to append message {message_id}, not found.")
-                return False
+                # Use SQLite string concatenation ||
+                # Also update status to 'streaming' if it was 'pending'
+                cursor.execute(
+                    """
+                    UPDATE messages
+                    SET content = content || ?,
+                        token_count = token_count + ?,
+                        status = CASE WHEN status = 'pending' THEN 'streaming' ELSE status END,
+                        updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (content_chunk, token_count, now, message_id),
+                )
 
-            # Update conversation's updated_at
-            cursor.execute(
-                """
-                UPDATE conversations SET updated_at = ?
-                WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
-                """,
-                (now, message_id),
-            )
+                if cursor.rowcount == 0:
+                    logger.warning(
+                        f"Failed to append message {message_id}, not found.")
+                    return False
 
-            self.connection.commit()
+                # Update conversation's updated_at
+                cursor.execute(
+                    """
+                    UPDATE conversations SET updated_at = ?
+                    WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
+                    """,
+                    (now, message_id),
+                )
             return True
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to append message content: {e}")
             return False
 
+    def append_message_stream(
+        self,
+        message_id: int,
+        content_chunk: str = "",
+        token_count: int = 0,
+        thinking: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """
+        Write a buffered slice of a streaming message in one transaction: appended
+        content, thinking records (stage, progress, metadata) and the conversation's
+        updated_at.
+        """
+        if not self._initialized:
+            return False
+
+        try:
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
+
+                if content_chunk or token_count:
+                    cursor.execute(
+                        """
+                        UPDATE messages
+                        SET content = content || ?,
+                            token_count = token_count + ?,
+                            status = CASE WHEN status = 'pending' THEN 'streaming' ELSE status END,
+                            updated_at = ?
+                        WHERE id = ?
+                        """,
+                        (content_chunk, token_count, now, message_id),
+                    )
+                    if cursor.rowcount == 0:
+                        logger.warning(
+                            f"Failed to append message {message_id}, not found.")
+                        return False
+
+                if thinking:
+                    cursor.execute(
+                        "SELECT COALESCE(MAX(sequence), -1) + 1 FROM message_thinking WHERE message_id = ?",
+                        (message_id,)
+                    )
+                    sequence = cursor.fetchone()[0]
+                    cursor.executemany(
+                        """
+                        INSERT INTO message_thinking
+                        (message_id, content, stage, progress, sequence, metadata)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        [
+                            (
+                                message_id,
+                                record.get("content", ""),
+                                record.get("stage"),
+                                record.get("progress") or 0.0,
+                                sequence + offset,
+                                json.dumps(record.get("metadata"), ensure_ascii=False)
+                                if record.get("metadata") else "{}",
+                            )
+                            for offset, record in enumerate(thinking)
+                        ],
+                    )
+
+                cursor.execute(
+                    """
+                    UPDATE conversations SET updated_at = ?
+                    WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
+                    """,
+                    (now, message_id),
+                )
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to append message stream: {e}")
+            return False
+
     def update_message_metadata(
         self,
         message_id: int,
@@ -1712,25 +2192,24 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
-            now = datetime.now()
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
+                meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
 
-            cursor.execute(
-                """
-                UPDATE messages
-                SET metadata = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (meta_str, now, message_id),
-            )
+                cursor.execute(
+                    """
+                    UPDATE messages
+                    SET metadata = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (meta_str, now, message_id),
+                )
 
-            success = cursor.rowcount > 0
-            self.connection.commit()
+                success = cursor.rowcount > 0
             return success
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to update message metadata: {e}")
             return False
 
@@ -1749,53 +2228,51 @@ class SQLiteBackend(IDocumentStorageBackend):
         if status not in ["completed", "failed", "cancelled"]:
             status = "completed"  # Default to completed
 
-        cursor = self.connection.cursor()
         try:
-            now = datetime.now()
-
-            set_clauses = ["status = ?", "completed_at = ?", "updated_at = ?"]
-            params = [status, now, now]
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
 
-            if error_message:
-                set_clauses.append("error_message = ?")
-                params.append(error_message)
+                set_clauses = ["status = ?", "completed_at = ?", "updated_at = ?"]
+                params = [status, now, now]
 
-            params.append(message_id)
-            # Only update if not already in that state
-            set_clauses.append("status != ?")
-            params.append(status)
+                if error_message:
+                    set_clauses.append("error_message = ?")
+                    params.append(error_message)
 
-            sql = f"UPDATE messages SET {', '.join(set_clauses)} WHERE id = ? AND {set_clauses[-1]}"
-            # Remove the last part from sql
-            sql = f"UPDATE messages SET {', '.join(set_clauses[:-1])} WHERE id = ? AND {set_clauses[-1]}"
-
-            cursor.execute(sql, params)
+                params.append(message_id)
+                # Only update if not already in that state
+                set_clauses.append("status != ?")
+                params.append(status)
 
-            success = cursor.rowcount > 0
-            if not success:
-                # Check if it failed because it was already in the desired state
+                sql = f"UPDATE messages SET {', '.join(set_clauses)} WHERE id = ? AND {set_clauses[-1]}"
+                # Remove the last part from sql
+                sql = f"UPDATE messages SET {', '.join(set_clauses[:-1])} WHERE id = ? AND {set_clauses[-1]}"
+
+                cursor.execute(sql, params)
+
+                success = cursor.rowcount > 0
+                if not success:
+                    # Check if it failed because it was already in the desired state
+                    cursor.execute(
+                        "SELECT status FROM messages WHERE id = ?", (message_id,))
+                    row = cursor.fetchone()
+                    if row and row[0] == status:
+                        success = True  # Already done, count as success
+                    else:
+                        logger.warning(
+                            f"Failed to mark message {message_id} as {status}, not found or no change.")
+
+                # Update conversation's updated_at
                 cursor.execute(
-                    "SELECT status FROM messages WHERE id = ?", (message_id,))
-                row = cursor.fetchone()
-                if row and row[0] == status:
-                    success = True  # Already done, count as success
-                else:
-                    logger.warning(
-                        f"Failed to mark message {message_id} as {status}, not found or no change.")
-
-            # Update conversation's updated_at
-            cursor.execute(
-                """
-                UPDATE conversations SET updated_at = ?
-                WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
-                """,
-                (now, message_id),
-            )
-
-            self.connection.commit()
+                    """
+                    UPDATE conversations SET updated_at = ?
+                    WHERE id = (SELECT conversation_id FROM messages WHERE id = ?)
+                    """,
+                    (now, message_id),
+                )
             return success
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to mark message {status}: {e}")
             return False
 
@@ -1817,7 +2294,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             cursor.execute(
                 """
@@ -1854,16 +2331,15 @@ class SQLiteBackend(IDocumentStorageBackend):
             logger.warning("Storage not initialized")
             return False
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                "DELETE FROM messages WHERE id = ?",
-                (message_id,)
-            )
-            self.connection.commit()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM messages WHERE id = ?",
+                    (message_id,)
+                )
             return cursor.rowcount > 0
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to delete message {message_id}: {e}")
             return False
 
@@ -1896,32 +2372,31 @@ class SQLiteBackend(IDocumentStorageBackend):
             logger.warning("Storage not initialized")
             return None
 
-        cursor = self.connection.cursor()
         try:
-            # Auto-increment sequence if not provided
-            if sequence is None:
-                cursor.execute(
-                    "SELECT COALESCE(MAX(sequence), -1) + 1 FROM message_thinking WHERE message_id = ?",
-                    (message_id,)
-                )
-                sequence = cursor.fetchone()[0]
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                # Auto-increment sequence if not provided
+                if sequence is None:
+                    cursor.execute(
+                        "SELECT COALESCE(MAX(sequence), -1) + 1 FROM message_thinking WHERE message_id = ?",
+                        (message_id,)
+                    )
+                    sequence = cursor.fetchone()[0]
 
-            meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+                meta_str = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
 
-            cursor.execute(
-                """
-                INSERT INTO message_thinking
-                (message_id, content, stage, progress, sequence, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (message_id, content, stage, progress, sequence, meta_str),
-            )
-            thinking_id = cursor.lastrowid
-            self.connection.commit()
+                cursor.execute(
+                    """
+                    INSERT INTO message_thinking
+                    (message_id, content, stage, progress, sequence, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (message_id, content, stage, progress, sequence, meta_str),
+                )
+                thinking_id = cursor.lastrowid
             logger.debug(f"Added thinking record {thinking_id} to message {message_id}")
             return thinking_id
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to add thinking to message {message_id}: {e}")
             return None
 
@@ -1938,7 +2413,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return []
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
         try:
             cursor.execute(
                 """
@@ -1968,16 +2443,15 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return False
 
-        cursor = self.connection.cursor()
         try:
-            cursor.execute(
-                "DELETE FROM message_thinking WHERE message_id = ?",
-                (message_id,)
-            )
-            self.connection.commit()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM message_thinking WHERE message_id = ?",
+                    (message_id,)
+                )
             return True
         except Exception as e:
-            self.connection.rollback()
             logger.exception(f"Failed to clear thinking for message {message_id}: {e}")
             return False
 
@@ -1988,7 +2462,7 @@ class SQLiteBackend(IDocumentStorageBackend):
         if not self._initialized:
             return QueryResult(documents=[], total_count=0)
 
-        cursor = self.connection.cursor()
+        cursor = self._pool.reader().cursor()
 
         try:
             # Build query conditions
@@ -2091,9 +2565,9 @@ class SQLiteBackend(IDocumentStorageBackend):
             return QueryResult(documents=[], total_count=0)
 
     def close(self):
-        """Close the database connection"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Close the database connections"""
+        if self._pool:
+            self._pool.close()
+            self._pool = None
             self._initialized = False
             logger.info("SQLite database connection closed")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SQLite connection layer - WAL mode, per-thread reader connections and a single
+queued writer connection
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from opencontext.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Applied to every connection; journal_mode is persistent and only set by the writer
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,  # Negative values are KiB, i.e. 64 MiB per connection
+    "mmap_size": 268435456,  # 256 MiB
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+class SQLiteConnectionPool:
+    """
+    Connection layer for one SQLite database file.
+
+    Readers get a connection per thread, so concurrent reads never share a cursor
+    and, under WAL, never wait for the writer. All writes go through one dedicated
+    writer connection: callers queue in FIFO order for it inside `write()`, which
+    wraps the block in a single IMMEDIATE transaction. Time spent waiting in the
+    queue and holding the writer is reported to the monitor.
+    """
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None):
+        self.db_path = db_path
+        self._pragmas = dict(DEFAULT_PRAGMAS)
+        self._pragmas.update(pragmas or {})
+
+        self._local = threading.local()
+        self._readers: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+
+        # Autocommit mode, transactions are managed explicitly by write()
+        self._writer = self._connect(isolation_level=None)
+        journal_mode = self._writer.execute(
+            f"PRAGMA journal_mode={self._pragmas['journal_mode']}"
+        ).fetchone()[0]
+        if str(journal_mode).lower() != str(self._pragmas["journal_mode"]).lower():
+            logger.warning(f"SQLite journal mode is {journal_mode}, WAL could not be enabled")
+
+        # FIFO write queue: each writer takes a ticket and waits for its turn
+        self._write_cond = threading.Condition()
+        self._write_queue: deque = deque()
+        self._write_owner: Optional[int] = None
+        self._write_depth = 0
+        self._closed = False
+
+    def _connect(self, isolation_level: Optional[str] = "") -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=isolation_level
+        )
+        conn.row_factory = sqlite3.Row  # Allow column name access
+        for name, value in self._pragmas.items():
+            if name != "journal_mode":
+                conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read connection"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("SQLite connection pool is closed")
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            conn = self._connect()
+            # Catch accidental writes on the read path
+            conn.execute("PRAGMA query_only=ON")
+            self._local.reader = conn
+            with self._readers_lock:
+                self._prune_readers()
+                self._readers[threading.current_thread()] = conn
+        return conn
+
+    def _prune_readers(self):
+        """Close connections left behind by finished threads (caller holds the lock)"""
+        for thread in [t for t in self._readers if not t.is_alive()]:
+            try:
+                self._readers.pop(thread).close()
+            except sqlite3.Error:
+                pass
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run the block as one write transaction on the writer connection.
+        Commits on success and rolls back on error. Nested calls on the same thread
+        join the outer transaction.
+        """
+        thread_id = threading.get_ident()
+        if self._write_owner == thread_id:
+            self._write_depth += 1
+            try:
+                yield self._writer
+            finally:
+                self._write_depth -= 1
+            return
+
+        wait_ms, queue_depth = self._acquire_writer(thread_id)
+        start = time.perf_counter()
+        busy = False
+        try:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+                self._writer.execute("COMMIT")
+            except BaseException:
+                if self._writer.in_transaction:
+                    self._writer.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as e:
+            busy = "locked" in str(e) or "busy" in str(e)
+            raise
+        finally:
+            hold_ms = (time.perf_counter() - start) * 1000
+            self._release_writer()
+            _record_write(wait_ms, hold_ms, queue_depth, busy)
+
+    def _acquire_writer(self, thread_id: int):
+        start = time.perf_counter()
+        with self._write_cond:
+            if self._closed:
+                raise sqlite3.ProgrammingError("SQLite connection pool is closed")
+            ticket = object()
+            self._write_queue.append(ticket)
+            # Writers ahead of this one, including the current owner
+            queue_depth = len(self._write_queue) - 1 + (self._write_owner is not None)
+            while self._write_owner is not None or self._write_queue[0] is not ticket:
+                self._write_cond.wait()
+            self._write_queue.popleft()
+            self._write_owner = thread_id
+            self._write_depth = 1
+        return (time.perf_counter() - start) * 1000, queue_depth
+
+    def _release_writer(self):
+        with self._write_cond:
+            self._write_owner = None
+            self._write_depth = 0
+            self._write_cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return current connection and queue state"""
+        with self._readers_lock:
+            reader_connections = len(self._readers)
+        with self._write_cond:
+            queued_writers = len(self._write_queue)
+            writer_busy = self._write_owner is not None
+        return {
+            "db_path": self.db_path,
+            "journal_mode": self._pragmas["journal_mode"],
+            "reader_connections": reader_connections,
+            "queued_writers": queued_writers,
+            "writer_busy": writer_busy,
+        }
+
+    def close(self):
+        """Close the writer and all reader connections"""
+        with self._write_cond:
+            while self._write_owner is not None:
+                self._write_cond.wait()
+            self._closed = True
+            try:
+                self._writer.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close SQLite writer connection: {e}")
+        with self._readers_lock:
+            for conn in self._readers.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._readers.clear()
+
+
+def _record_write(wait_ms: float, hold_ms: float, queue_depth: int, busy: bool):
+    try:
+        from opencontext.monitoring import record_sqlite_write
+
+        record_sqlite_write(wait_ms, hold_ms, queue_depth, busy)
+    except Exception:
+        pass  # Monitoring is best effort
@@ -13,7 +13,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from opencontext.models.context import ProcessedContext, Vectorize
 
@@ -110,6 +110,28 @@ class IVectorStorageBackend(IStorageBackend):
     ) -> Dict[str, List[ProcessedContext]]:
         """Get processed contexts"""
 
+    @abstractmethod
+    def iter_processed_contexts(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+        lazy: bool = False,
+    ) -> Iterator[ProcessedContext]:
+        """Iterate over all contexts of a type, fetched page by page"""
+
+    @abstractmethod
+    def iter_processed_context_pages(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+        lazy: bool = False,
+    ) -> Iterator[List[ProcessedContext]]:
+        """Iterate over all contexts of a type in pages"""
+
     @abstractmethod
     def get_processed_context(self, id: str, context_type: str) -> ProcessedContext:
         """Get specified context"""
@@ -128,6 +150,17 @@ class IVectorStorageBackend(IStorageBackend):
     ) -> List[Tuple[ProcessedContext, float]]:
         """Vector similarity search"""
 
+    @abstractmethod
+    def batch_search(
+        self,
+        queries: List[Vectorize],
+        top_k: int = 10,
+        context_types: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        need_vector: bool = False,
+    ) -> List[List[Tuple[ProcessedContext, float]]]:
+        """Vector similarity search for several queries, one result list per query"""
+
     @abstractmethod
     def upsert_todo_embedding(
         self,
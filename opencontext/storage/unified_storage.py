@@ -8,8 +8,10 @@
 Unified storage system - unified management supporting multiple storage backends
 """
 
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from opencontext.models.context import ProcessedContext, Vectorize
 from opencontext.models.enums import ContextType
@@ -209,6 +211,52 @@ class UnifiedStorage:
     def delete_processed_context(self, id: str, context_type: str):
         return self._vector_backend.delete_processed_context(id, context_type)
 
+    def delete_processed_contexts(self, ids: List[str], context_type: str) -> bool:
+        """Delete several contexts of one type in a single call"""
+        if not ids:
+            return True
+        return self._vector_backend.delete_contexts(ids, context_type)
+
+    def iter_processed_contexts(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+        lazy: bool = False,
+    ) -> Iterator[ProcessedContext]:
+        """Iterate over all contexts of a type, fetched page by page from the vector database"""
+        if not self._initialized or not self._vector_backend:
+            logger.error("Vector database backend not initialized")
+            return iter(())
+        return self._vector_backend.iter_processed_contexts(
+            context_type,
+            filter=filter,
+            page_size=page_size,
+            need_vector=need_vector,
+            lazy=lazy,
+        )
+
+    def iter_processed_context_pages(
+        self,
+        context_type: str,
+        filter: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        need_vector: bool = False,
+        lazy: bool = False,
+    ) -> Iterator[List[ProcessedContext]]:
+        """Iterate over all contexts of a type in pages from the vector database"""
+        if not self._initialized or not self._vector_backend:
+            logger.error("Vector database backend not initialized")
+            return iter(())
+        return self._vector_backend.iter_processed_context_pages(
+            context_type,
+            filter=filter,
+            page_size=page_size,
+            need_vector=need_vector,
+            lazy=lazy,
+        )
+
     def get_all_processed_contexts(
         self,
         context_types: Optional[List[str]] = None,
@@ -307,6 +355,38 @@ class UnifiedStorage:
             logger.exception(f"Vector search failed: {e}")
             return []
 
+    def batch_search(
+        self,
+        queries: List[Vectorize],
+        top_k: int = 10,
+        context_types: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        need_vector: bool = False,
+    ) -> List[List[Tuple[ProcessedContext, float]]]:
+        """
+        Vector search for several queries in one round trip per collection.
+        Returns one result list per query, in the order of queries.
+        """
+        if not self._initialized:
+            logger.error("Unified storage system not initialized")
+            return [[] for _ in queries]
+
+        if not self._vector_backend:
+            logger.error("Vector database backend not initialized")
+            return [[] for _ in queries]
+
+        try:
+            return self._vector_backend.batch_search(
+                queries=queries,
+                top_k=top_k,
+                context_types=context_types,
+                filters=filters,
+                need_vector=need_vector,
+            )
+        except Exception as e:
+            logger.exception(f"Batch vector search failed: {e}")
+            return [[] for _ in queries]
+
     def upsert_todo_embedding(
         self,
         todo_id: int,
@@ -574,6 +654,98 @@ class UnifiedStorage:
             return None
         return self._document_backend.get_vault(vault_id)
 
+    def get_latest_vault_change_seq(self) -> int:
+        """Sequence number of the newest vault change, 0 if there is none"""
+        if not self._initialized or not self._document_backend:
+            return 0
+        return self._document_backend.get_latest_vault_change_seq()
+
+    def get_vault_changes(self, after_seq: int = 0, limit: int = 500) -> List[Dict]:
+        """Vault changes after a sequence number, with the current state of each vault"""
+        if not self._initialized or not self._document_backend:
+            return []
+        return self._document_backend.get_vault_changes(after_seq, limit)
+
+    def wait_for_vault_changes(
+        self, after_seq: int, timeout: float, stop_event: Optional[threading.Event] = None
+    ) -> bool:
+        """
+        Block until there are vault changes after after_seq, the timeout expires or
+        stop_event is set
+        """
+        if not self._initialized or not self._document_backend:
+            if stop_event is not None:
+                stop_event.wait(timeout)
+            else:
+                time.sleep(timeout)
+            return False
+        return self._document_backend.wait_for_vault_changes(after_seq, timeout, stop_event)
+
+    def compact_vault_changes(self) -> int:
+        """Drop vault changes superseded by a later change of the same vault"""
+        if not self._initialized or not self._document_backend:
+            return 0
+        return self._document_backend.compact_vault_changes()
+
+    def get_vault_fingerprint(self, vault_id: int) -> Optional[Dict]:
+        """Get the content hash and chunk segments recorded when a vault was last ingested"""
+        if not self._initialized or not self._document_backend:
+            return None
+        return self._document_backend.get_vault_fingerprint(vault_id)
+
+    def save_vault_fingerprint(
+        self, vault_id: int, content_hash: str, segments: List[Dict[str, Any]]
+    ) -> bool:
+        """Record the content hash and chunk segments of an ingested vault"""
+        if not self._initialized or not self._document_backend:
+            logger.error("Storage not initialized")
+            return False
+        return self._document_backend.save_vault_fingerprint(vault_id, content_hash, segments)
+
+    def get_ingestion_checkpoint(self, object_id: str) -> Optional[Dict]:
+        """Get the checkpoint (file_signature, chunk_index) of a document being ingested"""
+        if not self._initialized or not self._document_backend:
+            return None
+        return self._document_backend.get_ingestion_checkpoint(object_id)
+
+    def save_ingestion_checkpoint(
+        self, object_id: str, chunk_index: int, file_signature: str = ""
+    ) -> bool:
+        """Record the index of the next chunk to store for a document"""
+        if not self._initialized or not self._document_backend:
+            logger.error("Storage not initialized")
+            return False
+        return self._document_backend.save_ingestion_checkpoint(
+            object_id, chunk_index, file_signature
+        )
+
+    def delete_ingestion_checkpoint(self, object_id: str) -> bool:
+        """Remove the checkpoint of a document once it is fully ingested"""
+        if not self._initialized or not self._document_backend:
+            return False
+        return self._document_backend.delete_ingestion_checkpoint(object_id)
+
+    def record_merged_sources(
+        self, merged_into: str, context_type: str, source_ids: List[str]
+    ) -> bool:
+        """Record contexts that were merged into merged_into, to be deleted later"""
+        if not self._initialized or not self._document_backend:
+            logger.error("Storage not initialized")
+            return False
+        return self._document_backend.record_merged_sources(merged_into, context_type, source_ids)
+
+    def get_merged_sources(self, context_type: str, limit: int = 500) -> List[str]:
+        """Ids of merged contexts of one type that are still pending deletion"""
+        if not self._initialized or not self._document_backend:
+            return []
+        return self._document_backend.get_merged_sources(context_type, limit)
+
+    def delete_merged_sources(self, context_ids: List[str]) -> bool:
+        """Forget merged contexts once they have been deleted"""
+        if not self._initialized or not self._document_backend:
+            return False
+        return self._document_backend.delete_merged_sources(context_ids)
+
     def insert_todo(
         self,
         content: str,
@@ -731,6 +903,15 @@ class UnifiedStorage:
             data_type, count, context_type, metadata
         )
 
+    def save_monitoring_batch(
+        self,
+        token_usage: List[Dict[str, Any]],
+        stage_timing: List[Dict[str, Any]],
+        data_stats: List[Dict[str, Any]],
+    ) -> bool:
+        """Save pre-aggregated monitoring data in one transaction"""
+        return self._document_backend.save_monitoring_batch(token_usage, stage_timing, data_stats)
+
     def query_monitoring_token_usage(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Query token usage monitoring data"""
         return self._document_backend.query_monitoring_token_usage(hours)
@@ -829,6 +1010,24 @@ class UnifiedStorage:
             message_id=message_id, content_chunk=content_chunk, token_count=token_count
         )
 
+    def append_message_stream(
+        self,
+        message_id: int,
+        content_chunk: str = "",
+        token_count: int = 0,
+        thinking: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """Append buffered content and thinking records to a streaming message at once"""
+        if not self._initialized or not self._document_backend:
+            logger.error("Storage not initialized")
+            return False
+        return self._document_backend.append_message_stream(
+            message_id=message_id,
+            content_chunk=content_chunk,
+            token_count=token_count,
+            thinking=thinking,
+        )
+
     def update_message_metadata(
         self, message_id: int, metadata: Dict[str, Any]
     ) -> bool:
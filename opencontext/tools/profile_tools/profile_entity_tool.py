@@ -301,6 +301,57 @@ class ProfileEntityTool(BaseTool):
         else:
             return similar_contexts[0].metadata.get("entity_canonical_name", entity_name), similar_contexts[0]
 
+    def match_entities(
+        self, entities: List[Tuple[str, Optional[str]]], top_k: int = 3, judge: bool = True
+    ) -> List[Tuple[Optional[str], Optional[ProcessedContext]]]:
+        """Match several entities at once, same strategy as match_entity
+
+        Exact matches are looked up per entity, the remaining entities share one batched
+        similar search per entity type instead of one vector search each.
+
+        Args:
+            entities: (entity_name, entity_type) pairs, entity_type may be None
+            top_k: Maximum number of similar search results per entity
+            judge: Whether to use LLM to judge similar matches
+
+        Returns:
+            List[Tuple[Optional[str], Optional[ProcessedContext]]]: One
+            (matched entity name, matched context) pair per input entity
+        """
+        matches: List[Tuple[Optional[str], Optional[ProcessedContext]]] = [
+            (None, None) for _ in entities
+        ]
+
+        # 1. Exact matches first, group the rest by entity type for similar search
+        pending: Dict[Optional[str], List[int]] = {}
+        for i, (entity_name, entity_type) in enumerate(entities):
+            exact_result = self.find_exact_entity([entity_name], entity_type)
+            if exact_result:
+                matched_name = exact_result.metadata.get("entity_canonical_name", entity_name)
+                matches[i] = (matched_name, exact_result)
+            else:
+                pending.setdefault(entity_type, []).append(i)
+
+        # 2. Similar search, one batch per entity type
+        top_k = min(max(top_k, 1), 10)
+        for entity_type, indices in pending.items():
+            similar_lists = self.find_similar_entities_batch(
+                [[entities[i][0]] for i in indices], entity_type, top_k=top_k
+            )
+            for i, similar_contexts in zip(indices, similar_lists):
+                if not similar_contexts:
+                    continue
+                entity_name = entities[i][0]
+                # 3. Use LLM to judge if similar entities really match
+                if judge:
+                    matches[i] = self.judge_entity_match([entity_name], similar_contexts)
+                else:
+                    matches[i] = (
+                        similar_contexts[0].metadata.get("entity_canonical_name", entity_name),
+                        similar_contexts[0],
+                    )
+        return matches
+
     def find_exact_entity(
         self, entity_names: List[str], entity_type: str = None
     ) -> Optional[ProcessedContext]:
@@ -334,6 +385,29 @@ class ProfileEntityTool(BaseTool):
             context_types=[ContextType.ENTITY_CONTEXT.value],
             filters=filter,
         )
+        return self._filter_similar_results(results)
+
+    def find_similar_entities_batch(
+        self, entity_name_groups: List[List[str]], entity_type: str = None, top_k: int = 3
+    ) -> List[List[ProcessedContext]]:
+        """Similar entity search for several entities - one batched vector search"""
+        if not entity_name_groups:
+            return []
+        filter = {}
+        if entity_type:
+            filter["entity_type"] = entity_type
+        queries = [Vectorize(text=" ".join(names)) for names in entity_name_groups]
+        results = self.storage.batch_search(
+            queries=queries,
+            top_k=top_k,
+            context_types=[ContextType.ENTITY_CONTEXT.value],
+            filters=filter,
+        )
+        return [self._filter_similar_results(result) for result in results]
+
+    def _filter_similar_results(
+        self, results: List[Tuple[ProcessedContext, float]]
+    ) -> List[ProcessedContext]:
         if not results:
             return []
         contexts = []
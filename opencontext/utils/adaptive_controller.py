@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Adaptive controller - AIMD tuning of request concurrency and batch size
+
+Concurrency grows by one slot per window of successful requests and is cut
+multiplicatively on rate limiting (429), server errors (5xx), timeouts or latency
+above target, like TCP congestion control. Batch size grows additively while the
+input queue backs up and is cut the same way on overload.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+# Outcomes of a request, as far as the controller is concerned
+OK = "ok"
+THROTTLED = "throttled"
+SERVER_ERROR = "server_error"
+TIMEOUT = "timeout"
+CLIENT_ERROR = "client_error"
+
+
+def classify_error(error: BaseException) -> str:
+    """Map an exception raised by an API call to a request outcome"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code == 429:
+        return THROTTLED
+    if isinstance(status_code, int) and status_code >= 500:
+        return SERVER_ERROR
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "Timeout" in type(error).__name__:
+        return TIMEOUT
+    # Bad requests, unparsable responses etc. say nothing about load
+    return CLIENT_ERROR
+
+
+class AdaptiveController:
+    """
+    AIMD controller for an async request stage fed from a queue.
+
+    Requests run inside `slot()`, which waits while the in-flight limit is reached and
+    reports latency and outcome when the request ends. `next_batch_size()` is asked
+    once per batch with the current queue depth. Slots belong to the event loop that
+    called `bind()`; state reads (`get_state`) are safe from any thread.
+
+    Args:
+        min_concurrency / max_concurrency / initial_concurrency: In-flight request bounds
+        min_batch_size / max_batch_size / initial_batch_size: Batch size bounds
+        target_latency: Request latency (seconds) above which the limit is cut
+        decrease_factor: Multiplier applied to the limit and batch size on overload
+        queue_high_watermark: Queue fill ratio above which batches grow, and are
+            dispatched as soon as the queue runs dry (see is_backlogged)
+    """
+
+    def __init__(
+        self,
+        min_concurrency: int = 1,
+        max_concurrency: int = 8,
+        initial_concurrency: int = 4,
+        min_batch_size: int = 1,
+        max_batch_size: int = 50,
+        initial_batch_size: int = 10,
+        target_latency: float = 20.0,
+        decrease_factor: float = 0.5,
+        queue_high_watermark: float = 0.5,
+    ):
+        self.min_concurrency = max(1, int(min_concurrency))
+        self.max_concurrency = max(self.min_concurrency, int(max_concurrency))
+        self.min_batch_size = max(1, int(min_batch_size))
+        self.max_batch_size = max(self.min_batch_size, int(max_batch_size))
+        self.initial_batch_size = self._clamp(
+            int(initial_batch_size), self.min_batch_size, self.max_batch_size
+        )
+        self.target_latency = float(target_latency)
+        self.decrease_factor = min(max(float(decrease_factor), 0.1), 0.9)
+        self.queue_high_watermark = min(max(float(queue_high_watermark), 0.0), 1.0)
+
+        self._lock = threading.Lock()
+        self._limit = float(
+            self._clamp(int(initial_concurrency), self.min_concurrency, self.max_concurrency)
+        )
+        self._batch_size = self.initial_batch_size
+        self._in_flight = 0
+        # Requests started before the last decrease do not trigger another one, so a
+        # burst of concurrent 429s only halves the limit once
+        self._epoch = 0
+        # Created by bind() on the event loop the slots are used from
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._requests = 0
+        self._outcomes: Dict[str, int] = {
+            OK: 0,
+            THROTTLED: 0,
+            SERVER_ERROR: 0,
+            TIMEOUT: 0,
+            CLIENT_ERROR: 0,
+        }
+        self._latency_ewma: Optional[float] = None
+        self._decreases = 0
+        self._last_decrease_reason: Optional[str] = None
+        self._last_decrease_time: Optional[float] = None
+        self._queue_depth = 0
+        self._queue_capacity = 0
+
+    @staticmethod
+    def _clamp(value: int, low: int, high: int) -> int:
+        return max(low, min(high, value))
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    def bind(self) -> None:
+        """Bind slots to the running event loop, call from it before the first slot()"""
+        self._loop = asyncio.get_running_loop()
+        self._cond = asyncio.Condition()
+
+    def is_bound(self) -> bool:
+        """True when called from the event loop the slots are bound to"""
+        try:
+            return self._loop is not None and asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one in-flight request slot, reporting the request outcome on exit"""
+        if not self.is_bound():
+            raise RuntimeError("AdaptiveController slots are used outside their bound event loop")
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+            epoch = self._epoch
+        start = time.monotonic()
+        outcome = OK
+        try:
+            yield
+        except BaseException as e:
+            outcome = classify_error(e) if isinstance(e, Exception) else CLIENT_ERROR
+            raise
+        finally:
+            self._record(outcome, time.monotonic() - start, epoch)
+            async with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def _record(self, outcome: str, latency: float, epoch: int) -> None:
+        with self._lock:
+            self._requests += 1
+            self._outcomes[outcome] += 1
+            if outcome == OK:
+                self._latency_ewma = (
+                    latency
+                    if self._latency_ewma is None
+                    else 0.8 * self._latency_ewma + 0.2 * latency
+                )
+                if latency > self.target_latency:
+                    self._decrease("latency", epoch)
+                else:
+                    # Additive increase: about one slot per window of `limit` successes
+                    self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+            elif outcome != CLIENT_ERROR:
+                self._decrease(outcome, epoch)
+
+    def _decrease(self, reason: str, epoch: int) -> None:
+        """Multiplicative decrease, at most once per generation of requests"""
+        if epoch < self._epoch:
+            return
+        self._epoch += 1
+        self._limit = max(float(self.min_concurrency), int(self._limit * self.decrease_factor))
+        if reason != "latency":
+            self._batch_size = max(
+                self.min_batch_size, int(self._batch_size * self.decrease_factor)
+            )
+        self._decreases += 1
+        self._last_decrease_reason = reason
+        self._last_decrease_time = time.time()
+
+    def is_backlogged(self, queue_depth: int, queue_capacity: int) -> bool:
+        """True when the queue is filled beyond the high watermark"""
+        return queue_capacity > 0 and queue_depth >= queue_capacity * self.queue_high_watermark
+
+    def next_batch_size(self, queue_depth: int, queue_capacity: int) -> int:
+        """
+        Size of the next batch: grows while the queue is backlogged so the backlog is
+        drained in fewer rounds, and eases back to the initial size once it is empty.
+        """
+        with self._lock:
+            self._queue_depth = queue_depth
+            self._queue_capacity = queue_capacity
+            if self.is_backlogged(queue_depth, queue_capacity):
+                self._batch_size = min(
+                    self.max_batch_size, self._batch_size + self.initial_batch_size
+                )
+            elif queue_depth == 0 and self._batch_size > self.initial_batch_size:
+                self._batch_size = max(
+                    self.initial_batch_size, int(self._batch_size * self.decrease_factor)
+                )
+            return self._batch_size
+
+    def get_state(self) -> Dict[str, Any]:
+        """Snapshot of the controller state for monitoring"""
+        with self._lock:
+            return {
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "batch_size": self._batch_size,
+                "queue_depth": self._queue_depth,
+                "queue_capacity": self._queue_capacity,
+                "requests": self._requests,
+                "outcomes": dict(self._outcomes),
+                "avg_latency_ms": (
+                    round(self._latency_ewma * 1000, 1) if self._latency_ewma is not None else None
+                ),
+                "decreases": self._decreases,
+                "last_decrease_reason": self._last_decrease_reason,
+                "last_decrease_time": self._last_decrease_time,
+                "bounds": {
+                    "concurrency": [self.min_concurrency, self.max_concurrency],
+                    "batch_size": [self.min_batch_size, self.max_batch_size],
+                    "target_latency": self.target_latency,
+                },
+            }
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Hamming index - Near-duplicate lookup for fixed-width perceptual hashes
+
+Hashes are stored as Python ints and compared with XOR + popcount. Lookups use
+multi-index hashing: each hash is split into max_distance + 1 chunks, and by the
+pigeonhole principle any hash within max_distance bits shares at least one chunk
+exactly, so only entries sharing a chunk bucket are compared.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+HashValue = Union[int, str]
+
+
+def hash_to_int(value: HashValue) -> int:
+    """Convert a hex hash string (as produced by imagehash) or int to an int"""
+    return value if isinstance(value, int) else int(str(value), 16)
+
+
+class HammingIndex:
+    """
+    Bounded, thread-safe index of recent hashes with least-recently-used eviction.
+
+    Args:
+        max_distance: Largest Hamming distance that counts as a match
+        capacity: Number of entries kept, the least recently matched are evicted first
+        bits: Hash width in bits (64 for an 8x8 dHash)
+    """
+
+    def __init__(self, max_distance: int, capacity: int = 5000, bits: int = 64):
+        self.max_distance = max(0, int(max_distance))
+        self.capacity = max(1, int(capacity))
+        self.bits = bits
+
+        # Chunk boundaries (shift, mask), one more chunk than the allowed distance
+        num_chunks = min(self.max_distance + 1, bits)
+        base, extra = divmod(bits, num_chunks)
+        self._chunks: List[Tuple[int, int]] = []
+        shift = 0
+        for i in range(num_chunks):
+            width = base + (1 if i < extra else 0)
+            self._chunks.append((shift, (1 << width) - 1))
+            shift += width
+
+        self._entries: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._payloads: Dict[Hashable, Any] = {}
+        self._buckets: List[Dict[int, Set[Hashable]]] = [{} for _ in self._chunks]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _chunk_keys(self, value: int) -> List[int]:
+        return [(value >> shift) & mask for shift, mask in self._chunks]
+
+    def add(self, key: Hashable, value: HashValue, payload: Any = None) -> None:
+        """Insert or replace an entry, evicting the least recently used if full"""
+        value = hash_to_int(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = value
+            self._payloads[key] = payload
+            for bucket, chunk in zip(self._buckets, self._chunk_keys(value)):
+                bucket.setdefault(chunk, set()).add(key)
+            while len(self._entries) > self.capacity:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable) -> None:
+        value = self._entries.pop(key)
+        self._payloads.pop(key, None)
+        for bucket, chunk in zip(self._buckets, self._chunk_keys(value)):
+            keys = bucket.get(chunk)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[chunk]
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove an entry, returns False if it was not indexed"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def find_nearest(
+        self, value: HashValue, touch: bool = True
+    ) -> Optional[Tuple[Hashable, int, Any]]:
+        """
+        Find the closest indexed hash within max_distance.
+
+        Args:
+            value: Hash to look up
+            touch: Mark the match as most recently used
+
+        Returns:
+            (key, distance, payload) of the closest match, or None
+        """
+        value = hash_to_int(value)
+        with self._lock:
+            best_key, best_distance = None, self.max_distance + 1
+            seen: Set[Hashable] = set()
+            for bucket, chunk in zip(self._buckets, self._chunk_keys(value)):
+                for key in bucket.get(chunk, ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    distance = (value ^ self._entries[key]).bit_count()
+                    if distance < best_distance:
+                        best_key, best_distance = key, distance
+                        if distance == 0:
+                            break
+                if best_distance == 0:
+                    break
+            if best_key is None:
+                return None
+            if touch:
+                self._entries.move_to_end(best_key)
+            return best_key, best_distance, self._payloads.get(best_key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._payloads.clear()
+            for bucket in self._buckets:
+                bucket.clear()
@@ -7,9 +7,12 @@
 OpenContext module: image
 """
 
-from typing import Optional
+import base64
+from io import BytesIO
+from typing import List, Optional, Tuple
 
 import imagehash
+import numpy as np
 from PIL import Image
 
 
@@ -65,3 +68,244 @@ def resize_image(path: str, max_size: int, resize_quality: int) -> bool:
         logger = get_logger(__name__)
         logger.error(f"Failed to resize image {path}: {e}")
     return False
+
+
+def bgra_tile_signature(
+    size: Tuple[int, int], bgra: bytes, grid: int = 16, max_samples: int = 256
+) -> np.ndarray:
+    """
+    Cheap signature of a raw BGRA screen buffer: mean brightness of each cell of a
+    grid x grid tiling, computed on a strided sample of the pixels without decoding
+    or encoding the image.
+    """
+    width, height = size
+    pixels = np.frombuffer(bgra, dtype=np.uint8).reshape(height, width, 4)
+    stride = max(1, max(width, height) // max_samples)
+    sample = pixels[::stride, ::stride, :3].sum(axis=2, dtype=np.uint16)
+    rows = np.array_split(np.arange(sample.shape[0]), grid)
+    cols = np.array_split(np.arange(sample.shape[1]), grid)
+    row_sums = np.add.reduceat(sample, [r[0] for r in rows if len(r)], axis=0)
+    tile_sums = np.add.reduceat(row_sums, [c[0] for c in cols if len(c)], axis=1)
+    counts = np.outer([len(r) for r in rows if len(r)], [len(c) for c in cols if len(c)])
+    return tile_sums / (counts * 3.0)
+
+
+def tile_similarity(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """
+    Similarity (0-100) of two tile signatures, decided by the most-changed tile so a
+    small local change (a new chat line) still registers while noise such as a
+    blinking cursor does not. Signatures of different shapes score 0.
+    """
+    if signature1.shape != signature2.shape:
+        return 0.0
+    max_diff = float(np.abs(signature1 - signature2).max())
+    return 100.0 * (1.0 - max_diff / 255.0)
+
+
+Region = Tuple[int, int, int, int]  # (left, top, right, bottom) in pixels
+
+
+def dirty_regions(
+    previous: np.ndarray,
+    current: np.ndarray,
+    tile_size: int = 64,
+    tolerance: int = 8,
+    max_dirty_ratio: float = 0.5,
+    max_regions: int = 4,
+) -> Optional[List[Region]]:
+    """
+    Find the regions of current that changed against previous (both HxWx3 arrays).
+
+    The image is split into tile_size tiles; a tile is dirty when any channel of any
+    pixel differs by more than tolerance. Connected dirty tiles are merged into
+    bounding boxes, and if there are more than max_regions boxes they are merged
+    into one.
+
+    Returns:
+        The dirty regions (empty if nothing changed), or None if the images differ
+        in size or more than max_dirty_ratio of the tiles changed, meaning the whole
+        frame should be used instead.
+    """
+    if previous.shape != current.shape:
+        return None
+    height, width = current.shape[:2]
+    rows = -(-height // tile_size)
+    cols = -(-width // tile_size)
+
+    changed = (np.abs(current.astype(np.int16) - previous.astype(np.int16)) > tolerance).any(axis=2)
+    padded = np.zeros((rows * tile_size, cols * tile_size), dtype=bool)
+    padded[:height, :width] = changed
+    dirty = padded.reshape(rows, tile_size, cols, tile_size).any(axis=(1, 3))
+
+    if dirty.mean() > max_dirty_ratio:
+        return None
+
+    # Connected components of dirty tiles (4-neighbourhood), as tile bounding boxes
+    boxes = []
+    seen = np.zeros_like(dirty)
+    for r, c in zip(*np.nonzero(dirty)):
+        if seen[r, c]:
+            continue
+        seen[r, c] = True
+        stack = [(r, c)]
+        top, left, bottom, right = r, c, r, c
+        while stack:
+            y, x = stack.pop()
+            top, left, bottom, right = min(top, y), min(left, x), max(bottom, y), max(right, x)
+            for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                if 0 <= ny < rows and 0 <= nx < cols and dirty[ny, nx] and not seen[ny, nx]:
+                    seen[ny, nx] = True
+                    stack.append((ny, nx))
+        boxes.append((left, top, right + 1, bottom + 1))
+
+    if len(boxes) > max_regions:
+        boxes = [
+            (
+                min(b[0] for b in boxes),
+                min(b[1] for b in boxes),
+                max(b[2] for b in boxes),
+                max(b[3] for b in boxes),
+            )
+        ]
+    return [
+        (
+            int(left * tile_size),
+            int(top * tile_size),
+            int(min(right * tile_size, width)),
+            int(min(bottom * tile_size, height)),
+        )
+        for left, top, right, bottom in boxes
+    ]
+
+
+class ImageFrame:
+    """
+    In-memory image carried through the screenshot pipeline (capture -> resize ->
+    hash -> encode) so a frame is decoded once and never re-read from disk.
+
+    Downscaling, hashing and encoding each run at most once and are cached;
+    downscaling invalidates the cached hash and encoding. Once the encoded bytes
+    exist, release_pixels() drops the decoded image to keep queued frames small.
+    In diff mode a frame carries the regions that changed since the previous frame
+    of its monitor, and only those crops are encoded for upload.
+    """
+
+    def __init__(self, image: Image.Image, image_format: str = "png", quality: int = 95):
+        self._image: Optional[Image.Image] = image
+        self.format = "jpeg" if image_format.lower() in ("jpg", "jpeg") else "png"
+        self.quality = quality
+        self.size: Tuple[int, int] = image.size
+        self._phash: Optional[str] = None
+        self._encoded: Optional[bytes] = None
+        # Diff mode: changed regions against the previous frame, None for a full frame
+        self.regions: Optional[List[Region]] = None
+        self._encoded_regions: Optional[List[bytes]] = None
+
+    @classmethod
+    def from_bgra(
+        cls, size: Tuple[int, int], bgra: bytes, image_format: str = "png", quality: int = 95
+    ) -> "ImageFrame":
+        """Wrap a raw BGRA screen buffer (as returned by mss) without encoding it"""
+        image = Image.frombytes("RGB", size, bgra, "raw", "BGRX")
+        return cls(image, image_format, quality)
+
+    @classmethod
+    def from_encoded(
+        cls, data: bytes, image_format: str = "png", quality: int = 95
+    ) -> "ImageFrame":
+        """Decode an encoded image, keeping the bytes as the cached encoding"""
+        image = Image.open(BytesIO(data))
+        image = image.convert("RGB") if image.mode != "RGB" else image
+        image.load()
+        frame = cls(image, image_format, quality)
+        frame._encoded = data
+        return frame
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.format}"
+
+    def downscale(self, max_size: int) -> bool:
+        """Scale down proportionally if larger than max_size, returns True if resized"""
+        if not max_size or self._image is None:
+            return False
+        if self._image.width <= max_size and self._image.height <= max_size:
+            return False
+        self._image.thumbnail((max_size, max_size), Image.Resampling.BILINEAR)
+        self.size = self._image.size
+        self._phash = None
+        self._encoded = None
+        self.regions = None
+        self._encoded_regions = None
+        return True
+
+    def to_array(self) -> Optional[np.ndarray]:
+        """Decoded pixels as an HxWx3 uint8 array, None once released"""
+        return np.asarray(self._image) if self._image is not None else None
+
+    def set_regions(self, regions: Optional[List[Region]]) -> None:
+        """Mark the frame as a diff frame that only needs these regions uploaded"""
+        self.regions = list(regions) if regions else None
+        self._encoded_regions = None
+
+    @property
+    def has_full_encoding(self) -> bool:
+        return self._encoded is not None
+
+    def phash(self) -> Optional[str]:
+        """Perceptual (difference) hash computed from the decoded pixels (cached)"""
+        if self._phash is None and self._image is not None:
+            try:
+                self._phash = str(imagehash.dhash(self._image, hash_size=8))
+            except Exception:
+                return None
+        return self._phash
+
+    def encode(self) -> bytes:
+        """Encode to the frame format (cached)"""
+        if self._encoded is None:
+            if self._image is None:
+                raise ValueError("Image frame pixels were released before encoding")
+            self._encoded = self._encode_image(self._image)
+        return self._encoded
+
+    def _encode_image(self, image: Image.Image) -> bytes:
+        buffer = BytesIO()
+        if self.format == "jpeg":
+            image.save(buffer, format="JPEG", quality=self.quality)
+        else:
+            image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def encode_regions(self) -> List[bytes]:
+        """Encode each diff region as its own image (cached), empty for a full frame"""
+        if self._encoded_regions is None:
+            if not self.regions:
+                return []
+            if self._image is None:
+                raise ValueError("Image frame pixels were released before encoding")
+            self._encoded_regions = [
+                self._encode_image(self._image.crop(region)) for region in self.regions
+            ]
+        return self._encoded_regions
+
+    def to_base64(self) -> str:
+        """Base64 of the encoded image, for data URLs"""
+        return base64.b64encode(self.encode()).decode("utf-8")
+
+    def regions_to_base64(self) -> List[str]:
+        """Base64 of each encoded diff region"""
+        return [base64.b64encode(data).decode("utf-8") for data in self.encode_regions()]
+
+    def save(self, path: str) -> None:
+        """Write the encoded image to path"""
+        with open(path, "wb") as f:
+            f.write(self.encode())
+
+    def release_pixels(self) -> None:
+        """Encode what the upload needs (the regions of a diff frame), then drop the pixels"""
+        if self.regions:
+            self.encode_regions()
+        else:
+            self.encode()
+        self._image = None
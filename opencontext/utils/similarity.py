@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Similarity utilities - Shared cosine similarity kernel over float32 arrays
+
+Vectors may be given as lists, numpy arrays or Vectorize objects. Vectorize objects
+cache their normalized float32 array, so repeated comparisons of the same context
+only pay for normalization once.
+"""
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+
+def to_unit_vector(vector: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+    """Convert a vector to an L2-normalized float32 array, None if empty or zero"""
+    if vector is None or len(vector) == 0:
+        return None
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    if norm == 0:
+        return None
+    return array / norm
+
+
+def as_unit_vector(vector: Any) -> Optional[np.ndarray]:
+    """Get the normalized array for a vector, using the Vectorize cache when available"""
+    if vector is None:
+        return None
+    if hasattr(vector, "get_unit_vector"):
+        return vector.get_unit_vector()
+    return to_unit_vector(vector)
+
+
+def stack_unit_vectors(vectors: Sequence[Any], dim: Optional[int] = None) -> np.ndarray:
+    """
+    Stack vectors into an (n, dim) matrix of unit rows.
+    Missing vectors and vectors of another dimension become zero rows, so they score 0
+    against everything. dim defaults to the dimension of the first usable vector.
+    """
+    units = [as_unit_vector(v) for v in vectors]
+    if dim is None:
+        dim = next((u.shape[0] for u in units if u is not None), 0)
+    matrix = np.zeros((len(units), dim), dtype=np.float32)
+    for i, unit in enumerate(units):
+        if unit is not None and unit.shape[0] == dim:
+            matrix[i] = unit
+    return matrix
+
+
+def cosine_similarity(vec1: Any, vec2: Any) -> float:
+    """Cosine similarity of two vectors, 0.0 if either is missing or dimensions differ"""
+    unit1 = as_unit_vector(vec1)
+    unit2 = as_unit_vector(vec2)
+    if unit1 is None or unit2 is None or unit1.shape != unit2.shape:
+        return 0.0
+    return float(unit1 @ unit2)
+
+
+def cosine_similarity_one_to_many(query: Any, candidates: Sequence[Any]) -> np.ndarray:
+    """Cosine similarity of one query against many candidates, shape (len(candidates),)"""
+    unit = as_unit_vector(query)
+    if unit is None or not candidates:
+        return np.zeros(len(candidates), dtype=np.float32)
+    return stack_unit_vectors(candidates, dim=unit.shape[0]) @ unit
+
+
+def cosine_similarity_many_to_many(
+    queries: Sequence[Any], candidates: Optional[Sequence[Any]] = None
+) -> np.ndarray:
+    """
+    Pairwise cosine similarity matrix, shape (len(queries), len(candidates)).
+    Compares queries against themselves when candidates is None.
+    """
+    query_matrix = stack_unit_vectors(queries)
+    if candidates is None:
+        return query_matrix @ query_matrix.T
+    candidate_matrix = stack_unit_vectors(candidates, dim=query_matrix.shape[1])
+    return query_matrix @ candidate_matrix.T
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for backpressure between capture and processing
+Tests the overflow policies of BackpressureQueue and the on-disk SpillQueue
+"""
+
+import datetime
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from opencontext.managers.backpressure import BackpressureQueue, SpillQueue
+from opencontext.models.context import RawContextProperties
+from opencontext.models.enums import ContentFormat, ContextSource
+from opencontext.utils.image import ImageFrame
+
+
+def make_context(object_id: str, monitor: str = None, frame: bool = False) -> RawContextProperties:
+    context = RawContextProperties(
+        source=ContextSource.SCREENSHOT,
+        content_format=ContentFormat.IMAGE,
+        create_time=datetime.datetime(2025, 1, 1),
+        object_id=object_id,
+        additional_info={"monitor": monitor} if monitor else {},
+    )
+    if frame:
+        context.attach_frame(ImageFrame(Image.new("RGB", (32, 32), "white")))
+    return context
+
+
+def drain(queue: BackpressureQueue):
+    ids = []
+    while True:
+        context = queue.get(timeout=0.05)
+        if context is None:
+            return ids
+        ids.append(context.object_id)
+
+
+class TestBackpressureQueue(unittest.TestCase):
+    """Test cases for BackpressureQueue overflow policies"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.spill_dir = str(Path(self._tmp.name) / "spill")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_block_drops_after_timeout(self):
+        """Block waits up to block_timeout for room, then drops the new context"""
+        queue = BackpressureQueue("test", capacity=1, policy="block", block_timeout=0.1)
+        self.assertTrue(queue.put(make_context("a")))
+        start = time.monotonic()
+        self.assertFalse(queue.put(make_context("b")))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(drain(queue), ["a"])
+
+    def test_block_waits_for_room(self):
+        """Block succeeds once the consumer makes room within block_timeout"""
+        queue = BackpressureQueue("test", capacity=1, policy="block", block_timeout=2.0)
+        queue.put(make_context("a"))
+        consumer = threading.Timer(0.1, queue.get)
+        consumer.start()
+        self.assertTrue(queue.put(make_context("b")))
+        consumer.join()
+        self.assertEqual(drain(queue), ["b"])
+
+    def test_drop_oldest_evicts_and_releases(self):
+        """Drop oldest evicts the head of the queue and frees its frame"""
+        queue = BackpressureQueue("test", capacity=2, policy="drop_oldest")
+        oldest = make_context("a", frame=True)
+        queue.put(oldest)
+        queue.put(make_context("b"))
+        self.assertTrue(queue.put(make_context("c")))
+        self.assertIsNone(oldest.get_frame())
+        self.assertEqual(drain(queue), ["b", "c"])
+
+    def test_coalesce_replaces_same_key_in_place(self):
+        """Coalesce replaces the queued context of the same monitor, keeping its position"""
+        queue = BackpressureQueue("test", capacity=2, policy="coalesce")
+        replaced = make_context("m1-old", monitor="m1", frame=True)
+        queue.put(replaced)
+        queue.put(make_context("m2", monitor="m2"))
+        self.assertTrue(queue.put(make_context("m1-new", monitor="m1")))
+        self.assertIsNone(replaced.get_frame())
+        self.assertEqual(drain(queue), ["m1-new", "m2"])
+
+    def test_coalesce_falls_back_to_drop_oldest(self):
+        """Without a queued context of the same key, coalesce drops the oldest"""
+        queue = BackpressureQueue("test", capacity=2, policy="coalesce")
+        queue.put(make_context("m1", monitor="m1"))
+        queue.put(make_context("m2", monitor="m2"))
+        queue.put(make_context("m3", monitor="m3"))
+        self.assertEqual(drain(queue), ["m2", "m3"])
+
+    def test_coalesced_diff_frame_becomes_keyframe(self):
+        """A diff frame that replaces its base is sent as a full frame"""
+        queue = BackpressureQueue("test", capacity=1, policy="coalesce")
+        queue.put(make_context("base", monitor="m1", frame=True))
+        survivor = make_context("diff", monitor="m1", frame=True)
+        survivor.get_frame().set_regions([(0, 0, 8, 8)])
+        survivor.additional_info.update({"diff_regions": [(0, 0, 8, 8)], "diff_base_seq": 1})
+        queue.put(survivor)
+        self.assertIsNone(survivor.get_frame().regions)
+        self.assertNotIn("diff_regions", survivor.additional_info)
+        self.assertNotIn("diff_base_seq", survivor.additional_info)
+
+    def test_spill_keeps_order(self):
+        """Spill writes the overflow to disk and replays it in order"""
+        queue = BackpressureQueue("test", capacity=2, policy="spill", spill_dir=self.spill_dir)
+        for i in range(6):
+            self.assertTrue(queue.put(make_context(f"c{i}")))
+        self.assertEqual(len(queue), 6)
+        self.assertEqual(queue.get_stats()["spilled_pending"], 4)
+        self.assertEqual(drain(queue), [f"c{i}" for i in range(6)])
+        self.assertEqual(list(Path(self.spill_dir).glob("*.json")), [])
+
+    def test_spill_requires_directory(self):
+        with self.assertRaises(ValueError):
+            BackpressureQueue("test", policy="spill")
+
+    def test_close_spills_queued_contexts_in_order(self):
+        """close() persists what is still queued, replayed in order on the next start"""
+        queue = BackpressureQueue("test", capacity=2, policy="spill", spill_dir=self.spill_dir)
+        for i in range(5):
+            queue.put(make_context(f"c{i}"))
+        queue.close()
+        self.assertTrue(queue.closed)
+        self.assertFalse(queue.put(make_context("late")))
+
+        restarted = BackpressureQueue(
+            "test", capacity=2, policy="spill", spill_dir=self.spill_dir
+        )
+        self.assertEqual(len(restarted), 5)
+        # Newer contexts queue up behind the spilled ones
+        restarted.put(make_context("c5"))
+        self.assertEqual(drain(restarted), [f"c{i}" for i in range(6)])
+
+    def test_close_without_spill_drains_in_memory(self):
+        """Without spill, contexts queued at close are still handed out, then get() ends"""
+        queue = BackpressureQueue("test", capacity=2, policy="drop_oldest")
+        queue.put(make_context("a"))
+        queue.close()
+        self.assertEqual(queue.get(timeout=0.05).object_id, "a")
+        self.assertIsNone(queue.get(timeout=0.05))
+
+
+class TestSpillQueue(unittest.TestCase):
+    """Test cases for SpillQueue"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_fifo_across_reopen(self):
+        """Spilled contexts come back oldest first, also from a reopened spool"""
+        spool = SpillQueue(str(self.directory))
+        for i in range(3):
+            spool.put(make_context(f"c{i}"))
+        self.assertEqual(spool.pop().object_id, "c0")
+
+        reopened = SpillQueue(str(self.directory))
+        self.assertEqual(len(reopened), 2)
+        self.assertEqual([reopened.pop().object_id for _ in range(2)], ["c1", "c2"])
+        self.assertIsNone(reopened.pop())
+
+    def test_frame_survives_spill(self):
+        """An attached frame is stored with the context and reattached on pop"""
+        spool = SpillQueue(str(self.directory))
+        context = make_context("a", frame=True)
+        spool.put(context)
+        self.assertIsNone(context.get_frame())
+        restored = spool.pop()
+        self.assertIsNotNone(restored.get_frame())
+        self.assertEqual(restored.get_frame().size, (32, 32))
+
+    def test_put_front_goes_before_spilled(self):
+        """Contexts put in front replay before everything already spilled, in order"""
+        spool = SpillQueue(str(self.directory))
+        spool.put(make_context("c2"))
+        spool.put_front([make_context("c0"), make_context("c1")])
+        reopened = SpillQueue(str(self.directory))
+        self.assertEqual([reopened.pop().object_id for _ in range(3)], ["c0", "c1", "c2"])
+
+    def test_unreadable_files_are_skipped(self):
+        """Leftover temp files are removed and corrupt entries dropped"""
+        (self.directory / "00000000000000000001-000001.json").write_text("{not json")
+        (self.directory / "00000000000000000002-000001.tmp").write_text("partial")
+        spool = SpillQueue(str(self.directory))
+        spool.put(make_context("a"))
+        self.assertEqual(list(self.directory.glob("*.tmp")), [])
+        self.assertEqual(spool.pop().object_id, "a")
+        self.assertIsNone(spool.pop())
+
+
+if __name__ == "__main__":
+    unittest.main()
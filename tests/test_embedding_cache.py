@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the persistent embedding cache
+Tests content-addressed keys, persistence, float16 storage and LRU eviction
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from opencontext.llm.embedding_cache import EmbeddingCache, get_embedding_cache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test cases for EmbeddingCache"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self._tmp.name) / "cache" / "embeddings.db")
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        self._tmp.cleanup()
+
+    def open_cache(self, **kwargs) -> EmbeddingCache:
+        cache = EmbeddingCache(self.path, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def test_keys_are_content_addressed(self):
+        key = EmbeddingCache.make_key("model-a", 1024, "hello")
+        self.assertEqual(key, EmbeddingCache.make_key("model-a", 1024, "hello"))
+        self.assertNotEqual(key, EmbeddingCache.make_key("model-b", 1024, "hello"))
+        self.assertNotEqual(key, EmbeddingCache.make_key("model-a", 512, "hello"))
+        self.assertNotEqual(key, EmbeddingCache.make_key("model-a", 1024, "hello!"))
+        self.assertEqual(
+            EmbeddingCache.make_key("model-a", None, None),
+            EmbeddingCache.make_key("model-a", 0, ""),
+        )
+
+    def test_round_trip_and_persistence(self):
+        """float32 vectors come back exactly, also from a reopened cache"""
+        cache = self.open_cache()
+        vectors = {"a": [0.5, -1.25, 3.0], "b": [1.0, 2.0]}
+        cache.put_many(vectors, model="m", output_dim=0)
+        self.assertEqual(cache.get_many(["a", "b", "missing"]), vectors)
+        cache.close()
+        self.caches.remove(cache)
+
+        reopened = self.open_cache()
+        self.assertEqual(reopened.get_stats()["entries"], 2)
+        self.assertEqual(reopened.get_many(["a"]), {"a": vectors["a"]})
+
+    def test_float16_storage(self):
+        cache = self.open_cache(dtype="float16")
+        cache.put_many({"a": [0.1, 0.333333, 100.0]}, model="m", output_dim=0)
+        for cached, expected in zip(cache.get_many(["a"])["a"], [0.1, 0.333333, 100.0]):
+            self.assertAlmostEqual(cached, expected, delta=abs(expected) * 1e-3)
+
+    def test_unsupported_dtype(self):
+        with self.assertRaises(ValueError):
+            EmbeddingCache(self.path, dtype="float64")
+
+    def test_existing_entries_are_not_overwritten(self):
+        cache = self.open_cache()
+        cache.put_many({"a": [1.0]}, model="m", output_dim=0)
+        cache.put_many({"a": [2.0], "empty": []}, model="m", output_dim=0)
+        self.assertEqual(cache.get_many(["a", "empty"]), {"a": [1.0]})
+        self.assertEqual(cache.get_stats()["entries"], 1)
+
+    def test_lru_eviction(self):
+        """Beyond max_entries the least recently used entries are evicted first"""
+        cache = self.open_cache(max_entries=3)
+        cache.put_many({"a": [1.0], "b": [2.0], "c": [3.0]}, model="m", output_dim=0)
+        # A hit makes "a" the most recently used entry
+        cache.get_many(["a"])
+        cache.put_many({"d": [4.0]}, model="m", output_dim=0)
+        self.assertEqual(set(cache.get_many(["a", "b", "c", "d"])), {"a", "c", "d"})
+        self.assertEqual(cache.get_stats()["entries"], 3)
+
+    def test_access_order_survives_reopen(self):
+        """Hits recorded in memory are written back on close"""
+        cache = self.open_cache(max_entries=2)
+        cache.put_many({"a": [1.0], "b": [2.0]}, model="m", output_dim=0)
+        cache.get_many(["a"])
+        cache.close()
+        self.caches.remove(cache)
+
+        reopened = self.open_cache(max_entries=2)
+        reopened.put_many({"c": [3.0]}, model="m", output_dim=0)
+        self.assertEqual(set(reopened.get_many(["a", "b", "c"])), {"a", "c"})
+
+    def test_get_embedding_cache_is_shared_per_path(self):
+        config = {"cache": {"path": self.path}}
+        cache = get_embedding_cache(config)
+        self.caches.append(cache)
+        self.assertIs(get_embedding_cache(config), cache)
+        self.assertIsNone(get_embedding_cache({"cache": {"enabled": False}}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the Hamming index
+Compares multi-index lookups against brute force and tests LRU eviction
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from opencontext.utils.hamming_index import HammingIndex, hash_to_int
+
+
+def flip_bits(value: int, count: int, rng: random.Random, bits: int = 64) -> int:
+    for position in rng.sample(range(bits), count):
+        value ^= 1 << position
+    return value
+
+
+def brute_force_distance(value: int, entries: dict):
+    distances = [(value ^ entry).bit_count() for entry in entries.values()]
+    return min(distances) if distances else None
+
+
+class TestHammingIndex(unittest.TestCase):
+    """Test cases for HammingIndex"""
+
+    def test_matches_brute_force_at_threshold_boundaries(self):
+        """Queries at max_distance - 1, max_distance and max_distance + 1 agree with brute force"""
+        rng = random.Random(1234)
+        for max_distance in (0, 1, 2, 3, 5, 8, 12):
+            index = HammingIndex(max_distance=max_distance, capacity=1000)
+            entries = {}
+            for i in range(200):
+                value = rng.getrandbits(64)
+                entries[f"k{i}"] = value
+                index.add(f"k{i}", value)
+
+            for i in range(300):
+                base = entries[f"k{rng.randrange(200)}"]
+                offset = rng.choice((-1, 0, 1))
+                distance = min(64, max(0, max_distance + offset))
+                query = flip_bits(base, distance, rng)
+
+                expected = brute_force_distance(query, entries)
+                result = index.find_nearest(query, touch=False)
+                with self.subTest(max_distance=max_distance, query_distance=distance):
+                    if expected <= max_distance:
+                        self.assertIsNotNone(result)
+                        key, found, _ = result
+                        self.assertEqual(found, expected)
+                        self.assertEqual((query ^ entries[key]).bit_count(), found)
+                    else:
+                        self.assertIsNone(result)
+
+    def test_exact_match_and_payload(self):
+        index = HammingIndex(max_distance=2)
+        index.add("a", 0b1011, payload={"path": "a.png"})
+        self.assertEqual(index.find_nearest(0b1011), ("a", 0, {"path": "a.png"}))
+        self.assertEqual(index.find_nearest(0b1001)[:2], ("a", 1))
+        self.assertIsNone(index.find_nearest(0b0100))
+
+    def test_hex_strings(self):
+        """Hex strings from imagehash are accepted wherever ints are"""
+        index = HammingIndex(max_distance=1)
+        index.add("a", "ff00ff00ff00ff00")
+        self.assertEqual(hash_to_int("ff00ff00ff00ff00"), 0xFF00FF00FF00FF00)
+        self.assertEqual(index.find_nearest("ff00ff00ff00ff01")[:2], ("a", 1))
+
+    def test_returns_closest_of_several_matches(self):
+        index = HammingIndex(max_distance=4)
+        index.add("far", 0b1111)
+        index.add("near", 0b0001)
+        self.assertEqual(index.find_nearest(0b0000)[:2], ("near", 1))
+
+    def test_lru_eviction_keeps_recently_matched(self):
+        """A match marks the entry as recently used, the oldest untouched entry goes first"""
+        index = HammingIndex(max_distance=0, capacity=2)
+        index.add("a", 1)
+        index.add("b", 2)
+        self.assertIsNotNone(index.find_nearest(1))
+        index.add("c", 3)
+        self.assertEqual(len(index), 2)
+        self.assertIsNotNone(index.find_nearest(1, touch=False))
+        self.assertIsNone(index.find_nearest(2))
+
+        # Without touch the match does not refresh the entry
+        index.find_nearest(3, touch=False)
+        index.add("d", 4)
+        self.assertIsNone(index.find_nearest(1))
+        self.assertIsNotNone(index.find_nearest(3))
+
+    def test_replace_and_remove(self):
+        """Re-adding a key replaces its hash, removed keys no longer match"""
+        index = HammingIndex(max_distance=0)
+        index.add("a", 5)
+        index.add("a", 9)
+        self.assertEqual(len(index), 1)
+        self.assertIsNone(index.find_nearest(5))
+        self.assertEqual(index.find_nearest(9)[0], "a")
+        self.assertTrue(index.remove("a"))
+        self.assertFalse(index.remove("a"))
+        self.assertIsNone(index.find_nearest(9))
+        index.add("b", 9)
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.find_nearest(9))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for region diff
+Tests content-defined region splitting and incremental update plans
+"""
+
+import itertools
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from opencontext.context_processing.chunker.region_diff import (
+    content_hash,
+    plan_update,
+    split_regions,
+)
+
+_ids = itertools.count()
+
+
+def make_document(count: int = 40, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta"]
+    return [
+        f"Paragraph {i}: " + " ".join(rng.choice(words) for _ in range(rng.randint(10, 60)))
+        for i in range(count)
+    ]
+
+
+def ingest(text: str, old_segments: list, segment_chars: int = 1500):
+    """Apply a plan like the document processor does, one fake context id per new segment"""
+    regions = split_regions(text)
+    plan = plan_update(regions, old_segments, segment_chars=segment_chars)
+    new_items = plan.new_items
+    for item in new_items:
+        item.context_ids = [f"ctx-{next(_ids)}"]
+    return regions, plan, new_items
+
+
+def context_ids(segments: list) -> set:
+    return {context_id for segment in segments for context_id in segment["context_ids"]}
+
+
+class TestSplitRegions(unittest.TestCase):
+    """Test cases for split_regions"""
+
+    def test_regions_cover_text(self):
+        paragraphs = make_document()
+        text = "\n\n".join(paragraphs)
+        regions = split_regions(text)
+        self.assertGreater(len(regions), 1)
+        self.assertEqual("\n\n".join(region.text for region in regions), text)
+        for region in regions:
+            self.assertEqual(region.hash, content_hash(region.text))
+
+    def test_heading_starts_region(self):
+        text = "intro text\n\n# Heading\n\nbody text"
+        regions = split_regions(text, min_chars=1000)
+        self.assertEqual(
+            [region.text for region in regions], ["intro text", "# Heading\n\nbody text"]
+        )
+
+    def test_max_chars_bounds_regions(self):
+        paragraphs = ["x" * 300 + str(i) for i in range(30)]
+        for region in split_regions("\n\n".join(paragraphs), min_chars=10000, max_chars=1000):
+            # A region closes once it reaches max_chars, so at most one paragraph over
+            self.assertLess(len(region.text), 1000 + 302 + 4)
+
+    def test_edit_keeps_distant_boundaries(self):
+        """Editing one paragraph only changes the regions around it"""
+        paragraphs = make_document(60)
+        before = split_regions("\n\n".join(paragraphs))
+        paragraphs[30] += " edited"
+        after = split_regions("\n\n".join(paragraphs))
+
+        before_hashes = [region.hash for region in before]
+        after_hashes = [region.hash for region in after]
+        common_prefix = next(
+            i for i, (a, b) in enumerate(zip(before_hashes, after_hashes)) if a != b
+        )
+        common_suffix = next(
+            i
+            for i, (a, b) in enumerate(zip(reversed(before_hashes), reversed(after_hashes)))
+            if a != b
+        )
+        # Everything but the edited neighbourhood is unchanged
+        self.assertLessEqual(len(after_hashes) - common_prefix - common_suffix, 2)
+        self.assertGreater(common_prefix, 0)
+        self.assertGreater(common_suffix, 0)
+
+
+class TestPlanUpdate(unittest.TestCase):
+    """Test cases for plan_update"""
+
+    def setUp(self):
+        self.text = "\n\n".join(make_document(60))
+        regions, plan, _ = ingest(self.text, [])
+        self.segments = plan.segments()
+
+    def test_first_ingestion_chunks_everything(self):
+        regions, plan, new_items = ingest(self.text, [])
+        self.assertEqual(plan.kept_segments, 0)
+        self.assertEqual(plan.stale_context_ids, [])
+        self.assertEqual(len(new_items), len(plan.items))
+        self.assertEqual(
+            [region.hash for item in plan.items for region in item.regions],
+            [region.hash for region in regions],
+        )
+        # Uncovered regions are grouped up to segment_chars
+        self.assertGreater(len(regions), len(plan.items))
+
+    def test_unchanged_document_keeps_every_segment(self):
+        _, plan, new_items = ingest(self.text, self.segments)
+        self.assertEqual(new_items, [])
+        self.assertEqual(plan.stale_context_ids, [])
+        self.assertEqual(plan.kept_segments, len(self.segments))
+        self.assertEqual(plan.segments(), self.segments)
+
+    def test_edit_rechunks_only_touched_segment(self):
+        paragraphs = self.text.split("\n\n")
+        paragraphs[30] += " edited"
+        _, plan, new_items = ingest("\n\n".join(paragraphs), self.segments)
+
+        self.assertEqual(plan.kept_segments, len(self.segments) - 1)
+        self.assertEqual(len(plan.stale_context_ids), 1)
+        self.assertEqual(len(new_items), 1)
+        self.assertIn("edited", new_items[0].text)
+        # Kept and new contexts together replace exactly the stale ones
+        self.assertEqual(
+            context_ids(plan.segments()),
+            (context_ids(self.segments) - set(plan.stale_context_ids))
+            | set(new_items[0].context_ids),
+        )
+
+    def test_removed_text_makes_its_contexts_stale(self):
+        first_segment_text = "\n\n".join(
+            region.text for region in split_regions(self.text)[: len(self.segments[0]["hashes"])]
+        )
+        _, plan, new_items = ingest(self.text[len(first_segment_text) + 2 :], self.segments)
+        self.assertEqual(plan.stale_context_ids, self.segments[0]["context_ids"])
+        self.assertEqual(new_items, [])
+        self.assertEqual(plan.segments(), self.segments[1:])
+
+    def test_moved_segment_is_rechunked(self):
+        """Kept segments must stay in their old order, a segment moved up is re-chunked"""
+        regions = split_regions(self.text)
+        first_width = len(self.segments[0]["hashes"])
+        second_width = len(self.segments[1]["hashes"])
+        first = regions[:first_width]
+        second = regions[first_width : first_width + second_width]
+        rest = regions[first_width + second_width :]
+        moved = second + first + rest
+
+        plan = plan_update(moved, self.segments, segment_chars=1500)
+        kept = [item for item in plan.items if item.context_ids is not None]
+        # Only one of the two swapped segments can keep its place
+        self.assertIn(
+            plan.stale_context_ids,
+            (self.segments[0]["context_ids"], self.segments[1]["context_ids"]),
+        )
+        self.assertEqual(len(kept), len(self.segments) - 1)
+        self.assertEqual(
+            [region.hash for item in plan.items for region in item.regions],
+            [region.hash for region in moved],
+        )
+
+    def test_segment_without_hashes_is_stale(self):
+        plan = plan_update(split_regions(self.text), [{"hashes": [], "context_ids": ["x"]}])
+        self.assertEqual(plan.stale_context_ids, ["x"])
+        self.assertEqual(plan.kept_segments, 0)
+
+    def test_random_edits_stay_consistent(self):
+        """After any sequence of edits the stored layout covers the document exactly"""
+        rng = random.Random(7)
+        paragraphs = self.text.split("\n\n")
+        segments = self.segments
+        live_ids = context_ids(segments)
+        for _ in range(30):
+            operation = rng.choice(("edit", "insert", "delete"))
+            position = rng.randrange(len(paragraphs))
+            if operation == "edit":
+                paragraphs[position] += f" change {rng.random()}"
+            elif operation == "insert":
+                paragraphs.insert(position, f"New paragraph {rng.random()}")
+            elif len(paragraphs) > 5:
+                del paragraphs[position]
+            text = "\n\n".join(paragraphs)
+
+            regions, plan, new_items = ingest(text, segments)
+            live_ids -= set(plan.stale_context_ids)
+            live_ids |= {context_id for item in new_items for context_id in item.context_ids}
+            segments = plan.segments()
+
+            self.assertEqual(
+                [h for segment in segments for h in segment["hashes"]],
+                [region.hash for region in regions],
+            )
+            self.assertEqual(context_ids(segments), live_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
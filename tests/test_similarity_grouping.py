@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for vectorized similarity grouping
+Compares blocked grouping against straightforward reference implementations
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from opencontext.context_processing.merger.similarity_grouping import (
+    GroupingMode,
+    group_by_similarity,
+)
+
+
+def cosine(a, b) -> float:
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 0.0
+
+
+def reference_greedy(embeddings, threshold):
+    """The legacy loop: each unassigned item seeds a group of later unassigned matches"""
+    assigned = set()
+    groups = []
+    for i, seed in enumerate(embeddings):
+        if i in assigned:
+            continue
+        assigned.add(i)
+        group = [i]
+        if seed is not None:
+            for j in range(i + 1, len(embeddings)):
+                if j not in assigned and embeddings[j] is not None:
+                    if cosine(seed, embeddings[j]) > threshold:
+                        assigned.add(j)
+                        group.append(j)
+        groups.append(group)
+    return groups
+
+
+def reference_components(embeddings, threshold):
+    """Connected components of the similarity graph, ordered by first member"""
+    n = len(embeddings)
+    seen = set()
+    groups = []
+    for i in range(n):
+        if i in seen:
+            continue
+        seen.add(i)
+        stack, group = [i], []
+        while stack:
+            k = stack.pop()
+            group.append(k)
+            for j in range(n):
+                if j in seen or embeddings[k] is None or embeddings[j] is None:
+                    continue
+                if cosine(embeddings[k], embeddings[j]) > threshold:
+                    seen.add(j)
+                    stack.append(j)
+        groups.append(sorted(group))
+    return groups
+
+
+def clustered_embeddings(n: int, dim: int = 16, clusters: int = 6, seed: int = 0):
+    """Noisy copies of a few centers, so groups of several members exist"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return [
+        (centers[rng.integers(clusters)] + rng.normal(scale=0.35, size=dim)).tolist()
+        for _ in range(n)
+    ]
+
+
+class TestGroupBySimilarity(unittest.TestCase):
+    """Test cases for group_by_similarity"""
+
+    def test_greedy_matches_reference(self):
+        for seed in range(3):
+            embeddings = clustered_embeddings(90, seed=seed)
+            for threshold in (0.5, 0.8, 0.95):
+                expected = reference_greedy(embeddings, threshold)
+                for block_size in (1, 7, 256):
+                    with self.subTest(seed=seed, threshold=threshold, block_size=block_size):
+                        self.assertEqual(
+                            group_by_similarity(embeddings, threshold, block_size=block_size),
+                            expected,
+                        )
+
+    def test_union_find_matches_components(self):
+        for seed in range(3):
+            embeddings = clustered_embeddings(90, seed=seed)
+            for threshold in (0.5, 0.8, 0.95):
+                expected = reference_components(embeddings, threshold)
+                for block_size in (1, 7, 256):
+                    with self.subTest(seed=seed, threshold=threshold, block_size=block_size):
+                        self.assertEqual(
+                            group_by_similarity(
+                                embeddings,
+                                threshold,
+                                mode=GroupingMode.UNION_FIND,
+                                block_size=block_size,
+                            ),
+                            expected,
+                        )
+
+    def test_union_find_is_transitive(self):
+        """a~b and b~c join one component even if a and c are not similar"""
+        embeddings = [[1.0, 0.0], [0.8, 0.6], [0.28, 0.96]]
+        self.assertLess(cosine(embeddings[0], embeddings[2]), 0.75)
+        self.assertEqual(group_by_similarity(embeddings, 0.75), [[0, 1], [2]])
+        self.assertEqual(
+            group_by_similarity(embeddings, 0.75, mode=GroupingMode.UNION_FIND), [[0, 1, 2]]
+        )
+
+    def test_missing_and_zero_embeddings_stay_alone(self):
+        embeddings = [[1.0, 0.0], None, [0.0, 0.0], [1.0, 0.0], []]
+        for mode in GroupingMode:
+            with self.subTest(mode=mode):
+                self.assertEqual(
+                    group_by_similarity(embeddings, 0.5, mode=mode), [[0, 3], [1], [2], [4]]
+                )
+
+    def test_mixed_dimensions_and_empty_input(self):
+        self.assertIsNone(group_by_similarity([[1.0, 0.0], [1.0, 0.0, 0.0]], 0.5))
+        self.assertEqual(group_by_similarity([], 0.5), [])
+
+    def test_threshold_is_strict(self):
+        """Similarity equal to the threshold is not a match"""
+        self.assertEqual(group_by_similarity([[1.0, 0.0], [1.0, 0.0]], 1.0), [[0], [1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2025 Beijing Volcano Engine Technology Co., Ltd.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the durable work queue
+Tests journaling, acknowledgement, recovery and segment truncation
+"""
+
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from opencontext.context_processing.work_queue import DurableWorkQueue
+from opencontext.models.context import RawContextProperties
+from opencontext.models.enums import ContentFormat, ContextSource
+
+
+def make_context(object_id: str) -> RawContextProperties:
+    return RawContextProperties(
+        source=ContextSource.VAULT,
+        content_format=ContentFormat.TEXT,
+        content_text="x" * 50,
+        create_time=datetime.datetime(2025, 1, 1),
+        object_id=object_id,
+    )
+
+
+class TestDurableWorkQueue(unittest.TestCase):
+    """Test cases for DurableWorkQueue"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        self.queues = []
+
+    def tearDown(self):
+        for work_queue in self.queues:
+            work_queue.close()
+        self._tmp.cleanup()
+
+    def open_queue(self, segment_bytes: int = 64 * 1024) -> DurableWorkQueue:
+        work_queue = DurableWorkQueue(str(self.directory), segment_bytes=segment_bytes)
+        self.queues.append(work_queue)
+        return work_queue
+
+    def segments(self):
+        return sorted(path.name for path in self.directory.glob("segment-*.log"))
+
+    def test_recover_unacknowledged_after_reopen(self):
+        """Contexts that were never acknowledged are recovered in order after a reopen"""
+        work_queue = self.open_queue()
+        for object_id in ("a", "b", "c"):
+            work_queue.append(make_context(object_id))
+        work_queue.ack(["b"])
+        work_queue.close()
+
+        reopened = self.open_queue()
+        self.assertEqual(len(reopened), 2)
+        recovered = list(reopened.recover())
+        self.assertEqual([context.object_id for context in recovered], ["a", "c"])
+        self.assertEqual(recovered[0].content_text, "x" * 50)
+
+        reopened.ack(["a", "c"])
+        reopened.close()
+        self.assertEqual(list(self.open_queue().recover()), [])
+
+    def test_append_is_idempotent(self):
+        """Appending a pending object_id again does not journal it twice"""
+        work_queue = self.open_queue()
+        work_queue.append(make_context("a"))
+        work_queue.append(make_context("a"))
+        self.assertEqual(len(work_queue), 1)
+        work_queue.close()
+        self.assertEqual([c.object_id for c in self.open_queue().recover()], ["a"])
+
+    def test_closed_queue_ignores_writes(self):
+        """After close, append and ack are no-ops and the context stays pending on disk"""
+        work_queue = self.open_queue()
+        work_queue.append(make_context("a"))
+        work_queue.close()
+        work_queue.ack(["a"])
+        work_queue.append(make_context("b"))
+        self.assertEqual([c.object_id for c in self.open_queue().recover()], ["a"])
+
+    def test_torn_final_record_is_skipped(self):
+        """A record cut off mid-write is skipped and acknowledged, the rest is recovered"""
+        work_queue = self.open_queue()
+        work_queue.append(make_context("a"))
+        work_queue.append(make_context("b"))
+        work_queue.close()
+        segment = self.directory / self.segments()[-1]
+        with open(segment, "ab") as f:
+            f.write(b'P torn {"context": {"source": "va')
+
+        reopened = self.open_queue()
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual([c.object_id for c in reopened.recover()], ["a", "b"])
+        # The torn record was acknowledged while recovering
+        self.assertEqual(len(reopened), 2)
+        reopened.close()
+
+        self.assertEqual([c.object_id for c in self.open_queue().recover()], ["a", "b"])
+
+    def test_segments_are_deleted_as_a_prefix(self):
+        """A segment is deleted once it and all older segments are fully acknowledged"""
+        work_queue = self.open_queue(segment_bytes=1024)
+        for i in range(10):
+            work_queue.append(make_context(f"c{i}"))
+        # About four records per segment: c0-c3, c4-c7, c8-c9 (active)
+        self.assertEqual(len(self.segments()), 3)
+        first, second, _ = self.segments()
+
+        # The second segment is fully acknowledged, but the first still has c0 pending
+        work_queue.ack([f"c{i}" for i in range(1, 8)])
+        self.assertIn(first, self.segments())
+        self.assertIn(second, self.segments())
+
+        # The acknowledgement of c0 lands in a later segment than its record
+        work_queue.ack(["c0"])
+        self.assertNotIn(first, self.segments())
+        self.assertNotIn(second, self.segments())
+        work_queue.close()
+
+        self.assertEqual([c.object_id for c in self.open_queue().recover()], ["c8", "c9"])
+
+    def test_recovered_context_acknowledged_before_replay(self):
+        """A recovered id acknowledged before recover() reaches it is not replayed"""
+        work_queue = self.open_queue()
+        work_queue.append(make_context("a"))
+        work_queue.append(make_context("b"))
+        work_queue.close()
+
+        reopened = self.open_queue()
+        reopened.ack(["a"])
+        self.assertEqual([c.object_id for c in reopened.recover()], ["b"])
+        reopened.ack(["b"])
+        self.assertEqual(len(reopened), 0)
+        reopened.close()
+
+        self.assertEqual(list(self.open_queue().recover()), [])
+
+    def test_recovered_context_acknowledged_after_replay(self):
+        """Acknowledging a replayed context removes it for good"""
+        work_queue = self.open_queue()
+        work_queue.append(make_context("a"))
+        work_queue.close()
+
+        reopened = self.open_queue()
+        recovered = list(reopened.recover())
+        self.assertEqual([c.object_id for c in recovered], ["a"])
+        # A replayed context is still pending, appending it again is a no-op
+        reopened.append(recovered[0])
+        self.assertEqual(len(reopened), 1)
+        reopened.ack(["a"])
+        reopened.close()
+
+        reopened = self.open_queue()
+        self.assertEqual(len(reopened), 0)
+        self.assertEqual(list(reopened.recover()), [])
+        # Only the active segment is left
+        self.assertEqual(len(self.segments()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()